@@ -0,0 +1,41 @@
+"""access_path_indexes
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Composite indexes matching the filters used by the CRUD layer
+    op.create_index('ix_chapters_subject_id_order', 'chapters', ['subject_id', 'order'], unique=False)
+    op.create_index('ix_resources_chapter_id_resource_type', 'resources', ['chapter_id', 'resource_type'], unique=False)
+    op.create_index('ix_tasks_assigned_to', 'tasks', ['assigned_to'], unique=False)
+    op.create_index('ix_tasks_created_by', 'tasks', ['created_by'], unique=False)
+
+    # Keep the most recent row of any duplicated progress entries before
+    # enforcing one progress row per student and chapter
+    op.execute(
+        "DELETE FROM student_progress WHERE id NOT IN "
+        "(SELECT MAX(id) FROM student_progress GROUP BY student_id, chapter_id)"
+    )
+    with op.batch_alter_table('student_progress') as batch_op:
+        batch_op.create_unique_constraint(
+            'uq_student_progress_student_id_chapter_id', ['student_id', 'chapter_id']
+        )
+
+def downgrade() -> None:
+    with op.batch_alter_table('student_progress') as batch_op:
+        batch_op.drop_constraint('uq_student_progress_student_id_chapter_id', type_='unique')
+    op.drop_index('ix_tasks_created_by', table_name='tasks')
+    op.drop_index('ix_tasks_assigned_to', table_name='tasks')
+    op.drop_index('ix_resources_chapter_id_resource_type', table_name='resources')
+    op.drop_index('ix_chapters_subject_id_order', table_name='chapters')
@@ -0,0 +1,25 @@
+"""student_progress_completion
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column(
+        'student_progress',
+        sa.Column('completion_percentage', sa.Float(), nullable=False, server_default='0'),
+    )
+
+def downgrade() -> None:
+    with op.batch_alter_table('student_progress') as batch_op:
+        batch_op.drop_column('completion_percentage')
@@ -0,0 +1,35 @@
+"""gapped_ordering
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+# Must match app.crud.ordering.ORDER_GAP
+ORDER_GAP = 1024
+
+def _ordered_tables():
+    inspector = sa.inspect(op.get_bind())
+    for table in ('chapters', 'lessons', 'quiz_questions'):
+        if 'order' in {column['name'] for column in inspector.get_columns(table)}:
+            yield table
+
+def upgrade() -> None:
+    # Spread existing positions apart so items can be moved between them
+    for table in _ordered_tables():
+        op.execute(f'UPDATE {table} SET "order" = "order" * {ORDER_GAP}')
+    op.create_index('ix_quiz_questions_quiz_id_order', 'quiz_questions', ['quiz_id', 'order'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index('ix_quiz_questions_quiz_id_order', table_name='quiz_questions')
+    for table in _ordered_tables():
+        op.execute(f'UPDATE {table} SET "order" = "order" / {ORDER_GAP}')
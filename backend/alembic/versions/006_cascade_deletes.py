@@ -0,0 +1,50 @@
+"""cascade_deletes
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+# (table, column, referred table) for every child row that should go with its
+# parent. Student progress is records, not content: it keeps blocking deletes.
+CASCADES = [
+    ('chapters', 'subject_id', 'subjects'),
+    ('resources', 'chapter_id', 'chapters'),
+    ('lessons', 'chapter_id', 'chapters'),
+    ('quiz_questions', 'quiz_id', 'quizzes'),
+]
+
+def _replace_foreign_key(table: str, column: str, referred: str, ondelete) -> None:
+    # The original constraints were created unnamed; look up whatever name the
+    # database gave them (SQLite reports none, batch mode matches by the convention)
+    name = f'fk_{table}_{column}_{referred}'
+    existing = next(
+        (
+            fk['name'] for fk in sa.inspect(op.get_bind()).get_foreign_keys(table)
+            if fk['constrained_columns'] == [column]
+        ),
+        None,
+    )
+    with op.batch_alter_table(
+        table,
+        naming_convention={'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'},
+    ) as batch_op:
+        batch_op.drop_constraint(existing or name, type_='foreignkey')
+        batch_op.create_foreign_key(name, referred, [column], ['id'], ondelete=ondelete)
+
+def upgrade() -> None:
+    for table, column, referred in CASCADES:
+        _replace_foreign_key(table, column, referred, 'CASCADE')
+
+def downgrade() -> None:
+    for table, column, referred in reversed(CASCADES):
+        _replace_foreign_key(table, column, referred, None)
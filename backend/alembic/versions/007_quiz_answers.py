@@ -0,0 +1,41 @@
+"""quiz_answers
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'quiz_answers',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('result_id', sa.Integer(), nullable=False),
+        sa.Column('question_id', sa.Integer(), nullable=False),
+        sa.Column('answer', sa.String(), nullable=False),
+        sa.Column('is_correct', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['result_id'], ['quiz_results.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['question_id'], ['quiz_questions.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_quiz_answers_id'), 'quiz_answers', ['id'], unique=False)
+    op.create_index('ix_quiz_answers_result_id', 'quiz_answers', ['result_id'], unique=False)
+    op.create_index('ix_quiz_answers_question_id', 'quiz_answers', ['question_id'], unique=False)
+    op.create_index('ix_quiz_results_quiz_id_score', 'quiz_results', ['quiz_id', 'score'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index('ix_quiz_results_quiz_id_score', table_name='quiz_results')
+    op.drop_index('ix_quiz_answers_question_id', table_name='quiz_answers')
+    op.drop_index('ix_quiz_answers_result_id', table_name='quiz_answers')
+    op.drop_index(op.f('ix_quiz_answers_id'), table_name='quiz_answers')
+    op.drop_table('quiz_answers')
@@ -0,0 +1,49 @@
+"""quiz_attempts
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'quiz_attempts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('quiz_id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('answers', sa.JSON(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('deadline', sa.DateTime(), nullable=True),
+        sa.Column('submitted_at', sa.DateTime(), nullable=True),
+        sa.Column('auto_submitted', sa.Boolean(), nullable=False),
+        sa.Column('result_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['quiz_id'], ['quizzes.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['student_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['result_id'], ['quiz_results.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_quiz_attempts_id'), 'quiz_attempts', ['id'], unique=False)
+    op.create_index('ix_quiz_attempts_quiz_id_student_id', 'quiz_attempts', ['quiz_id', 'student_id'], unique=False)
+    op.create_index('ix_quiz_attempts_submitted_at_deadline', 'quiz_attempts', ['submitted_at', 'deadline'], unique=False)
+    op.create_index(
+        'ux_quiz_attempts_open', 'quiz_attempts', ['quiz_id', 'student_id'], unique=True,
+        sqlite_where=sa.text('submitted_at IS NULL'), postgresql_where=sa.text('submitted_at IS NULL'),
+    )
+
+def downgrade() -> None:
+    op.drop_index('ux_quiz_attempts_open', table_name='quiz_attempts')
+    op.drop_index('ix_quiz_attempts_submitted_at_deadline', table_name='quiz_attempts')
+    op.drop_index('ix_quiz_attempts_quiz_id_student_id', table_name='quiz_attempts')
+    op.drop_index(op.f('ix_quiz_attempts_id'), table_name='quiz_attempts')
+    op.drop_table('quiz_attempts')
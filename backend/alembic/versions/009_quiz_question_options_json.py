@@ -0,0 +1,52 @@
+"""quiz_question_options_json
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+def _parse_options(raw):
+    # Same tolerance as the old read path: malformed or non-list options become []
+    try:
+        options = json.loads(raw) if raw else []
+    except ValueError:
+        return []
+    return [str(option) for option in options] if isinstance(options, list) else []
+
+def _convert(source_type, target: str, target_type, convert) -> None:
+    """
+    Fill a new column `target` from the current options of every question,
+    then drop the old column and give `target` its name.
+    """
+    op.add_column('quiz_questions', sa.Column(target, target_type, nullable=True))
+    questions = sa.table(
+        'quiz_questions', sa.column('id', sa.Integer), sa.column('options', source_type), sa.column(target, target_type)
+    )
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(questions.c.id, questions.c.options)).all()
+    if rows:
+        bind.execute(
+            questions.update()
+            .where(questions.c.id == sa.bindparam('question_id'))
+            .values({target: sa.bindparam('converted')}),
+            [{'question_id': question_id, 'converted': convert(value)} for question_id, value in rows],
+        )
+    with op.batch_alter_table('quiz_questions') as batch_op:
+        batch_op.drop_column('options')
+        batch_op.alter_column(target, new_column_name='options', existing_type=target_type, nullable=False)
+
+def upgrade() -> None:
+    _convert(sa.Text(), 'options_json', sa.JSON(), _parse_options)
+
+def downgrade() -> None:
+    _convert(sa.JSON(), 'options_text', sa.Text(), json.dumps)
@@ -0,0 +1,41 @@
+"""sync_tombstones
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+# Tables served by /sync, filtered on updated_at
+SYNCED_TABLES = ['subjects', 'chapters', 'lessons', 'resources', 'assignments', 'tasks']
+
+def upgrade() -> None:
+    op.create_table(
+        'tombstones',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tombstones_id'), 'tombstones', ['id'], unique=False)
+    op.create_index('ix_tombstones_deleted_at', 'tombstones', ['deleted_at'], unique=False)
+    for table in SYNCED_TABLES:
+        op.create_index(f'ix_{table}_updated_at', table, ['updated_at'], unique=False)
+
+def downgrade() -> None:
+    for table in reversed(SYNCED_TABLES):
+        op.drop_index(f'ix_{table}_updated_at', table_name=table)
+    op.drop_index('ix_tombstones_deleted_at', table_name='tombstones')
+    op.drop_index(op.f('ix_tombstones_id'), table_name='tombstones')
+    op.drop_table('tombstones')
@@ -0,0 +1,32 @@
+"""table_versions
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'table_versions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('table_name')
+    )
+    op.create_index(op.f('ix_table_versions_id'), 'table_versions', ['id'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_table_versions_id'), table_name='table_versions')
+    op.drop_table('table_versions')
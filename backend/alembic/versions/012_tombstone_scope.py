@@ -0,0 +1,25 @@
+"""tombstone_scope
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column('tombstones', sa.Column('created_by', sa.Integer(), nullable=True))
+    op.add_column('tombstones', sa.Column('assigned_to', sa.Integer(), nullable=True))
+    op.add_column('tombstones', sa.Column('class_id', sa.Integer(), nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('tombstones', 'class_id')
+    op.drop_column('tombstones', 'assigned_to')
+    op.drop_column('tombstones', 'created_by')
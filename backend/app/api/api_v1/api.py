@@ -9,6 +9,8 @@ from app.api.api_v1.endpoints import (
     assignments,
     tasks,
     quizzes,
+    leaderboards,
+    sync,
     content_structure
 )
 
@@ -24,4 +26,6 @@ api_router.include_router(lessons.router, prefix="/lessons", tags=["lessons"])
 api_router.include_router(assignments.router, prefix="/assignments", tags=["assignments"])
 api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
 api_router.include_router(quizzes.router, prefix="/quizzes", tags=["quizzes"])
+api_router.include_router(leaderboards.router, prefix="/leaderboards", tags=["leaderboards"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
 api_router.include_router(content_structure.router, prefix="/content", tags=["content structure"]) 
\ No newline at end of file
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app import crud, models, schemas
 from app.api import deps
+from app.schemas.user import Principal
 
 router = APIRouter()
 
@@ -12,7 +13,7 @@ def read_subjects(
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Retrieve subjects.
@@ -24,7 +25,7 @@ def read_subjects(
 def read_subjects_by_grade(
     grade: int,
     db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get subjects by grade level.
@@ -37,7 +38,7 @@ def read_subjects_by_grade(
 def read_chapters_by_subject(
     subject_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get chapters by subject.
@@ -51,7 +52,7 @@ def read_resources_by_chapter(
     chapter_id: int,
     resource_type: str = None,
     db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get resources by chapter, optionally filtered by type.
@@ -67,7 +68,7 @@ def read_resources_by_chapter(
 def read_student_progress(
     student_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get student progress for all chapters.
@@ -85,30 +86,37 @@ def update_student_progress(
     *,
     db: Session = Depends(deps.get_db),
     progress_in: schemas.StudentProgressCreate,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Update student progress for a chapter.
+    Update student progress for a chapter. Returns the progress row with the
+    tick applied; after the first tick for a chapter, ticks are written in
+    the next batched flush.
     """
     if not crud.user.is_student(current_user):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    progress = crud.student_progress.update_progress(
+    # Checked now, since a bad tick would only fail later in the flush
+    if not crud.chapter.get(db, id=progress_in.chapter_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chapter not found"
+        )
+    return crud.student_progress.record_tick(
         db,
         student_id=progress_in.student_id,
         chapter_id=progress_in.chapter_id,
-        completion_percentage=progress_in.completion_percentage
+        completion_percentage=progress_in.completion_percentage,
     )
-    return progress
 
 # Assignment endpoints
 @router.get("/assignments/student/{student_id}", response_model=List[schemas.Assignment])
 def read_student_assignments(
     student_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get assignments for a student.
@@ -125,7 +133,7 @@ def read_student_assignments(
 def read_teacher_assignments(
     teacher_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get assignments created by a teacher.
@@ -143,7 +151,7 @@ def read_teacher_assignments(
 def read_teacher_tasks(
     teacher_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get tasks assigned to a teacher.
@@ -161,7 +169,7 @@ def update_task_status(
     task_id: int,
     status: str,
     db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Update task status.
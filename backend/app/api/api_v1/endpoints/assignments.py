@@ -1,8 +1,10 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.core.etag import check_list_etag
+from app.core.pagination import paginate, set_next_cursor
 from app.models.academic import Assignment
 from app.schemas.academic import AssignmentCreate, AssignmentUpdate, Assignment as AssignmentResponse
 
@@ -10,14 +12,22 @@ router = APIRouter()
 
 @router.get("/", response_model=List[AssignmentResponse])
 def read_assignments(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = Depends(deps.get_cursor),
 ) -> Any:
     """
     Retrieve assignments.
     """
-    assignments = db.query(Assignment).offset(skip).limit(limit).all()
+    not_modified = check_list_etag(request, response, db, Assignment, skip, limit, after_id)
+    if not_modified:
+        return not_modified
+    assignments = paginate(db.query(Assignment), Assignment, skip=skip, limit=limit, after_id=after_id)
+    if after_id is not None:
+        set_next_cursor(response, assignments, limit)
     return assignments
 
 @router.post("/", response_model=AssignmentResponse)
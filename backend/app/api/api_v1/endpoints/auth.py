@@ -2,28 +2,28 @@ from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud
 from app.api import deps
 from app.core import security
 from app.core.config import settings
-from app.core.security import create_access_token
-from app.models.user import User
-from app.schemas.user import UserResponse, UserCreate
+from app.schemas.user import Principal, UserResponse, UserCreate
 from app.schemas.token import Token
 
 router = APIRouter()
 
 @router.post("/login/access-token", response_model=Token)
-def login_access_token(
-    db: Session = Depends(deps.get_db),
+async def login_access_token(
+    db: AsyncSession = Depends(deps.get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends(),
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not user.verify_password(form_data.password):
+    user = await crud.user.authenticate_async(
+        db, email=form_data.username, password=form_data.password
+    )
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -38,27 +38,27 @@ def login_access_token(
     }
 
 @router.post("/register", response_model=UserResponse)
-def register(
+async def register(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     user_in: UserCreate,
 ) -> Any:
     """
     Create new user.
     """
-    user = crud.user.get_by_email(db, email=user_in.email)
+    user = await crud.user.get_by_email_async(db, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="The user with this email already exists in the system.",
         )
     
-    user = crud.user.create(db, obj_in=user_in)
+    user = await crud.user.create_async(db, obj_in=user_in)
     return user
 
 @router.post("/refresh-token", response_model=Token)
 def refresh_token(
-    current_user: User = Depends(deps.get_current_user),
+    current_user: Principal = Depends(deps.get_current_user),
 ) -> Any:
     """
     Refresh access token
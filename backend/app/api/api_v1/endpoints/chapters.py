@@ -1,23 +1,47 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 
+from app import crud
 from app.api import deps
-from app.models.content import Chapter
-from app.schemas.content import ChapterCreate, ChapterUpdate, Chapter as ChapterResponse
+from app.crud.base import DeleteBlocked
+from app.core.etag import check_list_etag_async
+from app.core.pagination import apply_pagination, set_next_cursor
+from app.models.content import Chapter, Resource
+from app.schemas.bulk import BulkDeleteResult, validate_rows
+from app.schemas.content import ChapterCreate, ChapterUpdate, Chapter as ChapterResponse, OrderMove
+from app.schemas.user import Principal
 
 router = APIRouter()
 
 @router.get("/", response_model=List[ChapterResponse])
-def read_chapters(
-    db: Session = Depends(deps.get_db),
+async def read_chapters(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = Depends(deps.get_cursor),
 ) -> Any:
     """
     Retrieve chapters.
     """
-    chapters = db.query(Chapter).offset(skip).limit(limit).all()
+    not_modified = await check_list_etag_async(
+        request, response, db, Chapter, skip, limit, after_id, nested=(Resource,)
+    )
+    if not_modified:
+        return not_modified
+    # The response includes resources, which can't be lazy loaded on an AsyncSession
+    stmt = apply_pagination(
+        select(Chapter).options(selectinload(Chapter.resources).undefer_group("body")),
+        Chapter, skip=skip, limit=limit, after_id=after_id,
+    )
+    chapters = (await db.execute(stmt)).scalars().all()
+    if after_id is not None:
+        set_next_cursor(response, chapters, limit)
     return chapters
 
 @router.post("/", response_model=ChapterResponse)
@@ -29,24 +53,103 @@ def create_chapter(
     """
     Create new chapter.
     """
-    chapter = Chapter(**chapter_in.model_dump())
-    db.add(chapter)
-    db.commit()
-    db.refresh(chapter)
-    return chapter
+    return crud.chapter.create(db, obj_in=chapter_in)
+
+@router.post("/bulk", response_model=List[ChapterResponse])
+def create_chapters_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    chapters_in: List[Dict[str, Any]],
+) -> Any:
+    """
+    Create many chapters in a single transaction.
+    Every row is validated first; if any row is invalid nothing is inserted
+    and the errors are returned with the index of each offending row.
+    """
+    valid, errors = validate_rows(ChapterCreate, chapters_in)
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors],
+        )
+    try:
+        return crud.chapter.create_many(db, objs_in=valid)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bulk insert failed: {e.orig}",
+        )
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def delete_chapters_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    ids: List[int] = Query(...),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Delete many chapters with a single statement. Their lessons, resources and progress
+    are removed by the database through ON DELETE CASCADE.
+    """
+    if not crud.user.is_teacher(current_user) and not crud.user.is_principal(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    try:
+        deleted = crud.chapter.remove_many(db, ids=ids)
+    except DeleteBlocked as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except IntegrityError:
+        # Referenced by a row written after the check
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Rows are still referenced by other records",
+        )
+    return BulkDeleteResult(deleted=deleted)
 
 @router.get("/{chapter_id}", response_model=ChapterResponse)
-def read_chapter(
+async def read_chapter(
     chapter_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
 ) -> Any:
     """
     Get a specific chapter by id.
     """
-    chapter = db.query(Chapter).filter(Chapter.id == chapter_id).first()
+    chapter = await db.get(Chapter, chapter_id, options=[selectinload(Chapter.resources).undefer_group("body")])
+    if not chapter:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chapter not found",
+        )
+    return chapter
+
+@router.post("/{chapter_id}/move", response_model=ChapterResponse)
+def move_chapter(
+    chapter_id: int,
+    move_in: OrderMove,
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Move a chapter directly after another one, or first when after_id is
+    null. Only the moved row is written unless its neighbours need spacing.
+    """
+    if not crud.user.is_teacher(current_user) and not crud.user.is_principal(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    chapter = crud.chapter.get(db, id=chapter_id)
     if not chapter:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Chapter not found",
         )
-    return chapter 
\ No newline at end of file
+    try:
+        return crud.chapter.move_after(db, db_obj=chapter, after_id=move_in.after_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
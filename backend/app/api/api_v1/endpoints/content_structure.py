@@ -1,8 +1,13 @@
+from collections import defaultdict
 from typing import Any, List, Dict
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer
 
 from app.api import deps
+from app.core.cache import content_cache
+from app.crud.ordering import gapped_orders
 from app.models.content import Subject, Chapter, Resource, Lesson
 from app.schemas.content import (
     Subject as SubjectResponse, 
@@ -12,102 +17,136 @@ from app.schemas.content import (
 
 router = APIRouter()
 
+def _subject_info(subject: Subject) -> Dict[str, Any]:
+    return {
+        "id": subject.id,
+        "name": subject.name,
+        "description": subject.description,
+        "grade_level": subject.grade_level,
+    }
+
+def _chapter_info(chapter: Chapter) -> Dict[str, Any]:
+    return {
+        "id": chapter.id,
+        "title": chapter.title,
+        "description": chapter.description,
+        "order": chapter.order
+    }
+
+def _resource_info(resource: Resource) -> Dict[str, Any]:
+    return {
+        "id": resource.id,
+        "title": resource.title,
+        "description": resource.description,
+        "resource_type": resource.resource_type
+    }
+
+def _lesson_info(lesson: Lesson) -> Dict[str, Any]:
+    # Lesson has no description column; only the outline fields are exposed here.
+    return {
+        "id": lesson.id,
+        "title": lesson.title,
+        "order": lesson.order
+    }
+
 @router.get("/subjects-with-chapters", response_model=List[Dict[str, Any]])
-def get_subjects_with_chapters(
-    db: Session = Depends(deps.get_db),
+async def get_subjects_with_chapters(
+    db: AsyncSession = Depends(deps.get_async_db),
 ) -> Any:
     """
     Get a hierarchical view of all subjects with their chapters, including IDs.
     This makes it easier to see the content structure and reference specific items.
     """
-    subjects = db.query(Subject).all()
-    
+    cached = content_cache.get("subjects-with-chapters")
+    if cached is not None:
+        return cached
+    version = content_cache.version
+
+    subjects = (await db.execute(select(Subject).order_by(Subject.id))).scalars().all()
+
+    # Load every chapter in one round trip and group them by subject in memory,
+    # instead of issuing one chapter query per subject.
+    chapters_by_subject: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    chapters = (
+        await db.execute(select(Chapter).order_by(Chapter.subject_id, Chapter.order))
+    ).scalars().all()
+    for chapter in chapters:
+        chapters_by_subject[chapter.subject_id].append(_chapter_info(chapter))
+
     result = []
     for subject in subjects:
-        chapters = db.query(Chapter).filter(Chapter.subject_id == subject.id).order_by(Chapter.order).all()
-        
-        chapter_list = []
-        for chapter in chapters:
-            chapter_info = {
-                "id": chapter.id,
-                "title": chapter.title,
-                "description": chapter.description,
-                "order": chapter.order
-            }
-            chapter_list.append(chapter_info)
-        
-        subject_info = {
-            "id": subject.id,
-            "name": subject.name,
-            "description": subject.description,
-            "grade_level": subject.grade_level,
-            "chapters": chapter_list
-        }
+        subject_info = _subject_info(subject)
+        subject_info["chapters"] = chapters_by_subject.get(subject.id, [])
         result.append(subject_info)
-    
+
+    content_cache.set("subjects-with-chapters", result, version=version)
     return result
 
 @router.get("/subjects/{subject_id}/full-structure", response_model=Dict[str, Any])
-def get_subject_full_structure(
+async def get_subject_full_structure(
     subject_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
 ) -> Any:
     """
     Get a complete structure of a subject including all chapters, resources, and lessons.
     """
-    subject = db.query(Subject).filter(Subject.id == subject_id).first()
+    cache_key = ("subject-full-structure", subject_id)
+    cached = content_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    version = content_cache.version
+
+    subject = await db.get(Subject, subject_id)
     if not subject:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Subject not found",
         )
     
-    chapters = db.query(Chapter).filter(Chapter.subject_id == subject_id).order_by(Chapter.order).all()
-    
-    chapter_list = []
-    for chapter in chapters:
-        # Get resources for this chapter
-        resources = db.query(Resource).filter(Resource.chapter_id == chapter.id).all()
-        resource_list = []
+    chapters = (
+        await db.execute(
+            select(Chapter).where(Chapter.subject_id == subject_id).order_by(Chapter.order)
+        )
+    ).scalars().all()
+    chapter_ids = [chapter.id for chapter in chapters]
+
+    # Fetch the resources and lessons of every chapter with one IN query each
+    # and group them per chapter, rather than querying inside the chapter loop.
+    resources_by_chapter: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    lessons_by_chapter: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    if chapter_ids:
+        resources = (
+            await db.execute(
+                select(Resource)
+                .options(undefer(Resource.description))
+                .where(Resource.chapter_id.in_(chapter_ids))
+                .order_by(Resource.id)
+            )
+        ).scalars().all()
         for resource in resources:
-            resource_info = {
-                "id": resource.id,
-                "title": resource.title,
-                "description": resource.description,
-                "resource_type": resource.resource_type
-            }
-            resource_list.append(resource_info)
-        
-        # Get lessons for this chapter
-        lessons = db.query(Lesson).filter(Lesson.chapter_id == chapter.id).order_by(Lesson.order).all()
-        lesson_list = []
+            resources_by_chapter[resource.chapter_id].append(_resource_info(resource))
+
+        lessons = (
+            await db.execute(
+                select(Lesson)
+                .where(Lesson.chapter_id.in_(chapter_ids))
+                .order_by(Lesson.order)
+            )
+        ).scalars().all()
         for lesson in lessons:
-            lesson_info = {
-                "id": lesson.id,
-                "title": lesson.title,
-                "description": lesson.description,
-                "order": lesson.order
-            }
-            lesson_list.append(lesson_info)
-        
-        chapter_info = {
-            "id": chapter.id,
-            "title": chapter.title,
-            "description": chapter.description,
-            "order": chapter.order,
-            "resources": resource_list,
-            "lessons": lesson_list
-        }
+            lessons_by_chapter[lesson.chapter_id].append(_lesson_info(lesson))
+
+    chapter_list = []
+    for chapter in chapters:
+        chapter_info = _chapter_info(chapter)
+        chapter_info["resources"] = resources_by_chapter.get(chapter.id, [])
+        chapter_info["lessons"] = lessons_by_chapter.get(chapter.id, [])
         chapter_list.append(chapter_info)
-    
-    result = {
-        "id": subject.id,
-        "name": subject.name,
-        "description": subject.description,
-        "grade_level": subject.grade_level,
-        "chapters": chapter_list
-    }
-    
+
+    result = _subject_info(subject)
+    result["chapters"] = chapter_list
+
+    content_cache.set(cache_key, result, version=version)
     return result
 
 @router.post("/subjects-with-chapters", response_model=Dict[str, Any])
@@ -131,36 +170,24 @@ def create_subject_with_chapters(
     
     # Create the chapters
     chapters = []
-    for chapter_data in subject_in.chapters:
+    # The requested orders only give the sequence; store them gapped
+    orders = gapped_orders([chapter_data.order for chapter_data in subject_in.chapters])
+    for chapter_data, order in zip(subject_in.chapters, orders):
         chapter = Chapter(
             title=chapter_data.title,
             description=chapter_data.description,
-            order=chapter_data.order,
+            order=order,
             subject_id=subject.id
         )
         db.add(chapter)
         chapters.append(chapter)
     
     db.commit()
+    content_cache.bump()
     db.refresh(subject)
     
     # Prepare the response
-    chapter_list = []
-    for chapter in chapters:
-        chapter_info = {
-            "id": chapter.id,
-            "title": chapter.title,
-            "description": chapter.description,
-            "order": chapter.order
-        }
-        chapter_list.append(chapter_info)
-    
-    result = {
-        "id": subject.id,
-        "name": subject.name,
-        "description": subject.description,
-        "grade_level": subject.grade_level,
-        "chapters": chapter_list
-    }
-    
-    return result 
\ No newline at end of file
+    result = _subject_info(subject)
+    result["chapters"] = [_chapter_info(chapter) for chapter in chapters]
+
+    return result
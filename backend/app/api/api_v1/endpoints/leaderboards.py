@@ -0,0 +1,127 @@
+from typing import Any
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.api import deps
+from app.core.leaderboard import Leaderboard
+from app.models.academic import Class
+from app.models.content import Quiz, Subject
+from app.schemas.content import LeaderboardEntry, LeaderboardPage
+from app.schemas.user import Principal
+
+router = APIRouter()
+
+def _page(board: Leaderboard, limit: int) -> LeaderboardPage:
+    return LeaderboardPage(
+        size=len(board),
+        entries=[
+            LeaderboardEntry(rank=rank, student_id=student_id, score=score)
+            for rank, student_id, score in board.top(limit)
+        ],
+    )
+
+def _my_entry(board: Leaderboard, current_user: Principal) -> LeaderboardEntry:
+    rank = board.rank(current_user.id)
+    if rank is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not ranked on this leaderboard",
+        )
+    return LeaderboardEntry(rank=rank, student_id=current_user.id, score=board.get(current_user.id))
+
+def _quiz_board(db: Session, quiz_id: int) -> Leaderboard:
+    if not db.get(Quiz, quiz_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found",
+        )
+    return crud.leaderboards.quiz(db, quiz_id=quiz_id)
+
+def _class_board(db: Session, class_id: int) -> Leaderboard:
+    class_ = db.get(Class, class_id)
+    if not class_:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Class not found",
+        )
+    return crud.leaderboards.class_(db, grade=class_.grade, section=class_.section)
+
+def _subject_board(db: Session, subject_id: int) -> Leaderboard:
+    if not db.get(Subject, subject_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Subject not found",
+        )
+    return crud.leaderboards.subject(db, subject_id=subject_id)
+
+@router.get("/quiz/{quiz_id}", response_model=LeaderboardPage)
+def read_quiz_leaderboard(
+    quiz_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Top students of a quiz by their best score.
+    """
+    return _page(_quiz_board(db, quiz_id), limit)
+
+@router.get("/quiz/{quiz_id}/me", response_model=LeaderboardEntry)
+def read_my_quiz_rank(
+    quiz_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    The current student's rank on a quiz.
+    """
+    return _my_entry(_quiz_board(db, quiz_id), current_user)
+
+@router.get("/class/{class_id}", response_model=LeaderboardPage)
+def read_class_leaderboard(
+    class_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Top students of a class (its grade and section) by the sum of their
+    best score on every quiz.
+    """
+    return _page(_class_board(db, class_id), limit)
+
+@router.get("/class/{class_id}/me", response_model=LeaderboardEntry)
+def read_my_class_rank(
+    class_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    The current student's rank in a class.
+    """
+    return _my_entry(_class_board(db, class_id), current_user)
+
+@router.get("/subject/{subject_id}", response_model=LeaderboardPage)
+def read_subject_leaderboard(
+    subject_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Top students of a subject by the sum of their best score on each of
+    its quizzes.
+    """
+    return _page(_subject_board(db, subject_id), limit)
+
+@router.get("/subject/{subject_id}/me", response_model=LeaderboardEntry)
+def read_my_subject_rank(
+    subject_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    The current student's rank in a subject.
+    """
+    return _my_entry(_subject_board(db, subject_id), current_user)
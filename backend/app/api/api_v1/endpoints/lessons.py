@@ -1,24 +1,46 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, undefer_group
 
+from app import crud
 from app.api import deps
+from app.crud.base import DeleteBlocked
+from app.core.etag import check_list_etag
+from app.core.pagination import apply_pagination, set_next_cursor
+from app.core.serialization import RowsResponse, schema_columns
 from app.models.content import Lesson
-from app.schemas.content import LessonCreate, LessonUpdate, Lesson as LessonResponse
+from app.schemas.bulk import BulkDeleteResult, validate_rows
+from app.schemas.content import LessonCreate, LessonUpdate, Lesson as LessonResponse, OrderMove
+from app.schemas.user import Principal
 
 router = APIRouter()
 
 @router.get("/", response_model=List[LessonResponse])
 def read_lessons(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = Depends(deps.get_cursor),
+    fields: Optional[List[str]] = Depends(deps.sparse_fields(LessonResponse)),
 ) -> Any:
     """
-    Retrieve lessons.
+    Retrieve lessons. Pass ?fields=id,title to return (and select) only
+    those fields.
     """
-    lessons = db.query(Lesson).offset(skip).limit(limit).all()
-    return lessons
+    not_modified = check_list_etag(request, response, db, Lesson, skip, limit, after_id, fields)
+    if not_modified:
+        return not_modified
+    stmt = apply_pagination(
+        select(*schema_columns(Lesson, LessonResponse, fields)), Lesson, skip=skip, limit=limit, after_id=after_id
+    )
+    lessons = db.execute(stmt).all()
+    if after_id is not None:
+        set_next_cursor(response, lessons, limit)
+    return RowsResponse(lessons, response)
 
 @router.post("/", response_model=LessonResponse)
 def create_lesson(
@@ -29,11 +51,62 @@ def create_lesson(
     """
     Create new lesson.
     """
-    lesson = Lesson(**lesson_in.model_dump())
-    db.add(lesson)
-    db.commit()
-    db.refresh(lesson)
-    return lesson
+    return crud.lesson.create(db, obj_in=lesson_in)
+
+@router.post("/bulk", response_model=List[LessonResponse])
+def create_lessons_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    lessons_in: List[Dict[str, Any]],
+) -> Any:
+    """
+    Create many lessons in a single transaction.
+    Every row is validated first; if any row is invalid nothing is inserted
+    and the errors are returned with the index of each offending row.
+    """
+    valid, errors = validate_rows(LessonCreate, lessons_in)
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors],
+        )
+    try:
+        return crud.lesson.create_many(db, objs_in=valid)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bulk insert failed: {e.orig}",
+        )
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def delete_lessons_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    ids: List[int] = Query(...),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Delete many lessons with a single statement.
+    """
+    if not crud.user.is_teacher(current_user) and not crud.user.is_principal(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    try:
+        deleted = crud.lesson.remove_many(db, ids=ids)
+    except DeleteBlocked as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except IntegrityError:
+        # Referenced by a row written after the check
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Rows are still referenced by other records",
+        )
+    return BulkDeleteResult(deleted=deleted)
 
 @router.get("/{lesson_id}", response_model=LessonResponse)
 def read_lesson(
@@ -43,10 +116,37 @@ def read_lesson(
     """
     Get a specific lesson by id.
     """
-    lesson = db.query(Lesson).filter(Lesson.id == lesson_id).first()
+    lesson = db.query(Lesson).options(undefer_group("body")).filter(Lesson.id == lesson_id).first()
+    if not lesson:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Lesson not found",
+        )
+    return lesson
+
+@router.post("/{lesson_id}/move", response_model=LessonResponse)
+def move_lesson(
+    lesson_id: int,
+    move_in: OrderMove,
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Move a lesson directly after another one, or first when after_id is
+    null. Only the moved row is written unless its neighbours need spacing.
+    """
+    if not crud.user.is_teacher(current_user) and not crud.user.is_principal(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    lesson = crud.lesson.get(db, id=lesson_id)
     if not lesson:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Lesson not found",
         )
-    return lesson 
\ No newline at end of file
+    try:
+        return crud.lesson.move_after(db, db_obj=lesson, after_id=move_in.after_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
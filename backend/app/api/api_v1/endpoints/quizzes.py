@@ -1,24 +1,50 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app import crud
 from app.api import deps
-from app.models.content import Quiz
-from app.schemas.content import QuizCreate, QuizUpdate, Quiz as QuizResponse
+from app.core.etag import check_list_etag
+from app.core.pagination import apply_pagination, set_next_cursor
+from app.core.serialization import RowsResponse, schema_columns
+from app.models.content import Quiz, QuizAttempt
+from app.schemas.content import (
+    QuizCreate, QuizUpdate, Quiz as QuizResponse,
+    QuizQuestion as QuizQuestionResponse, QuizQuestionPublic, OrderMove,
+    QuizResult as QuizResultResponse, QuizSubmission,
+    QuizAnswerSheet, QuizBatchGradeResult, QuizItemAnalysis,
+    QuizAttempt as QuizAttemptResponse,
+)
+from app.schemas.bulk import BulkRowError
+from app.schemas.user import Principal
 
 router = APIRouter()
 
 @router.get("/", response_model=List[QuizResponse])
 def read_quizzes(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = Depends(deps.get_cursor),
+    fields: Optional[List[str]] = Depends(deps.sparse_fields(QuizResponse)),
 ) -> Any:
     """
-    Retrieve quizzes.
+    Retrieve quizzes. Pass ?fields=id,title to return (and select) only
+    those fields.
     """
-    quizzes = db.query(Quiz).offset(skip).limit(limit).all()
-    return quizzes
+    not_modified = check_list_etag(request, response, db, Quiz, skip, limit, after_id, fields)
+    if not_modified:
+        return not_modified
+    stmt = apply_pagination(
+        select(*schema_columns(Quiz, QuizResponse, fields)), Quiz, skip=skip, limit=limit, after_id=after_id
+    )
+    quizzes = db.execute(stmt).all()
+    if after_id is not None:
+        set_next_cursor(response, quizzes, limit)
+    return RowsResponse(quizzes, response)
 
 @router.post("/", response_model=QuizResponse)
 def create_quiz(
@@ -49,4 +75,222 @@ def read_quiz(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Quiz not found",
         )
-    return quiz 
\ No newline at end of file
+    return quiz
+
+@router.get("/{quiz_id}/questions", response_model=List[QuizQuestionPublic])
+def read_quiz_questions(
+    quiz_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    The questions of a quiz as shown to students, without answers. Served
+    from the quiz's cached, pre-serialized paper.
+    """
+    quiz = db.get(Quiz, quiz_id)
+    if not quiz or (not quiz.is_published and crud.user.is_student(current_user)):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found",
+        )
+    paper = crud.quiz_question.get_paper(db, quiz_id=quiz_id)
+    return Response(content=paper.payload, media_type="application/json")
+
+@router.post("/questions/{question_id}/move", response_model=QuizQuestionResponse)
+def move_question(
+    question_id: int,
+    move_in: OrderMove,
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Move a question directly after another one, or first when after_id is
+    null. Only the moved row is written unless its neighbours need spacing.
+    """
+    if not crud.user.is_teacher(current_user) and not crud.user.is_principal(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    question = crud.quiz_question.get(db, id=question_id)
+    if not question:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found",
+        )
+    try:
+        return crud.quiz_question.move_after(db, db_obj=question, after_id=move_in.after_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.post("/{quiz_id}/submit", response_model=QuizResultResponse)
+def submit_quiz(
+    quiz_id: int,
+    submission: QuizSubmission,
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Submit the current student's answers and get the graded result.
+    """
+    if not crud.user.is_student(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    quiz = db.get(Quiz, quiz_id)
+    if not quiz:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found",
+        )
+    if not quiz.is_published:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Quiz is not published",
+        )
+    if quiz.time_limit:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Timed quizzes are taken through an attempt",
+        )
+    try:
+        return crud.quiz_result.grade_submission(
+            db, quiz_id=quiz_id, student_id=current_user.id, answers=submission.answers
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.post("/{quiz_id}/attempts", response_model=QuizAttemptResponse)
+def start_quiz_attempt(
+    quiz_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Start a (timed) attempt at a quiz, or resume the current student's open
+    one. Once the deadline passes the attempt is submitted automatically
+    with the answers saved so far.
+    """
+    if not crud.user.is_student(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    quiz = db.get(Quiz, quiz_id)
+    if not quiz:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found",
+        )
+    if not quiz.is_published:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Quiz is not published",
+        )
+    return crud.quiz_attempt.start(db, quiz=quiz, student_id=current_user.id)
+
+def _own_attempt(db: Session, attempt_id: int, current_user: Principal) -> QuizAttempt:
+    attempt = crud.quiz_attempt.get(db, id=attempt_id)
+    if not attempt or attempt.student_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Attempt not found",
+        )
+    return attempt
+
+@router.put("/attempts/{attempt_id}/answers", response_model=QuizAttemptResponse)
+def save_attempt_answers(
+    attempt_id: int,
+    submission: QuizSubmission,
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Save answers of an open attempt without submitting it.
+    """
+    attempt = _own_attempt(db, attempt_id, current_user)
+    try:
+        return crud.quiz_attempt.save_answers(db, attempt=attempt, answers=submission.answers)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.post("/attempts/{attempt_id}/submit", response_model=QuizResultResponse)
+def submit_attempt(
+    attempt_id: int,
+    submission: QuizSubmission,
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Submit an open attempt with its saved answers plus the given ones and
+    get the graded result.
+    """
+    attempt = _own_attempt(db, attempt_id, current_user)
+    try:
+        return crud.quiz_attempt.submit(db, attempt=attempt, answers=submission.answers)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.post("/{quiz_id}/grade-batch", response_model=QuizBatchGradeResult)
+def grade_quiz_batch(
+    quiz_id: int,
+    sheets: List[QuizAnswerSheet],
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Grade an uploaded batch of answer sheets in one call and store a result
+    for each of them.
+    """
+    if not crud.user.is_teacher(current_user) and not crud.user.is_principal(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    if not db.get(Quiz, quiz_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found",
+        )
+    students = crud.user.get_student_ids(db, ids=[sheet.student_id for sheet in sheets])
+    errors = [
+        BulkRowError(
+            index=index,
+            errors=[{"loc": ["student_id"], "msg": "Unknown student", "type": "value_error"}],
+        )
+        for index, sheet in enumerate(sheets)
+        if sheet.student_id not in students
+    ]
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=[error.model_dump() for error in errors],
+        )
+    try:
+        results = crud.quiz_result.grade_batch(db, quiz_id=quiz_id, sheets=sheets)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return QuizBatchGradeResult(graded=len(results), results=results)
+
+@router.get("/{quiz_id}/analysis", response_model=QuizItemAnalysis)
+def read_quiz_analysis(
+    quiz_id: int,
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Item analysis of a quiz: difficulty, discrimination and answer
+    frequencies per question, plus the score histogram.
+    """
+    if not crud.user.is_teacher(current_user) and not crud.user.is_principal(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    if not db.get(Quiz, quiz_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found",
+        )
+    return crud.quiz_result.get_item_analysis(db, quiz_id=quiz_id)
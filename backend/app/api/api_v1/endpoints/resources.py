@@ -1,24 +1,47 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, undefer_group
 
+from app import crud
 from app.api import deps
+from app.crud.base import DeleteBlocked
+from app.core.etag import check_list_etag
+from app.core.pagination import apply_pagination, set_next_cursor
+from app.core.serialization import RowsResponse, schema_columns
+from app.core.cache import content_cache
 from app.models.content import Resource
+from app.schemas.bulk import BulkDeleteResult, validate_rows
 from app.schemas.content import ResourceCreate, ResourceUpdate, Resource as ResourceResponse
+from app.schemas.user import Principal
 
 router = APIRouter()
 
 @router.get("/", response_model=List[ResourceResponse])
 def read_resources(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = Depends(deps.get_cursor),
+    fields: Optional[List[str]] = Depends(deps.sparse_fields(ResourceResponse)),
 ) -> Any:
     """
-    Retrieve resources.
+    Retrieve resources. Pass ?fields=id,title to return (and select) only
+    those fields.
     """
-    resources = db.query(Resource).offset(skip).limit(limit).all()
-    return resources
+    not_modified = check_list_etag(request, response, db, Resource, skip, limit, after_id, fields)
+    if not_modified:
+        return not_modified
+    stmt = apply_pagination(
+        select(*schema_columns(Resource, ResourceResponse, fields)), Resource, skip=skip, limit=limit, after_id=after_id
+    )
+    resources = db.execute(stmt).all()
+    if after_id is not None:
+        set_next_cursor(response, resources, limit)
+    return RowsResponse(resources, response)
 
 @router.post("/", response_model=ResourceResponse)
 def create_resource(
@@ -32,9 +55,65 @@ def create_resource(
     resource = Resource(**resource_in.model_dump())
     db.add(resource)
     db.commit()
+    content_cache.bump()
     db.refresh(resource)
     return resource
 
+@router.post("/bulk", response_model=List[ResourceResponse])
+def create_resources_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    resources_in: List[Dict[str, Any]],
+) -> Any:
+    """
+    Create many resources in a single transaction.
+    Every row is validated first; if any row is invalid nothing is inserted
+    and the errors are returned with the index of each offending row.
+    """
+    valid, errors = validate_rows(ResourceCreate, resources_in)
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors],
+        )
+    try:
+        return crud.resource.create_many(db, objs_in=valid)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bulk insert failed: {e.orig}",
+        )
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def delete_resources_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    ids: List[int] = Query(...),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Delete many resources with a single statement.
+    """
+    if not crud.user.is_teacher(current_user) and not crud.user.is_principal(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    try:
+        deleted = crud.resource.remove_many(db, ids=ids)
+    except DeleteBlocked as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except IntegrityError:
+        # Referenced by a row written after the check
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Rows are still referenced by other records",
+        )
+    return BulkDeleteResult(deleted=deleted)
+
 @router.get("/{resource_id}", response_model=ResourceResponse)
 def read_resource(
     resource_id: int,
@@ -43,7 +122,7 @@ def read_resource(
     """
     Get a specific resource by id.
     """
-    resource = db.query(Resource).filter(Resource.id == resource_id).first()
+    resource = db.query(Resource).options(undefer_group("body")).filter(Resource.id == resource_id).first()
     if not resource:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
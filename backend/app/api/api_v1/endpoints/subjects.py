@@ -1,24 +1,48 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app import crud
 from app.api import deps
+from app.crud.base import DeleteBlocked
+from app.core.etag import check_list_etag_async
+from app.core.pagination import apply_pagination, set_next_cursor
+from app.core.serialization import RowsResponse, schema_columns
+from app.core.cache import content_cache
 from app.models.content import Subject
+from app.schemas.bulk import BulkDeleteResult, validate_rows
 from app.schemas.content import SubjectCreate, SubjectUpdate, Subject as SubjectResponse
+from app.schemas.user import Principal
 
 router = APIRouter()
 
 @router.get("/", response_model=List[SubjectResponse])
-def read_subjects(
-    db: Session = Depends(deps.get_db),
+async def read_subjects(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_async_db),
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = Depends(deps.get_cursor),
+    fields: Optional[List[str]] = Depends(deps.sparse_fields(SubjectResponse)),
 ) -> Any:
     """
-    Retrieve subjects.
+    Retrieve subjects. Pass ?fields=id,title to return (and select) only
+    those fields.
     """
-    subjects = db.query(Subject).offset(skip).limit(limit).all()
-    return subjects
+    not_modified = await check_list_etag_async(request, response, db, Subject, skip, limit, after_id, fields)
+    if not_modified:
+        return not_modified
+    stmt = apply_pagination(
+        select(*schema_columns(Subject, SubjectResponse, fields)), Subject, skip=skip, limit=limit, after_id=after_id
+    )
+    subjects = (await db.execute(stmt)).all()
+    if after_id is not None:
+        set_next_cursor(response, subjects, limit)
+    return RowsResponse(subjects, response)
 
 @router.post("/", response_model=SubjectResponse)
 def create_subject(
@@ -32,18 +56,75 @@ def create_subject(
     subject = Subject(**subject_in.model_dump())
     db.add(subject)
     db.commit()
+    content_cache.bump()
     db.refresh(subject)
     return subject
 
+@router.post("/bulk", response_model=List[SubjectResponse])
+def create_subjects_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    subjects_in: List[Dict[str, Any]],
+) -> Any:
+    """
+    Create many subjects in a single transaction.
+    Every row is validated first; if any row is invalid nothing is inserted
+    and the errors are returned with the index of each offending row.
+    """
+    valid, errors = validate_rows(SubjectCreate, subjects_in)
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors],
+        )
+    try:
+        return crud.subject.create_many(db, objs_in=valid)
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bulk insert failed: {e.orig}",
+        )
+
+@router.delete("/bulk", response_model=BulkDeleteResult)
+def delete_subjects_bulk(
+    *,
+    db: Session = Depends(deps.get_db),
+    ids: List[int] = Query(...),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Delete many subjects with a single statement. Their chapters, lessons and resources
+    are removed by the database through ON DELETE CASCADE.
+    """
+    if not crud.user.is_teacher(current_user) and not crud.user.is_principal(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    try:
+        deleted = crud.subject.remove_many(db, ids=ids)
+    except DeleteBlocked as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except IntegrityError:
+        # Referenced by a row written after the check
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Rows are still referenced by other records",
+        )
+    return BulkDeleteResult(deleted=deleted)
+
 @router.get("/{subject_id}", response_model=SubjectResponse)
-def read_subject(
+async def read_subject(
     subject_id: int,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
 ) -> Any:
     """
     Get a specific subject by id.
     """
-    subject = db.query(Subject).filter(Subject.id == subject_id).first()
+    subject = await db.get(Subject, subject_id)
     if not subject:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Any, Optional
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.api import deps
+from app.crud.crud_sync import get_changes
+from app.schemas.sync import SyncResponse
+from app.schemas.user import Principal
+
+router = APIRouter()
+
+@router.get("/", response_model=SyncResponse)
+def sync(
+    since: Optional[datetime] = None,
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Subjects, chapters, lessons, resources, assignments and tasks created,
+    updated or deleted since the `since` watermark, as visible to the
+    current user. Omit `since` for a full sync; pass the returned
+    watermark as `since` next time.
+    """
+    return get_changes(db, user=current_user, since=since)
@@ -1,23 +1,34 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from app import crud, models, schemas
 from app.api import deps
+from app.core.etag import check_list_etag
+from app.core.pagination import paginate, set_next_cursor
 from app.models.academic import Task
 from app.schemas.academic import TaskCreate, TaskUpdate, Task as TaskResponse
+from app.schemas.user import Principal
 
 router = APIRouter()
 
 @router.get("/", response_model=List[TaskResponse])
 def read_tasks(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
+    after_id: Optional[int] = Depends(deps.get_cursor),
 ) -> Any:
     """
     Retrieve tasks.
     """
-    tasks = db.query(Task).offset(skip).limit(limit).all()
+    not_modified = check_list_etag(request, response, db, Task, skip, limit, after_id)
+    if not_modified:
+        return not_modified
+    tasks = paginate(db.query(Task), Task, skip=skip, limit=limit, after_id=after_id)
+    if after_id is not None:
+        set_next_cursor(response, tasks, limit)
     return tasks
 
 @router.post("/", response_model=TaskResponse)
@@ -57,7 +68,7 @@ def update_task(
     db: Session = Depends(deps.get_db),
     task_id: int,
     task_in: TaskUpdate,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Update a task.
@@ -80,7 +91,7 @@ def delete_task(
     *,
     db: Session = Depends(deps.get_db),
     task_id: int,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Delete a task.
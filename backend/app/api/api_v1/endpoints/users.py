@@ -1,19 +1,25 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from app import crud
 from app.api import deps
+from app.crud.base import DeleteBlocked
+from app.core.etag import check_list_etag
+from app.core.pagination import set_next_cursor
 from app.models.user import User
-from app.schemas.user import UserResponse, UserCreate, UserUpdate
+from app.schemas.user import Principal, UserResponse, UserCreate, UserUpdate
 
 router = APIRouter()
 
 @router.get("/", response_model=List[UserResponse])
 def read_users(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(deps.get_current_active_user),
+    after_id: Optional[int] = Depends(deps.get_cursor),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Retrieve users.
@@ -23,7 +29,12 @@ def read_users(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    users = crud.user.get_multi(db, skip=skip, limit=limit)
+    not_modified = check_list_etag(request, response, db, User, skip, limit, after_id)
+    if not_modified:
+        return not_modified
+    users = crud.user.get_multi(db, skip=skip, limit=limit, after_id=after_id)
+    if after_id is not None:
+        set_next_cursor(response, users, limit)
     return users
 
 @router.post("/", response_model=UserResponse)
@@ -31,7 +42,7 @@ def create_user(
     *,
     db: Session = Depends(deps.get_db),
     user_in: UserCreate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Create new user.
@@ -55,27 +66,29 @@ def update_user_me(
     *,
     db: Session = Depends(deps.get_db),
     user_in: UserUpdate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Update own user.
     """
-    user = crud.user.update(db, db_obj=current_user, obj_in=user_in)
+    user = crud.user.get(db, id=current_user.id)
+    user = crud.user.update(db, db_obj=user, obj_in=user_in)
     return user
 
 @router.get("/me", response_model=UserResponse)
 def read_user_me(
-    current_user: User = Depends(deps.get_current_active_user),
+    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Get current user.
     """
-    return current_user
+    return crud.user.get(db, id=current_user.id)
 
 @router.get("/{user_id}", response_model=UserResponse)
 def read_user_by_id(
     user_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
     db: Session = Depends(deps.get_db),
 ) -> Any:
     """
@@ -100,7 +113,7 @@ def update_user(
     db: Session = Depends(deps.get_db),
     user_id: int,
     user_in: UserUpdate,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Update a user.
@@ -124,7 +137,7 @@ def delete_user(
     *,
     db: Session = Depends(deps.get_db),
     user_id: int,
-    current_user: User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_user),
 ) -> Any:
     """
     Delete a user.
@@ -140,5 +153,9 @@ def delete_user(
             status_code=404,
             detail="User not found"
         )
-    user = crud.user.remove(db, id=user_id)
+    try:
+        user = crud.user.remove(db, id=user_id)
+    except DeleteBlocked as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     return user 
\ No newline at end of file
@@ -1,13 +1,18 @@
-from typing import Generator, Optional
+from typing import AsyncGenerator, Callable, Generator, List, Optional, Type
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from pydantic import ValidationError
-from sqlalchemy.orm import Session
-from app import crud, models, schemas
-from app.core import security
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from app import models
+from app.core.cache import principal_cache
+from app.core.pagination import decode_cursor
+from app.core.serialization import parse_fields
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.schemas.token import TokenPayload
+from app.schemas.user import Principal
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login")
 
@@ -18,35 +23,88 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_cursor(cursor: Optional[str] = None) -> Optional[int]:
+    """
+    Decode the optional keyset pagination cursor into the last seen id.
+    Returns None when the client uses offset pagination.
+    """
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+def sparse_fields(schema: Type[BaseModel]) -> Callable[..., Optional[List[str]]]:
+    """
+    Dependency factory for the `fields` query parameter of a list endpoint
+    returning `schema`, e.g. ?fields=id,title,order.
+    """
+    def get_fields(fields: Optional[str] = None) -> Optional[List[str]]:
+        try:
+            return parse_fields(fields, schema)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+    return get_fields
+
 def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(reusable_oauth2)
-) -> models.User:
+) -> Principal:
+    """
+    Resolve the authenticated principal. Principals are cached for a short
+    TTL so authorization checks don't query the database on every request.
+    """
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        token_data = schemas.TokenPayload(**payload)
+        token_data = TokenPayload(**payload)
     except (JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = crud.user.get_user(db, user_id=token_data.sub)
+    principal = principal_cache.get(token_data.sub)
+    if principal is not None:
+        return principal
+    user = (
+        db.query(models.User)
+        .options(
+            joinedload(models.User.student_profile),
+            joinedload(models.User.teacher_profile),
+            joinedload(models.User.principal_profile),
+            joinedload(models.User.developer_profile),
+        )
+        .filter(models.User.id == token_data.sub)
+        .first()
+    )
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.set(user.id, principal)
+    return principal
 
 def get_current_active_user(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 def get_current_active_superuser(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=400, detail="The user doesn't have enough privileges"
@@ -54,8 +112,8 @@ def get_current_active_superuser(
     return current_user
 
 async def get_current_teacher(
-    current_user: models.User = Depends(get_current_active_user),
-) -> models.User:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """
     Get current teacher profile.
     Verifies user has teacher role and returns teacher profile.
@@ -68,7 +126,7 @@ async def get_current_teacher(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Insufficient privileges - Teacher access required"
         )
-    if not current_user.teacher_profile:
+    if not current_user.teacher_profile_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Teacher profile not found"
@@ -76,8 +134,8 @@ async def get_current_teacher(
     return current_user
 
 async def get_current_student(
-    current_user: models.User = Depends(get_current_active_user),
-) -> models.User:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """
     Get current student profile.
     Verifies user has student role and returns student profile.
@@ -90,7 +148,7 @@ async def get_current_student(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Insufficient privileges - Student access required"
         )
-    if not current_user.student_profile:
+    if not current_user.student_profile_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Student profile not found"
@@ -98,8 +156,8 @@ async def get_current_student(
     return current_user
 
 async def get_current_principal(
-    current_user: models.User = Depends(get_current_active_user),
-) -> models.User:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """
     Get current principal profile.
     Verifies user has principal role and returns principal profile.
@@ -112,7 +170,7 @@ async def get_current_principal(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Insufficient privileges - Principal access required"
         )
-    if not current_user.principal_profile:
+    if not current_user.principal_profile_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Principal profile not found"
@@ -120,8 +178,8 @@ async def get_current_principal(
     return current_user
 
 async def get_current_developer(
-    current_user: models.User = Depends(get_current_active_user),
-) -> models.User:
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
     """
     Get current developer profile.
     Verifies user has developer role and returns developer profile.
@@ -134,9 +192,25 @@ async def get_current_developer(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Insufficient privileges - Developer access required"
         )
-    if not current_user.developer_profile:
+    if not current_user.developer_profile_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Developer profile not found"
         )
-    return current_user 
\ No newline at end of file
+    return current_user 
+
+async def get_current_developer_or_superuser(
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
+    """
+    Allow developers and superusers, e.g. for operational endpoints.
+
+    Raises:
+        HTTPException: If user is neither a developer nor a superuser
+    """
+    if not current_user.is_superuser and current_user.role != "developer":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient privileges - Developer access required"
+        )
+    return current_user
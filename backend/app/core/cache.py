@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+from app.core.config import settings
+
+class VersionedCache:
+    """
+    In-process LRU cache whose entries are tied to a monotonically increasing
+    version. Bumping the version makes every existing entry unreachable, so
+    writers only need to call bump() after they commit.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[int, Hashable], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            cache_key = (self.version, key)
+            if cache_key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return self._entries[cache_key]
+
+    def set(self, key: Hashable, value: Any, version: Optional[int] = None) -> None:
+        """
+        Store a value. Pass the version read before loading from the database
+        so a result computed while a write landed is never cached as current.
+        """
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            cache_key = (self.version, key)
+            self._entries[cache_key] = value
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def bump(self) -> int:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            return self.version
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+class TTLCache:
+    """
+    Small thread-safe cache whose entries expire after a fixed number of
+    seconds and can be invalidated individually.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+# Serialized curriculum tree (subjects, chapters, lessons, resources)
+content_cache = VersionedCache(max_entries=settings.CONTENT_CACHE_MAX_ENTRIES)
+
+# Authenticated principals keyed by user id
+principal_cache = TTLCache(ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+# Quiz item analyses keyed by quiz id, invalidated when results are stored
+analytics_cache = TTLCache(ttl=settings.ANALYTICS_CACHE_TTL_SECONDS, max_entries=1000)
@@ -13,6 +13,10 @@ class Settings(BaseModel):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-super-secret-key-change-this-in-production")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    # Worker processes for bcrypt; 0 hashes inline in the calling thread
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+    PASSWORD_HASH_MAX_QUEUE: int = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "256"))
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = [
@@ -24,5 +28,35 @@ class Settings(BaseModel):
     DATABASE_URL: str = os.getenv(
         "DATABASE_URL", "sqlite:///./school_management.db"
     )
+    # Derived from DATABASE_URL when unset (aiosqlite / asyncpg drivers)
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB
+
+    # Caching
+    CONTENT_CACHE_MAX_ENTRIES: int = int(os.getenv("CONTENT_CACHE_MAX_ENTRIES", "256"))
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    ANALYTICS_CACHE_TTL_SECONDS: int = int(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "3600"))
+
+    # Write-behind buffering of student progress ticks
+    PROGRESS_BUFFER_MAX_SIZE: int = int(os.getenv("PROGRESS_BUFFER_MAX_SIZE", "1000"))
+    PROGRESS_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("PROGRESS_FLUSH_INTERVAL_SECONDS", "5"))
+    PROGRESS_FLUSH_MAX_ATTEMPTS: int = int(os.getenv("PROGRESS_FLUSH_MAX_ATTEMPTS", "3"))
+
+    # Timed quiz attempts
+    QUIZ_TIMER_TICK_SECONDS: float = float(os.getenv("QUIZ_TIMER_TICK_SECONDS", "1"))
+    QUIZ_TIMER_SLOTS: int = int(os.getenv("QUIZ_TIMER_SLOTS", "512"))
+    QUIZ_EXPIRE_BATCH_SIZE: int = int(os.getenv("QUIZ_EXPIRE_BATCH_SIZE", "500"))
+    # Submissions still accepted this long after the deadline (network latency)
+    QUIZ_SUBMIT_GRACE_SECONDS: int = int(os.getenv("QUIZ_SUBMIT_GRACE_SECONDS", "5"))
+
+    # Delta sync: how far before the client's watermark to look again, for
+    # rows committed by transactions still running at the previous sync
+    SYNC_OVERLAP_SECONDS: int = int(os.getenv("SYNC_OVERLAP_SECONDS", "5"))
 
 settings = Settings() 
\ No newline at end of file
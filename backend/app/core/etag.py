@@ -0,0 +1,140 @@
+import hashlib
+from typing import Any, List, Optional, Sequence, Tuple, Type
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.db.base_class import Base
+from app.db.table_versions import VERSIONED_TABLES, versions_statement
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the given parts.
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in if_none_match.split(","))
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+def _table_names(model: Type[Base], nested: Sequence[Type[Base]]) -> List[str]:
+    table_names = [model.__tablename__, *(child.__tablename__ for child in nested)]
+    untracked = set(table_names) - VERSIONED_TABLES
+    if untracked:
+        # Their version would never change, so the ETag would never go stale
+        raise ValueError(f"Tables without write versions: {', '.join(sorted(untracked))}")
+    return table_names
+
+def _versions_etag(table_names: List[str], rows, parts: Tuple[Any, ...]) -> str:
+    versions = dict(rows)
+    return make_etag(*(f"{name}:{versions.get(name, 0)}" for name in table_names), *parts)
+
+def list_etag(db: Session, model: Type[Base], *parts: Any, nested: Sequence[Type[Base]] = ()) -> str:
+    """
+    ETag for a list endpoint derived from the write versions of the table and
+    of any `nested` tables whose rows are embedded in the response, so every
+    committed write to them changes it.
+    """
+    table_names = _table_names(model, nested)
+    rows = db.execute(versions_statement(table_names)).all()
+    return _versions_etag(table_names, rows, parts)
+
+async def list_etag_async(
+    db: AsyncSession, model: Type[Base], *parts: Any, nested: Sequence[Type[Base]] = ()
+) -> str:
+    table_names = _table_names(model, nested)
+    rows = (await db.execute(versions_statement(table_names))).all()
+    return _versions_etag(table_names, rows, parts)
+
+def check_list_etag(
+    request: Request, response: Response, db: Session, model: Type[Base], *parts: Any,
+    nested: Sequence[Type[Base]] = (),
+) -> Optional[Response]:
+    """
+    Return a 304 response when the client's copy of the list is current,
+    otherwise set the ETag on the outgoing response and return None.
+    """
+    etag = list_etag(db, model, *parts, nested=nested)
+    return _apply_etag(request, response, etag)
+
+async def check_list_etag_async(
+    request: Request, response: Response, db: AsyncSession, model: Type[Base], *parts: Any,
+    nested: Sequence[Type[Base]] = (),
+) -> Optional[Response]:
+    etag = await list_etag_async(db, model, *parts, nested=nested)
+    return _apply_etag(request, response, etag)
+
+def _apply_etag(request: Request, response: Response, etag: str) -> Optional[Response]:
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return None
+
+class ETagMiddleware:
+    """
+    Adds a strong ETag computed from the body to successful GET responses that
+    don't already carry one, and answers 304 when If-None-Match matches.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start_message: Optional[Message] = None
+        body_parts = []
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if message["status"] != 200 or "etag" in headers:
+                    passthrough = True
+                    await send(message)
+                    return
+                start_message = message
+                return
+
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(body_parts)
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            if etag_matches(if_none_match, etag):
+                # Keep headers such as CORS, but drop the ones describing the body
+                headers = [
+                    (key, value) for key, value in start_message["headers"]
+                    if key.lower() not in (b"content-length", b"content-type")
+                ]
+                headers.append((b"etag", etag.encode()))
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": headers,
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            MutableHeaders(raw=start_message["headers"])["ETag"] = etag
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
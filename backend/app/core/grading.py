@@ -0,0 +1,137 @@
+from typing import Any, Dict, Mapping, Sequence
+import numpy as np
+import orjson
+
+def normalize_answer(answer: Any) -> str:
+    return str(answer).strip().casefold()
+
+class AnswerKey:
+    """
+    Answer key of one quiz, parsed once and kept as arrays so any number of
+    answer sheets can be scored with a single vectorized comparison.
+    """
+
+    def __init__(self, quiz_id: int, questions: Sequence[Any]):
+        self.quiz_id = quiz_id
+        self.question_ids = [question.id for question in questions]
+        self.columns = {question_id: column for column, question_id in enumerate(self.question_ids)}
+        self.correct = np.array([normalize_answer(q.correct_answer) for q in questions], dtype=str)
+        self.points = np.array([q.points if q.points is not None else 1 for q in questions], dtype=float)
+        self.options = {question.id: list(question.options or []) for question in questions}
+        self.max_score = float(self.points.sum())
+
+    def sheet_matrix(self, sheets: Sequence[Mapping[int, Any]]) -> np.ndarray:
+        """
+        Lay answer sheets ({question_id: answer}) out as a sheets x questions
+        string matrix; unanswered questions are empty strings.
+
+        Raises:
+            ValueError: If a sheet answers a question that isn't in this quiz
+        """
+        matrix = np.full((len(sheets), len(self.question_ids)), "", dtype=object)
+        for row, answers in enumerate(sheets):
+            for question_id, answer in answers.items():
+                column = self.columns.get(question_id)
+                if column is None:
+                    raise ValueError(
+                        f"Sheet {row}: question {question_id} is not part of quiz {self.quiz_id}"
+                    )
+                matrix[row, column] = normalize_answer(answer)
+        return matrix.astype(str)
+
+    def correct_matrix(self, matrix: np.ndarray) -> np.ndarray:
+        return matrix == self.correct
+
+    def score(self, correct: np.ndarray) -> np.ndarray:
+        """
+        Score per sheet from its correct matrix: the points of every
+        correctly answered question.
+        """
+        return correct.astype(float) @ self.points
+
+    def grade(self, sheets: Sequence[Mapping[int, Any]]) -> np.ndarray:
+        return self.score(self.correct_matrix(self.sheet_matrix(sheets)))
+
+class QuizPaper:
+    """
+    The questions of one quiz loaded once and kept in both shapes they are
+    read in: the student-facing rendering, already serialized to JSON, and
+    the answer key used for grading.
+    """
+
+    def __init__(self, quiz_id: int, questions: Sequence[Any]):
+        self.quiz_id = quiz_id
+        self.answer_key = AnswerKey(quiz_id, questions)
+        self.questions = [
+            {
+                "id": question.id,
+                "question_text": question.question_text,
+                "options": self.answer_key.options[question.id],
+                "points": question.points if question.points is not None else 1,
+                "order": question.order,
+            }
+            for question in questions
+        ]
+        self.payload = orjson.dumps(self.questions)
+
+def item_analysis(
+    question_ids: Sequence[int],
+    scores: np.ndarray,
+    max_score: float,
+    answer_rows: np.ndarray,
+    answer_columns: np.ndarray,
+    answers: np.ndarray,
+    is_correct: np.ndarray,
+    bins: int = 10,
+) -> Dict[str, Any]:
+    """
+    Classical item analysis of one quiz in a single pass over columnar data.
+    `scores` holds one total per result; each stored answer is given by its
+    result row, question column, normalized answer text and correctness.
+
+    Per question this reports difficulty (share of results answering
+    correctly), the upper/lower 27% discrimination index, and answer
+    frequencies including omissions. The quiz gets a score histogram.
+    """
+    n_results, n_questions = len(scores), len(question_ids)
+    correct = np.zeros((n_results, n_questions), dtype=bool)
+    correct[answer_rows, answer_columns] = is_correct
+    answered = np.bincount(answer_columns, minlength=n_questions)
+
+    if n_results:
+        difficulty = correct.mean(axis=0)
+        group_size = max(1, int(round(n_results * 0.27)))
+        ranked = np.argsort(scores, kind="stable")
+        discrimination = (
+            correct[ranked[-group_size:]].mean(axis=0) - correct[ranked[:group_size]].mean(axis=0)
+        )
+    else:
+        difficulty = discrimination = np.zeros(n_questions)
+
+    # Count every (question, answer) pair with one bincount over encoded answers
+    choices, codes = np.unique(answers, return_inverse=True)
+    frequencies = np.bincount(
+        answer_columns * len(choices) + codes.ravel(), minlength=n_questions * len(choices)
+    ).reshape(n_questions, len(choices))
+
+    counts, edges = np.histogram(scores, bins=bins, range=(0.0, max(max_score, 1.0)))
+    questions = []
+    for column, question_id in enumerate(question_ids):
+        nonzero = np.flatnonzero(frequencies[column])
+        questions.append({
+            "question_id": question_id,
+            "difficulty": float(difficulty[column]),
+            "discrimination": float(discrimination[column]),
+            "answered": int(answered[column]),
+            "omitted": int(n_results - answered[column]),
+            "answer_frequencies": {
+                str(choices[code]): int(frequencies[column, code]) for code in nonzero
+            },
+        })
+    return {
+        "results": n_results,
+        "max_score": max_score,
+        "mean_score": float(scores.mean()) if n_results else 0.0,
+        "score_histogram": {"bin_edges": edges.tolist(), "counts": counts.tolist()},
+        "questions": questions,
+    }
@@ -0,0 +1,54 @@
+from bisect import bisect_left, insort
+from typing import Dict, Hashable, List, Mapping, Optional, Tuple
+
+class Leaderboard:
+    """
+    Member scores kept in a sorted list, highest first, so a member's rank
+    is a binary search and the top N is a slice. Ties share a rank
+    (1, 2, 2, 4).
+    """
+
+    def __init__(self, scores: Optional[Mapping[Hashable, float]] = None):
+        self._scores: Dict[Hashable, float] = dict(scores or {})
+        self._entries: List[Tuple[float, Hashable]] = sorted(
+            (-score, member) for member, score in self._scores.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def get(self, member: Hashable) -> Optional[float]:
+        return self._scores.get(member)
+
+    def set(self, member: Hashable, score: float) -> None:
+        old = self._scores.get(member)
+        if old == score:
+            return
+        if old is not None:
+            del self._entries[bisect_left(self._entries, (-old, member))]
+        self._scores[member] = score
+        insort(self._entries, (-score, member))
+
+    def add(self, member: Hashable, delta: float) -> None:
+        self.set(member, self._scores.get(member, 0.0) + delta)
+
+    def rank(self, member: Hashable) -> Optional[int]:
+        score = self._scores.get(member)
+        if score is None:
+            return None
+        # (-score,) sorts before every entry with that score
+        return bisect_left(self._entries, (-score,)) + 1
+
+    def top(self, n: int) -> List[Tuple[int, Hashable, float]]:
+        """
+        The first n entries as (rank, member, score).
+        """
+        result = []
+        rank = 0
+        previous = None
+        for position, (negative_score, member) in enumerate(self._entries[:n]):
+            if negative_score != previous:
+                rank = position + 1
+                previous = negative_score
+            result.append((rank, member, -negative_score))
+        return result
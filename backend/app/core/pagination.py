@@ -0,0 +1,53 @@
+import base64
+import json
+from typing import List, Optional, Type, TypeVar, Union
+from fastapi import Response
+from sqlalchemy import Select
+from sqlalchemy.orm import Query
+from app.db.base_class import Base
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+QueryType = TypeVar("QueryType", bound=Union[Query, Select])
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"id": last_id}).encode()).decode()
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode an opaque cursor into the id of the last row already returned.
+    An empty cursor starts keyset pagination from the beginning.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return 0
+    try:
+        last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))["id"]
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(last_id, int):
+        raise ValueError("Invalid cursor")
+    return last_id
+
+def apply_pagination(
+    query: QueryType, model: Type[Base], *, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+) -> QueryType:
+    """
+    Apply offset pagination, or keyset pagination on the primary key when
+    after_id is given so deep pages cost the same as the first one.
+    Works on both ORM queries and select() statements.
+    """
+    if after_id is None:
+        return query.offset(skip).limit(limit)
+    return query.where(model.id > after_id).order_by(model.id).limit(limit)
+
+def paginate(
+    query: Query, model: Type[Base], *, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+) -> List[Base]:
+    return apply_pagination(query, model, skip=skip, limit=limit, after_id=after_id).all()
+
+def set_next_cursor(response: Response, items: List[Base], limit: int) -> None:
+    if items and len(items) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1].id)
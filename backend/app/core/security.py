@@ -1,10 +1,111 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Optional, Tuple, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes with a cost other than BCRYPT_ROUNDS need an update and are rehashed
+# on the next successful login, so the cost can be tuned without a migration
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+def _worker_context() -> Any:
+    """
+    Workers start from a fork server (or are spawned where there is none)
+    rather than being forked from the app process, whose other threads may
+    hold locks at the moment of the fork.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+class PasswordHasherBusy(Exception):
+    """
+    Raised when too many bcrypt jobs are already queued for the worker pool.
+    """
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated process pool so hashing never holds a request
+    thread's CPU or the GIL. The number of in-flight jobs is bounded so a
+    login storm fails fast instead of queueing without limit.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_worker_context())
+            return self._executor
+
+    def _release(self, _: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _submit(self, fn: Callable, *args: Any) -> Future:
+        if self.workers <= 0:
+            future: Future = Future()
+            future.set_result(fn(*args))
+            return future
+        executor = self._get_executor()
+        with self._lock:
+            if self._pending >= self.max_queue:
+                raise PasswordHasherBusy("Password hashing queue is full")
+            self._pending += 1
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def hash(self, password: str) -> str:
+        return self._submit(_hash, password).result()
+
+    def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return self._submit(_verify_and_update, plain_password, hashed_password).result()
+
+    async def hash_async(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(_hash, password))
+
+    async def verify_and_update_async(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        return await asyncio.wrap_future(
+            self._submit(_verify_and_update, plain_password, hashed_password)
+        )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS, max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
 
 def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
     if expires_delta:
@@ -18,7 +119,7 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
     return encoded_jwt
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify_and_update(plain_password, hashed_password)[0]
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password) 
\ No newline at end of file
+    return password_hasher.hash(password)
@@ -0,0 +1,71 @@
+from typing import Any, Iterable, List, Optional, Type
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy import Row, null
+from app.db.base_class import Base
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[List[str]]:
+    """
+    Parse a comma separated sparse fieldset into schema field names, in
+    schema order. `id` is always included so keyset cursors keep working.
+    Returns None when no fieldset was requested.
+
+    Raises:
+        ValueError: If a requested field isn't part of the schema
+    """
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested - set(schema.model_fields))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return [name for name in schema.model_fields if name in requested or name == "id"]
+
+def schema_columns(
+    model: Type[Base], schema: Type[BaseModel], fields: Optional[List[str]] = None
+) -> List[Any]:
+    """
+    Columns of `model` matching the fields of a flat response schema (or
+    just `fields` of it), in schema order. Optional fields the table doesn't
+    have are selected as NULL so rows come out with exactly those keys.
+
+    Raises:
+        ValueError: If a field is neither a column nor defaults to None
+    """
+    table_columns = model.__table__.c
+    columns = []
+    for name, field in schema.model_fields.items():
+        if fields is not None and name not in fields:
+            continue
+        if name in table_columns:
+            columns.append(table_columns[name])
+        elif not field.is_required() and field.default is None:
+            columns.append(null().label(name))
+        else:
+            raise ValueError(f"{schema.__name__}.{name} can't be selected from {model.__tablename__}")
+    return columns
+
+def dump_rows(rows: Iterable[Row]) -> bytes:
+    """
+    Serialize result rows to a JSON array of objects without building
+    pydantic models.
+    """
+    return orjson.dumps([row._asdict() for row in rows])
+
+class RowsResponse(Response):
+    """
+    JSON response built straight from SQLAlchemy rows. Only for trusted list
+    endpoints whose select already matches the response schema, since the
+    rows are not validated.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, rows: Iterable[Row], response: Optional[Response] = None, **kwargs: Any):
+        super().__init__(content=dump_rows(rows), **kwargs)
+        if response is not None:
+            # Carry over headers set on the injected response (ETag, X-Next-Cursor)
+            for key, value in response.headers.items():
+                if key not in ("content-length", "content-type"):
+                    self.headers[key] = value
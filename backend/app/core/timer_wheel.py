@@ -0,0 +1,144 @@
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class TimerWheel:
+    """
+    Hashed timer wheel: deadlines (epoch seconds) are hashed by tick into a
+    fixed ring of slots, so scheduling and cancelling are O(1) and advancing
+    the clock only looks at the slots the clock passed. Deadlines more than
+    one rotation away wait in their slot until a later pass.
+    """
+
+    def __init__(self, *, tick: float = 1.0, slots: int = 512, now: Optional[float] = None):
+        self.tick = tick
+        self._slots: List[Dict[Hashable, float]] = [{} for _ in range(slots)]
+        self._slot_of: Dict[Hashable, int] = {}
+        # Last tick whose slot was processed
+        self._current = math.floor((time.time() if now is None else now) / tick)
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """
+        Fire `key` once `deadline` has passed, replacing an earlier deadline.
+        """
+        self.cancel(key)
+        slot = max(math.ceil(deadline / self.tick), self._current + 1) % len(self._slots)
+        self._slots[slot][key] = deadline
+        self._slot_of[key] = slot
+
+    def cancel(self, key: Hashable) -> bool:
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+        del self._slots[slot][key]
+        return True
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """
+        Move the clock to `now` and return every key whose deadline passed.
+        """
+        now = time.time() if now is None else now
+        target = math.floor(now / self.tick)
+        expired: List[Hashable] = []
+        # After a stall longer than one rotation every slot is visited once
+        for tick in range(max(self._current + 1, target - len(self._slots) + 1), target + 1):
+            slot = self._slots[tick % len(self._slots)]
+            due = [key for key, deadline in slot.items() if deadline <= now]
+            for key in due:
+                del slot[key]
+                del self._slot_of[key]
+            expired.extend(due)
+        self._current = max(self._current, target)
+        return expired
+
+class DeadlineScheduler:
+    """
+    Runs a TimerWheel from a background thread and hands expired keys to
+    expire_fn in batches of at most `max_batch`. Batches that fail are
+    retried on the next tick.
+    """
+
+    def __init__(
+        self,
+        expire_fn: Callable[[List[Hashable]], None],
+        *,
+        tick: float = 1.0,
+        slots: int = 512,
+        max_batch: int = 500,
+    ):
+        self.expire_fn = expire_fn
+        self.max_batch = max_batch
+        self.expired = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self._wheel = TimerWheel(tick=tick, slots=slots)
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        with self._lock:
+            self._wheel.schedule(key, deadline)
+
+    def cancel(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._wheel.cancel(key)
+
+    def expire_due(self, now: Optional[float] = None) -> int:
+        """
+        Expire every key whose deadline passed by `now`, returning how many
+        were handed to expire_fn successfully.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            due = self._wheel.advance(now)
+        done = 0
+        for start in range(0, len(due), self.max_batch):
+            batch = due[start:start + self.max_batch]
+            try:
+                self.expire_fn(batch)
+            except Exception:
+                logger.exception("Failed to expire %d deadlines", len(batch))
+                with self._lock:
+                    for key in batch:
+                        self._wheel.schedule(key, now + self._wheel.tick)
+                    self.failed_batches += 1
+                continue
+            done += len(batch)
+            with self._lock:
+                self.expired += len(batch)
+                self.batches += 1
+        return done
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self._wheel.tick):
+            self.expire_due()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="deadline-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "scheduled": len(self._wheel),
+                "expired": self.expired,
+                "batches": self.batches,
+                "failed_batches": self.failed_batches,
+            }
@@ -0,0 +1,157 @@
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class WriteBehindBuffer:
+    """
+    Coalesces writes per key, keeping only the latest value, and hands them to
+    flush_fn in batches from a background thread. A flush happens every
+    `interval` seconds, as soon as `max_size` keys are pending, and on stop().
+
+    When a batch fails its entries are retried one at a time, so a single bad
+    entry can't hold back the rest. An entry that fails `max_attempts`
+    flushes in a row is dropped into `dead_letters`, which keeps the latest
+    `dead_letter_size` of them for inspection.
+    """
+
+    def __init__(
+        self,
+        flush_fn: Callable[[Dict[Hashable, Any]], None],
+        *,
+        max_size: int = 1000,
+        interval: float = 5.0,
+        max_attempts: int = 3,
+        dead_letter_size: int = 1000,
+    ):
+        self.flush_fn = flush_fn
+        self.max_size = max_size
+        self.interval = interval
+        self.max_attempts = max_attempts
+        self.buffered = 0
+        self.coalesced = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.dead_lettered = 0
+        self.dead_letters: Deque[Tuple[Hashable, Any]] = deque(maxlen=dead_letter_size)
+        # Consecutive failed flushes per key
+        self._failures: Dict[Hashable, int] = {}
+        self._pending: Dict[Hashable, Any] = {}
+        # Entries handed to flush_fn but not yet written, still visible to readers
+        self._in_flight: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = value
+            self.buffered += 1
+            full = len(self._pending) >= self.max_size
+        if full:
+            self._wake.set()
+
+    def snapshot(self) -> Dict[Hashable, Any]:
+        """
+        Every value that is not yet known to be in the database.
+        """
+        with self._lock:
+            return {**self._in_flight, **self._pending}
+
+    def flush(self, keys: Optional[Iterable[Hashable]] = None) -> int:
+        """
+        Write pending entries (all of them, or only `keys`) through flush_fn,
+        returning how many were written. If the batch fails, its entries are
+        retried one by one; the ones that still fail are put back unless a
+        newer value arrived meanwhile, or dead-lettered after max_attempts.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if keys is None:
+                    batch, self._pending = self._pending, {}
+                else:
+                    batch = {key: self._pending.pop(key) for key in keys if key in self._pending}
+                self._in_flight = batch
+            if not batch:
+                return 0
+            try:
+                self.flush_fn(batch)
+            except Exception:
+                logger.exception("Failed to flush %d buffered writes, retrying one by one", len(batch))
+                with self._lock:
+                    self.failed_flushes += 1
+                written = self._flush_each(batch)
+            else:
+                written = batch
+            with self._lock:
+                self._in_flight = {}
+                for key in written:
+                    self._failures.pop(key, None)
+                self.flushed += len(written)
+                self.flushes += 1
+            return len(written)
+
+    def _flush_each(self, batch: Dict[Hashable, Any]) -> Dict[Hashable, Any]:
+        written: Dict[Hashable, Any] = {}
+        for key, value in batch.items():
+            try:
+                self.flush_fn({key: value})
+            except Exception:
+                self._failed(key, value)
+            else:
+                written[key] = value
+        return written
+
+    def _failed(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            attempts = self._failures.get(key, 0) + 1
+            if attempts < self.max_attempts:
+                self._failures[key] = attempts
+                self._pending.setdefault(key, value)
+                return
+            self._failures.pop(key, None)
+            # A newer value for the key gets attempts of its own
+            if key not in self._pending:
+                self.dead_letters.append((key, value))
+                self.dead_lettered += 1
+                logger.error("Dropping buffered write for %r after %d failed flushes", key, attempts)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="write-behind-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending": len(self._pending) + len(self._in_flight),
+                "buffered": self.buffered,
+                "coalesced": self.coalesced,
+                "flushed": self.flushed,
+                "flushes": self.flushes,
+                "failed_flushes": self.failed_flushes,
+                "dead_lettered": self.dead_lettered,
+            }
@@ -1,6 +1,8 @@
 from app.crud.crud_user import user
-from app.crud.crud_content import subject, chapter, resource
-from app.crud.crud_academic import student_progress, assignment, task
+from app.crud.crud_content import subject, chapter, resource, lesson, quiz_question
+from app.crud.crud_quiz import quiz_result, quiz_attempt, attempt_timer
+from app.crud.crud_leaderboard import leaderboards
+from app.crud.crud_academic import student_progress, progress_buffer, assignment, task
 
 # Export all CRUD operations
 __all__ = [
@@ -8,7 +10,14 @@ __all__ = [
     "subject",
     "chapter",
     "resource",
+    "lesson",
+    "quiz_question",
+    "quiz_result",
+    "quiz_attempt",
+    "attempt_timer",
+    "leaderboards",
     "student_progress",
+    "progress_buffer",
     "assignment",
     "task"
 ] 
\ No newline at end of file
@@ -1,13 +1,34 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, List, Optional, Sequence, Set, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, inspect, select
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only
+from app.core.pagination import apply_pagination, paginate
+from app.crud.crud_sync import record_tombstones
 from app.db.base_class import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Blocking rows reported per referencing table
+DELETE_BLOCKERS_LIMIT = 10
+
+class DeleteBlocked(Exception):
+    """
+    Rows can't be deleted because rows of other tables still reference
+    them, or reference rows the delete would cascade to.
+    """
+
+    def __init__(self, blockers: Dict[str, List[int]]):
+        self.blockers = blockers
+        super().__init__(
+            "Still referenced by "
+            + "; ".join(f"{table} {', '.join(map(str, ids))}" for table, ids in blockers.items())
+        )
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         """
@@ -15,22 +36,104 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
 
+    def _columns(self, fields: Sequence[str]) -> List[Any]:
+        """
+        Mapped column attributes for the given names; names that aren't
+        columns (e.g. computed schema fields) are ignored.
+        """
+        column_keys = inspect(self.model).column_attrs.keys()
+        return [getattr(self.model, name) for name in fields if name in column_keys]
+
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         return db.query(self.model).filter(self.model.id == id).first()
 
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
+        """
+        With `fields`, only those columns (and the primary key) are loaded;
+        touching any other column on the results triggers a lazy load.
+        """
+        query = db.query(self.model)
+        if fields is not None:
+            query = query.options(load_only(self.model.id, *self._columns(fields)))
+        return paginate(query, self.model, skip=skip, limit=limit, after_id=after_id)
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
-        obj_in_data = jsonable_encoder(obj_in)
+        table = self.model.__table__
+        # Like create_many, schema fields without a column are left out
+        obj_in_data = {key: value for key, value in jsonable_encoder(obj_in).items() if key in table.c}
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
+    def create_many(self, db: Session, *, objs_in: Sequence[CreateSchemaType]) -> List[RowMapping]:
+        """
+        Insert all rows with a single multi-row INSERT ... RETURNING in one
+        transaction, instead of add/commit/refresh per object. Returns the
+        inserted rows as mappings.
+        """
+        if not objs_in:
+            return []
+        table = self.model.__table__
+        values = [
+            {key: value for key, value in obj_in.model_dump().items() if key in table.c}
+            for obj_in in objs_in
+        ]
+        rows = db.execute(insert(table).returning(*table.c), values).mappings().all()
+        db.commit()
+        return list(rows)
+
+    def _apply_changes(
+        self, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> Set[str]:
+        """
+        Set the mapped columns whose value differs from obj_in and return
+        their names. Unloaded (deferred or expired) columns are assigned
+        without being fetched just to compare them.
+        """
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        state = inspect(db_obj)
+        changed = set()
+        for key in state.mapper.column_attrs.keys():
+            if key not in update_data:
+                continue
+            value = update_data[key]
+            if key not in state.unloaded and getattr(db_obj, key) == value:
+                continue
+            setattr(db_obj, key, value)
+            changed.add(key)
+        return changed
+
+    def update_fields(
+        self,
+        db: Session,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> Set[str]:
+        """
+        Apply obj_in to db_obj and return the names of the columns that
+        changed. Nothing is committed or refreshed when the diff is empty.
+        """
+        changed = self._apply_changes(db_obj, obj_in)
+        if changed:
+            db.add(db_obj)
+            db.commit()
+            db.refresh(db_obj)
+        return changed
+
     def update(
         self,
         db: Session,
@@ -38,21 +141,138 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        self.update_fields(db, db_obj=db_obj, obj_in=obj_in)
         return db_obj
 
+    def _delete_blockers(self, db: Session, ids: Sequence[int]) -> Dict[str, List[int]]:
+        """
+        Ids (up to DELETE_BLOCKERS_LIMIT per table) of rows whose foreign keys
+        would make deleting `ids` fail: references without ON DELETE CASCADE or
+        SET NULL to these rows or to any row the delete cascades to. Cascaded
+        rows are matched through subqueries, so this is one query per
+        restricting foreign key however many rows cascade.
+        """
+        blockers: Dict[str, List[int]] = {}
+        root = self.model.__table__
+        pending = [(root, root.c.id.in_(ids))]
+        while pending:
+            table, criterion = pending.pop()
+            parent_ids = select(table.c.id).where(criterion)
+            for referencing in table.metadata.tables.values():
+                for foreign_key in referencing.foreign_keys:
+                    if foreign_key.column.table is not table:
+                        continue
+                    refers = foreign_key.parent.in_(parent_ids)
+                    ondelete = (foreign_key.ondelete or "").upper()
+                    if ondelete == "CASCADE":
+                        pending.append((referencing, refers))
+                    elif ondelete not in ("SET NULL", "SET DEFAULT"):
+                        blocking = db.execute(
+                            select(referencing.c.id)
+                            .where(refers)
+                            .order_by(referencing.c.id)
+                            .limit(DELETE_BLOCKERS_LIMIT)
+                        ).scalars().all()
+                        if blocking:
+                            blockers.setdefault(referencing.name, []).extend(blocking)
+        return blockers
+
+    def _check_deletable(self, db: Session, ids: Sequence[int]) -> None:
+        blockers = self._delete_blockers(db, ids)
+        if blockers:
+            raise DeleteBlocked(blockers)
+
     def remove(self, db: Session, *, id: int) -> ModelType:
+        """
+        Raises:
+            DeleteBlocked: If other rows still reference the row
+        """
         obj = db.query(self.model).get(id)
+        self._check_deletable(db, [id])
+        record_tombstones(db, self.model, [id])
         db.delete(obj)
         db.commit()
-        return obj 
\ No newline at end of file
+        return obj
+
+    def remove_many(self, db: Session, *, ids: Sequence[int]) -> int:
+        """
+        Delete all rows with the given ids in one statement, leaving child rows
+        to the database's ON DELETE CASCADE. Returns the number of rows deleted.
+
+        Raises:
+            DeleteBlocked: If rows without a cascade still reference them
+        """
+        if not ids:
+            return 0
+        self._check_deletable(db, ids)
+        record_tombstones(db, self.model, ids)
+        result = db.execute(
+            delete(self.model)
+            .where(self.model.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+    # Async variants for endpoints using an AsyncSession
+
+    async def get_async(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def get_multi_async(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[ModelType]:
+        stmt = select(self.model)
+        if fields is not None:
+            stmt = stmt.options(load_only(self.model.id, *self._columns(fields)))
+        stmt = apply_pagination(stmt, self.model, skip=skip, limit=limit, after_id=after_id)
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def create_async(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        table = self.model.__table__
+        # Like create, schema fields without a column are left out
+        obj_in_data = {key: value for key, value in jsonable_encoder(obj_in).items() if key in table.c}
+        db_obj = self.model(**obj_in_data)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update_fields_async(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> Set[str]:
+        changed = self._apply_changes(db_obj, obj_in)
+        if changed:
+            db.add(db_obj)
+            await db.commit()
+            await db.refresh(db_obj)
+        return changed
+
+    async def update_async(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        await self.update_fields_async(db, db_obj=db_obj, obj_in=obj_in)
+        return db_obj
+
+    async def remove_async(self, db: AsyncSession, *, id: int) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.run_sync(self._check_deletable, [id])
+        await db.run_sync(record_tombstones, self.model, [id])
+        await db.delete(obj)
+        await db.commit()
+        return obj
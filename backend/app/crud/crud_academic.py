@@ -1,8 +1,16 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+from sqlalchemy import case, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import RowMapping
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.write_buffer import WriteBehindBuffer
 from app.crud.base import CRUDBase
+from app.db.session import SessionLocal
 from app.models.content import Subject, Chapter, Resource
 from app.models.academic import StudentProgress, Assignment, Task, ClassAssignment
+from app.models.enums import ProgressStatus
 from app.schemas.academic import (
     SubjectCreate, SubjectUpdate,
     ChapterCreate, ChapterUpdate,
@@ -37,9 +45,70 @@ class CRUDResource(CRUDBase[Resource, ResourceCreate, ResourceUpdate]):
 
 resource = CRUDResource(Resource)
 
+def _progress_values(student_id: int, chapter_id: int, completion_percentage: float, now: datetime) -> dict:
+    completed = completion_percentage >= 100
+    return {
+        "student_id": student_id,
+        "chapter_id": chapter_id,
+        "status": ProgressStatus.COMPLETED if completed else ProgressStatus.IN_PROGRESS,
+        "completion_percentage": completion_percentage,
+        "completed_at": now if completed else None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+def _apply_tick(row: StudentProgress, completion_percentage: float, now: datetime) -> None:
+    """
+    Overlay a buffered tick on a detached row, following the upsert's rules.
+    """
+    values = _progress_values(row.student_id, row.chapter_id, completion_percentage, now)
+    row.completion_percentage = values["completion_percentage"]
+    if row.status != ProgressStatus.COMPLETED:
+        row.status = values["status"]
+    row.completed_at = row.completed_at or values["completed_at"]
+    row.updated_at = now
+
 class CRUDStudentProgress(CRUDBase[StudentProgress, StudentProgressCreate, StudentProgressUpdate]):
     def get_by_student(self, db: Session, *, student_id: int) -> List[StudentProgress]:
-        return db.query(StudentProgress).filter(StudentProgress.student_id == student_id).all()
+        """
+        Progress rows for a student, overlaid with ticks still in this
+        process's write-behind buffer. Ticks buffered by other worker
+        processes show up once they flush, within
+        PROGRESS_FLUSH_INTERVAL_SECONDS. Reads never write.
+        """
+        pending = {
+            chapter_id: percentage
+            for (pending_student_id, chapter_id), percentage in progress_buffer.snapshot().items()
+            if pending_student_id == student_id
+        }
+        rows = db.query(StudentProgress).filter(StudentProgress.student_id == student_id).all()
+        now = datetime.utcnow()
+        for row in rows:
+            if row.chapter_id not in pending:
+                continue
+            # Detach first so the overlay is never written back by this session
+            db.expunge(row)
+            _apply_tick(row, pending[row.chapter_id], now)
+        return rows
+
+    def record_tick(
+        self, db: Session, *, student_id: int, chapter_id: int, completion_percentage: float
+    ) -> Union[StudentProgress, RowMapping]:
+        """
+        Record a progress tick and return the row as it reads with the tick
+        applied. The first tick for a chapter is upserted right away, so the
+        row and its id exist for later reads; later ticks go to the
+        write-behind buffer.
+        """
+        row = self.get_student_chapter_progress(db, student_id=student_id, chapter_id=chapter_id)
+        if row is None:
+            return self.update_progress(
+                db, student_id=student_id, chapter_id=chapter_id, completion_percentage=completion_percentage
+            )
+        progress_buffer.put((student_id, chapter_id), completion_percentage)
+        db.expunge(row)
+        _apply_tick(row, completion_percentage, datetime.utcnow())
+        return row
 
     def get_by_chapter(self, db: Session, *, chapter_id: int) -> List[StudentProgress]:
         return db.query(StudentProgress).filter(StudentProgress.chapter_id == chapter_id).all()
@@ -52,29 +121,72 @@ class CRUDStudentProgress(CRUDBase[StudentProgress, StudentProgressCreate, Stude
             StudentProgress.chapter_id == chapter_id
         ).first()
 
+    def _upsert_statement(self, db: Session):
+        dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        table = StudentProgress.__table__
+        stmt = dialect_insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.student_id, table.c.chapter_id],
+            set_={
+                "completion_percentage": stmt.excluded.completion_percentage,
+                "status": case(
+                    (table.c.status == ProgressStatus.COMPLETED, table.c.status),
+                    else_=stmt.excluded.status,
+                ),
+                "completed_at": func.coalesce(table.c.completed_at, stmt.excluded.completed_at),
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+
     def update_progress(
         self, db: Session, *, student_id: int, chapter_id: int, completion_percentage: float
-    ) -> StudentProgress:
-        progress = self.get_student_chapter_progress(db, student_id=student_id, chapter_id=chapter_id)
-        if not progress:
-            progress = StudentProgress(
-                student_id=student_id,
-                chapter_id=chapter_id,
-                status="in_progress",
-                completion_percentage=completion_percentage
-            )
-            db.add(progress)
-        else:
-            progress.completion_percentage = completion_percentage
-            if completion_percentage >= 100:
-                progress.status = "completed"
-        
+    ) -> RowMapping:
+        """
+        Record a progress tick with a single INSERT ... ON CONFLICT DO UPDATE
+        on (student_id, chapter_id), returning the stored row. Concurrent
+        ticks for the same chapter can't create duplicate rows, a completed
+        chapter stays completed and completed_at keeps the first completion.
+        """
+        values = _progress_values(student_id, chapter_id, completion_percentage, datetime.utcnow())
+        stmt = self._upsert_statement(db).returning(*StudentProgress.__table__.c)
+        progress = db.execute(stmt, values).mappings().one()
         db.commit()
-        db.refresh(progress)
         return progress
 
+    def update_progress_many(
+        self, db: Session, *, entries: Dict[Tuple[int, int], float]
+    ) -> None:
+        """
+        Upsert many (student_id, chapter_id) -> completion_percentage ticks as
+        one executemany batch and a single commit.
+        """
+        now = datetime.utcnow()
+        rows = [
+            _progress_values(student_id, chapter_id, percentage, now)
+            for (student_id, chapter_id), percentage in entries.items()
+        ]
+        if not rows:
+            return
+        db.execute(self._upsert_statement(db), rows)
+        db.commit()
+
 student_progress = CRUDStudentProgress(StudentProgress)
 
+def _flush_progress(entries: Dict[Tuple[int, int], float]) -> None:
+    db = SessionLocal()
+    try:
+        student_progress.update_progress_many(db, entries=entries)
+    finally:
+        db.close()
+
+# Progress ticks keyed by (student_id, chapter_id); only the latest one is written
+progress_buffer = WriteBehindBuffer(
+    _flush_progress,
+    max_size=settings.PROGRESS_BUFFER_MAX_SIZE,
+    interval=settings.PROGRESS_FLUSH_INTERVAL_SECONDS,
+    max_attempts=settings.PROGRESS_FLUSH_MAX_ATTEMPTS,
+)
+
 class CRUDAssignment(CRUDBase[Assignment, AssignmentCreate, AssignmentUpdate]):
     def get_by_student(self, db: Session, *, student_id: int) -> List[Assignment]:
         return db.query(Assignment).filter(Assignment.student_id == student_id).all()
@@ -89,10 +201,10 @@ assignment = CRUDAssignment(Assignment)
 
 class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
     def get_by_teacher(self, db: Session, *, teacher_id: int) -> List[Task]:
-        return db.query(Task).filter(Task.assigned_to_id == teacher_id).all()
+        return db.query(Task).filter(Task.assigned_to == teacher_id).all()
 
     def get_by_principal(self, db: Session, *, principal_id: int) -> List[Task]:
-        return db.query(Task).filter(Task.assigned_by_id == principal_id).all()
+        return db.query(Task).filter(Task.created_by == principal_id).all()
 
     def update_status(self, db: Session, *, task_id: int, status: str) -> Task:
         task = self.get(db, id=task_id)
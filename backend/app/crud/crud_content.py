@@ -1,20 +1,109 @@
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from app.crud.base import CRUDBase
-from app.models.content import Subject, Chapter, Resource
+from typing import List, Optional, Dict, Any, Sequence, Set, Union
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer_group
+from app.core.cache import content_cache
+from app.core.grading import QuizPaper
+from app.crud.base import CRUDBase, ModelType, CreateSchemaType, UpdateSchemaType
+from app.crud.ordering import CRUDOrderedMixin
+from app.models.content import Subject, Chapter, Resource, Lesson, QuizQuestion
 from app.schemas.content import (
     SubjectCreate, SubjectUpdate,
     ChapterCreate, ChapterUpdate,
-    ResourceCreate, ResourceUpdate
+    ResourceCreate, ResourceUpdate,
+    LessonCreate, LessonUpdate,
+    QuizQuestionCreate, QuizQuestionUpdate
 )
 
-class CRUDSubject(CRUDBase[Subject, SubjectCreate, SubjectUpdate]):
+class CRUDContentBase(CRUDBase[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    CRUD object for curriculum content. Every write invalidates the cached
+    content tree once it has been committed.
+    """
+
+    def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
+        db_obj = super().create(db, obj_in=obj_in)
+        content_cache.bump()
+        return db_obj
+
+    def create_many(self, db: Session, *, objs_in: Sequence[CreateSchemaType]) -> List[RowMapping]:
+        rows = super().create_many(db, objs_in=objs_in)
+        content_cache.bump()
+        return rows
+
+    def update_fields(
+        self,
+        db: Session,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> Set[str]:
+        changed = super().update_fields(db, db_obj=db_obj, obj_in=obj_in)
+        if changed:
+            content_cache.bump()
+        return changed
+
+    def remove(self, db: Session, *, id: int) -> ModelType:
+        obj = super().remove(db, id=id)
+        content_cache.bump()
+        return obj
+
+    def remove_many(self, db: Session, *, ids: Sequence[int]) -> int:
+        deleted = super().remove_many(db, ids=ids)
+        if deleted:
+            content_cache.bump()
+        return deleted
+
+    def _reordered(self) -> None:
+        content_cache.bump()
+
+    async def create_async(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        db_obj = await super().create_async(db, obj_in=obj_in)
+        content_cache.bump()
+        return db_obj
+
+    async def update_fields_async(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> Set[str]:
+        changed = await super().update_fields_async(db, db_obj=db_obj, obj_in=obj_in)
+        if changed:
+            content_cache.bump()
+        return changed
+
+    async def remove_async(self, db: AsyncSession, *, id: int) -> ModelType:
+        obj = await super().remove_async(db, id=id)
+        content_cache.bump()
+        return obj
+
+class CRUDOrderedContent(CRUDContentBase[ModelType, CreateSchemaType, UpdateSchemaType], CRUDOrderedMixin):
+    """
+    Ordered content. The requested `order` of a new item is its 1-based
+    position in its scope, mapped onto a gapped value between its neighbours.
+    """
+
+    def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
+        return super().create(db, obj_in=self.place_orders(db, [obj_in])[0])
+
+    def create_many(self, db: Session, *, objs_in: Sequence[CreateSchemaType]) -> List[RowMapping]:
+        return super().create_many(db, objs_in=self.place_orders(db, objs_in))
+
+    async def create_async(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        placed = await db.run_sync(lambda session: self.place_orders(session, [obj_in]))
+        return await super().create_async(db, obj_in=placed[0])
+
+class CRUDSubject(CRUDContentBase[Subject, SubjectCreate, SubjectUpdate]):
     def get_by_grade(self, db: Session, *, grade_level: str) -> List[Subject]:
         return db.query(self.model).filter(self.model.grade_level == grade_level).all()
 
 subject = CRUDSubject(Subject)
 
-class CRUDChapter(CRUDBase[Chapter, ChapterCreate, ChapterUpdate]):
+class CRUDChapter(CRUDOrderedContent[Chapter, ChapterCreate, ChapterUpdate]):
+    order_scope = "subject_id"
+
     def get_by_subject(self, db: Session, *, subject_id: int) -> List[Chapter]:
         return (
             db.query(self.model)
@@ -24,27 +113,43 @@ class CRUDChapter(CRUDBase[Chapter, ChapterCreate, ChapterUpdate]):
         )
 
     def reorder_chapters(self, db: Session, *, subject_id: int, chapter_orders: Dict[int, int]) -> List[Chapter]:
-        chapters = self.get_by_subject(db, subject_id=subject_id)
-        for chapter in chapters:
-            if chapter.id in chapter_orders:
-                chapter.order = chapter_orders[chapter.id]
-        db.commit()
-        return chapters
+        """
+        Move several chapters to the given 1-based positions within the
+        subject, renumbering its chapters with one UPDATE ... CASE.
+        """
+        if chapter_orders:
+            self.reorder(db, scope_value=subject_id, positions=chapter_orders)
+            db.commit()
+            content_cache.bump()
+        return self.get_by_subject(db, subject_id=subject_id)
 
 chapter = CRUDChapter(Chapter)
 
-class CRUDResource(CRUDBase[Resource, ResourceCreate, ResourceUpdate]):
+class CRUDResource(CRUDContentBase[Resource, ResourceCreate, ResourceUpdate]):
+    # These return full resources, so the deferred body columns are loaded up front
+
     def get_by_chapter(self, db: Session, *, chapter_id: int) -> List[Resource]:
-        return db.query(self.model).filter(self.model.chapter_id == chapter_id).all()
+        return (
+            db.query(self.model)
+            .options(undefer_group("body"))
+            .filter(self.model.chapter_id == chapter_id)
+            .all()
+        )
 
     def get_by_type(self, db: Session, *, resource_type: str) -> List[Resource]:
-        return db.query(self.model).filter(self.model.resource_type == resource_type).all()
+        return (
+            db.query(self.model)
+            .options(undefer_group("body"))
+            .filter(self.model.resource_type == resource_type)
+            .all()
+        )
 
     def get_by_chapter_and_type(
         self, db: Session, *, chapter_id: int, resource_type: str
     ) -> List[Resource]:
         return (
             db.query(self.model)
+            .options(undefer_group("body"))
             .filter(
                 self.model.chapter_id == chapter_id,
                 self.model.resource_type == resource_type
@@ -52,4 +157,50 @@ class CRUDResource(CRUDBase[Resource, ResourceCreate, ResourceUpdate]):
             .all()
         )
 
-resource = CRUDResource(Resource) 
\ No newline at end of file
+resource = CRUDResource(Resource) 
+
+class CRUDLesson(CRUDOrderedContent[Lesson, LessonCreate, LessonUpdate]):
+    order_scope = "chapter_id"
+
+    def get_by_chapter(self, db: Session, *, chapter_id: int) -> List[Lesson]:
+        return (
+            db.query(self.model)
+            .filter(self.model.chapter_id == chapter_id)
+            .order_by(self.model.order)
+            .all()
+        )
+
+lesson = CRUDLesson(Lesson)
+
+class CRUDQuizQuestion(CRUDOrderedContent[QuizQuestion, QuizQuestionCreate, QuizQuestionUpdate]):
+    order_scope = "quiz_id"
+
+    def get_by_quiz(self, db: Session, *, quiz_id: int) -> List[QuizQuestion]:
+        return (
+            db.query(self.model)
+            .filter(self.model.quiz_id == quiz_id)
+            .order_by(self.model.order)
+            .all()
+        )
+
+    def get_paper(self, db: Session, *, quiz_id: int) -> QuizPaper:
+        """
+        The quiz's questions, rendered and as an answer key, cached with the
+        content tree so any question write invalidates them.
+        """
+        cache_key = ("quiz-paper", quiz_id)
+        paper = content_cache.get(cache_key)
+        if paper is None:
+            version = content_cache.version
+            questions = (
+                db.query(QuizQuestion)
+                .options(undefer_group("body"))
+                .filter(QuizQuestion.quiz_id == quiz_id)
+                .order_by(QuizQuestion.order)
+                .all()
+            )
+            paper = QuizPaper(quiz_id, questions)
+            content_cache.set(cache_key, paper, version=version)
+        return paper
+
+quiz_question = CRUDQuizQuestion(QuizQuestion)
@@ -0,0 +1,202 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.core.leaderboard import Leaderboard
+from app.models.content import Chapter, Quiz, QuizResult
+from app.models.user import StudentProfile
+
+class _Board:
+    """
+    A leaderboard plus the best score per (student, quiz) it was summed
+    from, so recording a result is idempotent: a result that is already
+    part of the board moves nothing. `accepts` tells which (student, quiz)
+    results count towards the board.
+    """
+
+    def __init__(
+        self,
+        bests: Dict[Tuple[int, int], float],
+        accepts: Callable[[int, int], bool],
+        members: Iterable[int] = (),
+    ):
+        self.bests = bests
+        self.accepts = accepts
+        totals = dict.fromkeys(members, 0.0)
+        for (student_id, _), best in bests.items():
+            totals[student_id] = totals.get(student_id, 0.0) + best
+        self.leaderboard = Leaderboard(totals)
+
+    def record(self, student_id: int, quiz_id: int, score: float) -> None:
+        old = self.bests.get((student_id, quiz_id))
+        if old is not None and old >= score:
+            return
+        self.bests[(student_id, quiz_id)] = score
+        self.leaderboard.add(student_id, score - (old or 0.0))
+
+class LeaderboardRegistry:
+    """
+    In-process leaderboards ranking students by their best quiz scores, per
+    quiz, per class (grade and section) and per subject. A board is loaded
+    with one aggregate query on first use and then kept current by
+    `record`, so top-N and rank reads never touch the database.
+
+    Database queries run outside the lock. Results recorded while a board
+    is being loaded are replayed onto it when it is installed.
+    """
+
+    def __init__(self):
+        self._boards: Dict[Hashable, _Board] = {}
+        # Results recorded during each load in progress
+        self._loading: Dict[Hashable, List[Tuple[int, int, float]]] = {}
+        self._quiz_subjects: Dict[int, Optional[int]] = {}
+        self._student_classes: Dict[int, Tuple[str, Optional[str]]] = {}
+        self._lock = threading.RLock()
+        self.loads = 0
+        self.records = 0
+
+    def _best_scores(self, db: Session, *criteria: Any) -> Dict[Tuple[int, int], float]:
+        stmt = (
+            select(QuizResult.student_id, QuizResult.quiz_id, func.max(QuizResult.score))
+            .where(*criteria)
+            .group_by(QuizResult.student_id, QuizResult.quiz_id)
+        )
+        return {(student_id, quiz_id): best for student_id, quiz_id, best in db.execute(stmt)}
+
+    def _load(self, key: Hashable, build: Callable[[], _Board]) -> Leaderboard:
+        with self._lock:
+            board = self._boards.get(key)
+            if board is not None:
+                return board.leaderboard
+            recorded = self._loading.setdefault(key, [])
+        try:
+            built = build()
+        except Exception:
+            with self._lock:
+                if self._loading.get(key) is recorded:
+                    del self._loading[key]
+            raise
+        with self._lock:
+            board = self._boards.get(key)
+            if board is not None:
+                # Installed by a concurrent load
+                return board.leaderboard
+            for student_id, quiz_id, score in recorded:
+                if built.accepts(student_id, quiz_id):
+                    built.record(student_id, quiz_id, score)
+            if self._loading.get(key) is recorded:
+                del self._loading[key]
+            self._boards[key] = built
+            self.loads += 1
+            return built.leaderboard
+
+    def quiz(self, db: Session, *, quiz_id: int) -> Leaderboard:
+        return self._load(
+            ("quiz", quiz_id),
+            lambda: _Board(
+                self._best_scores(db, QuizResult.quiz_id == quiz_id),
+                lambda student_id, result_quiz_id: result_quiz_id == quiz_id,
+            ),
+        )
+
+    def subject(self, db: Session, *, subject_id: int) -> Leaderboard:
+        def build() -> _Board:
+            quizzes = db.execute(
+                select(Quiz.id).join(Chapter, Quiz.chapter_id == Chapter.id).where(Chapter.subject_id == subject_id)
+            ).scalars().all()
+            with self._lock:
+                self._quiz_subjects.update(dict.fromkeys(quizzes, subject_id))
+            quiz_ids = set(quizzes)
+            return _Board(
+                self._best_scores(db, QuizResult.quiz_id.in_(quizzes)) if quizzes else {},
+                lambda student_id, quiz_id: quiz_id in quiz_ids,
+            )
+        return self._load(("subject", subject_id), build)
+
+    def class_(self, db: Session, *, grade: str, section: Optional[str]) -> Leaderboard:
+        """
+        Every student of the class is ranked, starting from zero before
+        their first result.
+        """
+        def build() -> _Board:
+            members = db.execute(
+                select(StudentProfile.user_id).where(
+                    StudentProfile.grade == grade, StudentProfile.section == section
+                )
+            ).scalars().all()
+            with self._lock:
+                self._student_classes.update(dict.fromkeys(members, (grade, section)))
+            member_ids = set(members)
+            return _Board(
+                self._best_scores(db, QuizResult.student_id.in_(members)) if members else {},
+                lambda student_id, quiz_id: student_id in member_ids,
+                members,
+            )
+        return self._load(("class", grade, section), build)
+
+    def _subject_of(self, db: Session, quiz_id: int) -> Optional[int]:
+        with self._lock:
+            if quiz_id in self._quiz_subjects:
+                return self._quiz_subjects[quiz_id]
+        subject_id = db.execute(
+            select(Chapter.subject_id).join(Quiz, Quiz.chapter_id == Chapter.id).where(Quiz.id == quiz_id)
+        ).scalar_one_or_none()
+        with self._lock:
+            self._quiz_subjects[quiz_id] = subject_id
+        return subject_id
+
+    def _classes_of(
+        self, db: Session, student_ids: Sequence[int]
+    ) -> Dict[int, Optional[Tuple[str, Optional[str]]]]:
+        """
+        The class of each student, None without a student profile. Students
+        not seen before (new ones, or ones whose class has no loaded board)
+        are looked up with one query.
+        """
+        with self._lock:
+            unknown = [student_id for student_id in student_ids if student_id not in self._student_classes]
+        if unknown:
+            found = {
+                user_id: (grade, section)
+                for user_id, grade, section in db.execute(
+                    select(StudentProfile.user_id, StudentProfile.grade, StudentProfile.section)
+                    .where(StudentProfile.user_id.in_(unknown))
+                )
+            }
+            with self._lock:
+                self._student_classes.update(found)
+        with self._lock:
+            return {student_id: self._student_classes.get(student_id) for student_id in student_ids}
+
+    def record(self, db: Session, *, quiz_id: int, scores: Iterable[Tuple[int, float]]) -> None:
+        """
+        Apply newly stored (student_id, score) results of a quiz to every
+        loaded board they count towards. Boards that aren't loaded yet pick
+        the results up from the database when they are.
+        """
+        scores = list(scores)
+        subject_id = self._subject_of(db, quiz_id)
+        classes = self._classes_of(db, [student_id for student_id, _ in scores])
+        with self._lock:
+            for recorded in self._loading.values():
+                recorded.extend((student_id, quiz_id, score) for student_id, score in scores)
+            for student_id, score in scores:
+                self.records += 1
+                keys = [("quiz", quiz_id), ("subject", subject_id)]
+                if classes.get(student_id) is not None:
+                    keys.append(("class", *classes[student_id]))
+                for key in keys:
+                    board = self._boards.get(key)
+                    if board is not None:
+                        board.record(student_id, quiz_id, score)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "boards": len(self._boards),
+                "entries": sum(len(board.leaderboard) for board in self._boards.values()),
+                "loads": self.loads,
+                "records": self.records,
+            }
+
+leaderboards = LeaderboardRegistry()
@@ -0,0 +1,402 @@
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+import numpy as np
+from sqlalchemy import Select, bindparam, insert, select, update
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.cache import analytics_cache
+from app.core.config import settings
+from app.core.grading import AnswerKey, item_analysis
+from app.core.timer_wheel import DeadlineScheduler
+from app.crud.base import CRUDBase
+from app.crud.crud_content import quiz_question
+from app.crud.crud_leaderboard import leaderboards
+from app.db.session import SessionLocal
+from app.models.content import Quiz, QuizAnswer, QuizAttempt, QuizResult
+from app.schemas.content import (
+    QuizResultCreate, QuizResultUpdate,
+    QuizAnswerSheet, QuizSheetScore,
+    QuizAttemptCreate, QuizSubmission
+)
+
+def _fetch_columns(db: Session, stmt: Select, count: int) -> List[np.ndarray]:
+    """
+    Run a SELECT and transpose its rows into one array per column. Rows are
+    read straight from the DBAPI cursor, skipping SQLAlchemy's per-row
+    objects and result processing (SQLite returns booleans as 0/1), which
+    dominated the time of large analyses.
+    """
+    result = db.connection().execute(stmt)
+    try:
+        rows = result.cursor.fetchall()
+    finally:
+        result.close()
+    if not rows:
+        return [np.array([]) for _ in range(count)]
+    # One object array built in C, cast per column by the caller
+    return list(np.array(rows, dtype=object).T)
+
+def _timestamp(moment: datetime) -> float:
+    """
+    Epoch seconds of a naive UTC datetime as stored by the models.
+    """
+    return moment.replace(tzinfo=timezone.utc).timestamp()
+
+class CRUDQuizResult(CRUDBase[QuizResult, QuizResultCreate, QuizResultUpdate]):
+    def get_answer_key(self, db: Session, *, quiz_id: int) -> AnswerKey:
+        return quiz_question.get_paper(db, quiz_id=quiz_id).answer_key
+
+    def _insert_graded(
+        self,
+        db: Session,
+        *,
+        answer_key: AnswerKey,
+        student_ids: Sequence[int],
+        sheets: Sequence[Dict[int, str]],
+    ) -> List[RowMapping]:
+        """
+        Grade the sheets and write their results and individual answers with
+        one executemany INSERT each, leaving the transaction open.
+        """
+        matrix = answer_key.sheet_matrix(sheets)
+        correct = answer_key.correct_matrix(matrix)
+        scores = answer_key.score(correct).tolist()
+        table = QuizResult.__table__
+        results = db.execute(
+            insert(table).returning(*table.c, sort_by_parameter_order=True),
+            [
+                {
+                    "quiz_id": answer_key.quiz_id,
+                    "student_id": student_id,
+                    "score": score,
+                    "max_score": answer_key.max_score,
+                }
+                for student_id, score in zip(student_ids, scores)
+            ],
+        ).mappings().all()
+
+        rows, columns = np.nonzero(matrix != "")
+        if len(rows):
+            result_ids = np.array([result["id"] for result in results])[rows]
+            question_ids = np.array(answer_key.question_ids)[columns]
+            db.execute(insert(QuizAnswer), [
+                {"result_id": result_id, "question_id": question_id, "answer": answer, "is_correct": is_correct}
+                for result_id, question_id, answer, is_correct in zip(
+                    result_ids.tolist(),
+                    question_ids.tolist(),
+                    matrix[rows, columns].tolist(),
+                    correct[rows, columns].tolist(),
+                )
+            ])
+        return list(results)
+
+    def _stored(self, db: Session, *, quiz_id: int, results: Sequence[RowMapping]) -> None:
+        """
+        Bring caches and leaderboards up to date with committed results.
+        """
+        analytics_cache.invalidate(quiz_id)
+        leaderboards.record(
+            db, quiz_id=quiz_id, scores=[(result["student_id"], result["score"]) for result in results]
+        )
+
+    def _store_graded(
+        self,
+        db: Session,
+        *,
+        answer_key: AnswerKey,
+        student_ids: Sequence[int],
+        sheets: Sequence[Dict[int, str]],
+    ) -> List[RowMapping]:
+        results = self._insert_graded(db, answer_key=answer_key, student_ids=student_ids, sheets=sheets)
+        db.commit()
+        self._stored(db, quiz_id=answer_key.quiz_id, results=results)
+        return results
+
+    def grade_submission(
+        self, db: Session, *, quiz_id: int, student_id: int, answers: Dict[int, str]
+    ) -> RowMapping:
+        """
+        Score one answer sheet and store its result and answers.
+
+        Raises:
+            ValueError: If an answer refers to a question outside the quiz
+        """
+        answer_key = self.get_answer_key(db, quiz_id=quiz_id)
+        return self._store_graded(db, answer_key=answer_key, student_ids=[student_id], sheets=[answers])[0]
+
+    def grade_batch(
+        self, db: Session, *, quiz_id: int, sheets: Sequence[QuizAnswerSheet]
+    ) -> List[QuizSheetScore]:
+        """
+        Score many answer sheets with one vectorized comparison against the
+        answer key and store all results in bulk.
+
+        Raises:
+            ValueError: If an answer refers to a question outside the quiz
+        """
+        if not sheets:
+            return []
+        answer_key = self.get_answer_key(db, quiz_id=quiz_id)
+        results = self._store_graded(
+            db,
+            answer_key=answer_key,
+            student_ids=[sheet.student_id for sheet in sheets],
+            sheets=[sheet.answers for sheet in sheets],
+        )
+        return [
+            QuizSheetScore(student_id=result["student_id"], score=result["score"], max_score=result["max_score"])
+            for result in results
+        ]
+
+    def get_item_analysis(self, db: Session, *, quiz_id: int) -> Dict[str, Any]:
+        """
+        Item analysis over every stored answer of the quiz, loaded as columnar
+        arrays. Cached until the next result for the quiz is stored.
+        """
+        cached = analytics_cache.get(quiz_id)
+        if cached is not None:
+            return cached
+        answer_key = self.get_answer_key(db, quiz_id=quiz_id)
+        result_ids, scores = _fetch_columns(
+            db,
+            select(QuizResult.id, QuizResult.score)
+            .where(QuizResult.quiz_id == quiz_id)
+            .order_by(QuizResult.id),
+            2,
+        )
+        answer_result_ids, answer_question_ids, answer_texts, is_correct = _fetch_columns(
+            db,
+            select(QuizAnswer.result_id, QuizAnswer.question_id, QuizAnswer.answer, QuizAnswer.is_correct)
+            .join(QuizResult, QuizAnswer.result_id == QuizResult.id)
+            .where(QuizResult.quiz_id == quiz_id),
+            4,
+        )
+        question_ids = np.array(answer_key.question_ids, dtype=int)
+        question_order = np.argsort(question_ids)
+        analysis = item_analysis(
+            answer_key.question_ids,
+            scores.astype(float),
+            answer_key.max_score,
+            np.searchsorted(result_ids.astype(int), answer_result_ids.astype(int)),
+            question_order[
+                np.searchsorted(question_ids, answer_question_ids.astype(int), sorter=question_order)
+            ],
+            answer_texts.astype(str),
+            is_correct.astype(bool),
+        )
+        analysis["quiz_id"] = quiz_id
+        analytics_cache.set(quiz_id, analysis)
+        return analysis
+
+quiz_result = CRUDQuizResult(QuizResult)
+
+class CRUDQuizAttempt(CRUDBase[QuizAttempt, QuizAttemptCreate, QuizSubmission]):
+    """
+    Timed quiz attempts. Deadlines live in `attempt_timer`, which grades
+    expired attempts in batches; the database is only read to reschedule
+    open attempts on startup.
+    """
+
+    def get_open(self, db: Session, *, quiz_id: int, student_id: int) -> Optional[QuizAttempt]:
+        return (
+            db.query(QuizAttempt)
+            .filter(
+                QuizAttempt.quiz_id == quiz_id,
+                QuizAttempt.student_id == student_id,
+                QuizAttempt.submitted_at.is_(None),
+            )
+            .order_by(QuizAttempt.id.desc())
+            .first()
+        )
+
+    def is_expired(self, attempt: QuizAttempt, now: Optional[datetime] = None) -> bool:
+        """
+        Whether the deadline, plus the submission grace period, has passed.
+        """
+        if attempt.deadline is None:
+            return False
+        grace = timedelta(seconds=settings.QUIZ_SUBMIT_GRACE_SECONDS)
+        return (now or datetime.utcnow()) > attempt.deadline + grace
+
+    def _schedule(self, attempt_id: int, deadline: Optional[datetime]) -> None:
+        if deadline is not None:
+            attempt_timer.schedule(attempt_id, _timestamp(deadline) + settings.QUIZ_SUBMIT_GRACE_SECONDS)
+
+    def _check_answers(self, answer_key: AnswerKey, answers: Mapping[int, str]) -> None:
+        unknown = sorted(set(answers) - set(answer_key.columns))
+        if unknown:
+            raise ValueError(
+                f"Questions {', '.join(map(str, unknown))} are not part of quiz {answer_key.quiz_id}"
+            )
+
+    def start(self, db: Session, *, quiz: Quiz, student_id: int) -> QuizAttempt:
+        """
+        Start an attempt, or resume the student's open one. An open attempt
+        whose time is up is auto-submitted first. Concurrent starts resume
+        the same attempt: a unique index allows one open attempt per
+        student and quiz.
+        """
+        attempt = self.get_open(db, quiz_id=quiz.id, student_id=student_id)
+        if attempt is not None:
+            if not self.is_expired(attempt):
+                return attempt
+            self.expire(db, attempt_ids=[attempt.id])
+        now = datetime.utcnow()
+        attempt = QuizAttempt(
+            quiz_id=quiz.id,
+            student_id=student_id,
+            answers={},
+            started_at=now,
+            deadline=now + timedelta(minutes=quiz.time_limit) if quiz.time_limit else None,
+        )
+        db.add(attempt)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another request started one in the meantime
+            db.rollback()
+            existing = self.get_open(db, quiz_id=quiz.id, student_id=student_id)
+            if existing is None:
+                raise
+            return existing
+        db.refresh(attempt)
+        self._schedule(attempt.id, attempt.deadline)
+        return attempt
+
+    def _merged_answers(self, attempt: QuizAttempt, answers: Mapping[int, str]) -> Dict[str, str]:
+        return {**attempt.answers, **{str(question_id): answer for question_id, answer in answers.items()}}
+
+    def save_answers(self, db: Session, *, attempt: QuizAttempt, answers: Mapping[int, str]) -> QuizAttempt:
+        """
+        Merge answers into an open attempt; they are graded if it expires.
+
+        Raises:
+            ValueError: If the attempt is over or an answer is outside the quiz
+        """
+        if self.is_expired(attempt):
+            raise ValueError("Time limit exceeded")
+        self._check_answers(quiz_result.get_answer_key(db, quiz_id=attempt.quiz_id), answers)
+        saved = db.execute(
+            update(QuizAttempt.__table__)
+            .where(QuizAttempt.id == attempt.id, QuizAttempt.submitted_at.is_(None))
+            .values(answers=self._merged_answers(attempt, answers), updated_at=datetime.utcnow())
+        ).rowcount
+        db.commit()
+        if not saved:
+            raise ValueError("Attempt already submitted")
+        db.refresh(attempt)
+        return attempt
+
+    def submit(self, db: Session, *, attempt: QuizAttempt, answers: Mapping[int, str]) -> RowMapping:
+        """
+        Grade an open attempt with its saved answers plus `answers`.
+
+        Raises:
+            ValueError: If the attempt is over or an answer is outside the quiz
+        """
+        if self.is_expired(attempt):
+            raise ValueError("Time limit exceeded")
+        answer_key = quiz_result.get_answer_key(db, quiz_id=attempt.quiz_id)
+        self._check_answers(answer_key, answers)
+        merged = self._merged_answers(attempt, answers)
+        table = QuizAttempt.__table__
+        # Claim the attempt so a concurrent expiry can't grade it as well
+        claimed = db.execute(
+            update(table)
+            .where(table.c.id == attempt.id, table.c.submitted_at.is_(None))
+            .values(answers=merged, submitted_at=datetime.utcnow())
+        ).rowcount
+        if not claimed:
+            db.rollback()
+            raise ValueError("Attempt already submitted")
+        result = quiz_result._insert_graded(
+            db,
+            answer_key=answer_key,
+            student_ids=[attempt.student_id],
+            sheets=[{int(question_id): answer for question_id, answer in merged.items()}],
+        )[0]
+        db.execute(update(table).where(table.c.id == attempt.id).values(result_id=result["id"]))
+        db.commit()
+        quiz_result._stored(db, quiz_id=attempt.quiz_id, results=[result])
+        attempt_timer.cancel(attempt.id)
+        return result
+
+    def expire(self, db: Session, *, attempt_ids: Sequence[int]) -> int:
+        """
+        Auto-submit the still open attempts among `attempt_ids` with their
+        saved answers, grading them per quiz in one batch. Returns how many
+        were submitted.
+        """
+        table = QuizAttempt.__table__
+        claimed = db.execute(
+            update(table)
+            .where(table.c.id.in_(attempt_ids), table.c.submitted_at.is_(None))
+            .values(submitted_at=datetime.utcnow(), auto_submitted=True)
+            .returning(table.c.id, table.c.quiz_id, table.c.student_id, table.c.answers)
+        ).all()
+        by_quiz = defaultdict(list)
+        for attempt in claimed:
+            by_quiz[attempt.quiz_id].append(attempt)
+
+        stored = {}
+        for quiz_id, attempts in by_quiz.items():
+            answer_key = quiz_result.get_answer_key(db, quiz_id=quiz_id)
+            results = quiz_result._insert_graded(
+                db,
+                answer_key=answer_key,
+                student_ids=[attempt.student_id for attempt in attempts],
+                # Questions deleted since the answer was saved are dropped
+                sheets=[
+                    {
+                        int(question_id): answer
+                        for question_id, answer in attempt.answers.items()
+                        if int(question_id) in answer_key.columns
+                    }
+                    for attempt in attempts
+                ],
+            )
+            db.execute(
+                update(table).where(table.c.id == bindparam("attempt_id")).values(result_id=bindparam("graded_id")),
+                [
+                    {"attempt_id": attempt.id, "graded_id": result["id"]}
+                    for attempt, result in zip(attempts, results)
+                ],
+            )
+            stored[quiz_id] = results
+        db.commit()
+        for quiz_id, results in stored.items():
+            quiz_result._stored(db, quiz_id=quiz_id, results=results)
+        return len(claimed)
+
+    def schedule_open(self, db: Session) -> int:
+        """
+        Put the deadlines of every open timed attempt on the timer, e.g. on
+        startup. Attempts that expired meanwhile fire on the next tick.
+        """
+        open_attempts = db.execute(
+            select(QuizAttempt.id, QuizAttempt.deadline).where(
+                QuizAttempt.submitted_at.is_(None), QuizAttempt.deadline.is_not(None)
+            )
+        ).all()
+        for attempt_id, deadline in open_attempts:
+            self._schedule(attempt_id, deadline)
+        return len(open_attempts)
+
+quiz_attempt = CRUDQuizAttempt(QuizAttempt)
+
+def _expire_attempts(attempt_ids: List[int]) -> None:
+    db = SessionLocal()
+    try:
+        quiz_attempt.expire(db, attempt_ids=attempt_ids)
+    finally:
+        db.close()
+
+# Deadlines of open timed attempts, keyed by attempt id
+attempt_timer = DeadlineScheduler(
+    _expire_attempts,
+    tick=settings.QUIZ_TIMER_TICK_SECONDS,
+    slots=settings.QUIZ_TIMER_SLOTS,
+    max_batch=settings.QUIZ_EXPIRE_BATCH_SIZE,
+)
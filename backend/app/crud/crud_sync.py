@@ -0,0 +1,200 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+from sqlalchemy import and_, false, insert, or_, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.base_class import Base
+from app.models.academic import Assignment, Class, ClassAssignment, Task, Tombstone
+from app.models.content import Chapter, Lesson, Resource, Subject
+from app.models.user import StudentProfile, UserRole
+from app.schemas.user import Principal
+
+# Tables served by /sync, by the name they are returned under
+SYNCED_MODELS: Dict[str, Type[Base]] = {
+    "subjects": Subject,
+    "chapters": Chapter,
+    "lessons": Lesson,
+    "resources": Resource,
+    "assignments": Assignment,
+    "tasks": Task,
+}
+
+# Child rows the database deletes along with a parent (ON DELETE CASCADE)
+CASCADE_CHILDREN: Dict[Type[Base], List[Tuple[Type[Base], str]]] = {
+    Subject: [(Chapter, "subject_id")],
+    Chapter: [(Lesson, "chapter_id"), (Resource, "chapter_id")],
+}
+
+def _tombstone(table_name: str, row_id: int, **scope: Any) -> Dict[str, Any]:
+    return {
+        "table_name": table_name,
+        "row_id": row_id,
+        "created_by": scope.get("created_by"),
+        "assigned_to": scope.get("assigned_to"),
+        "class_id": scope.get("class_id"),
+    }
+
+def _tombstone_rows(db: Session, model: Type[Base], row_ids: Sequence[int]) -> List[Dict[str, Any]]:
+    """
+    Tombstones for rows of `model` about to be deleted, carrying the columns
+    get_changes filters them by so they reach only users who saw the rows.
+    """
+    if model is Task:
+        return [
+            _tombstone("tasks", id, created_by=created_by, assigned_to=assigned_to)
+            for id, created_by, assigned_to in db.execute(
+                select(Task.id, Task.created_by, Task.assigned_to).where(Task.id.in_(row_ids))
+            )
+        ]
+    if model is Assignment:
+        classes: Dict[int, List[int]] = defaultdict(list)
+        for assignment_id, class_id in db.execute(
+            select(ClassAssignment.assignment_id, ClassAssignment.class_id)
+            .where(ClassAssignment.assignment_id.in_(row_ids))
+        ):
+            classes[assignment_id].append(class_id)
+        return [
+            _tombstone("assignments", id, created_by=created_by, class_id=class_id)
+            for id, created_by in db.execute(
+                select(Assignment.id, Assignment.created_by).where(Assignment.id.in_(row_ids))
+            )
+            for class_id in classes.get(id) or [None]
+        ]
+    if model is ClassAssignment:
+        # The assignment leaves the view of the class's students
+        return [
+            _tombstone("assignments", assignment_id, class_id=class_id)
+            for assignment_id, class_id in db.execute(
+                select(ClassAssignment.assignment_id, ClassAssignment.class_id)
+                .where(ClassAssignment.id.in_(row_ids))
+            )
+        ]
+    return [_tombstone(model.__tablename__, id) for id in row_ids]
+
+def record_tombstones(db: Session, model: Type[Base], ids: Sequence[int]) -> None:
+    """
+    Leave tombstones for synced rows that are about to be deleted, including
+    the ones the database will cascade to, and for assignments unassigned
+    from a class. Runs in the caller's transaction, before the DELETE.
+    """
+    if (
+        model.__tablename__ not in SYNCED_MODELS
+        and model not in CASCADE_CHILDREN
+        and model is not ClassAssignment
+    ):
+        return
+    tombstones = []
+    pending = [(model, model.id.in_(ids))]
+    while pending:
+        current, criterion = pending.pop()
+        row_ids = db.execute(select(current.id).where(criterion)).scalars().all()
+        if not row_ids:
+            continue
+        if current.__tablename__ in SYNCED_MODELS or current is ClassAssignment:
+            tombstones.extend(_tombstone_rows(db, current, row_ids))
+        for child, column in CASCADE_CHILDREN.get(current, ()):
+            pending.append((child, getattr(child, column).in_(row_ids)))
+    if tombstones:
+        db.execute(insert(Tombstone), tombstones)
+
+def _sees_everything(user: Principal) -> bool:
+    return user.is_superuser or user.role in (UserRole.PRINCIPAL, UserRole.DEVELOPER)
+
+def _student_classes(user: Principal):
+    return (
+        select(Class.id)
+        .join(
+            StudentProfile,
+            (StudentProfile.grade == Class.grade) & (StudentProfile.section == Class.section),
+        )
+        .where(StudentProfile.user_id == user.id)
+    )
+
+def _changed(model: Type[Base], user: Principal, since: Optional[datetime]) -> List[Any]:
+    """
+    WHERE criteria for the rows of `model` the user may see that changed
+    after `since` (all visible rows when None).
+    """
+    updated = [model.updated_at > since] if since is not None else []
+    if model is Task and not _sees_everything(user):
+        return [or_(Task.assigned_to == user.id, Task.created_by == user.id), *updated]
+    if model is Assignment and not _sees_everything(user):
+        if user.role == UserRole.TEACHER:
+            return [Assignment.created_by == user.id, *updated]
+        if user.role != UserRole.STUDENT:
+            return [false()]
+        # Assignments given to the student's class; a new class assignment
+        # counts as a change even when the assignment itself is older
+        class_assignments = select(ClassAssignment.assignment_id).where(
+            ClassAssignment.class_id.in_(_student_classes(user))
+        )
+        visible = Assignment.id.in_(class_assignments)
+        if since is None:
+            return [visible]
+        return [
+            visible,
+            or_(
+                Assignment.updated_at > since,
+                Assignment.id.in_(class_assignments.where(ClassAssignment.updated_at > since)),
+            ),
+        ]
+    return updated
+
+def _deleted(user: Principal) -> List[Any]:
+    """
+    WHERE criteria for the tombstones of rows the user could see, by the
+    same rules as _changed.
+    """
+    if _sees_everything(user):
+        return []
+    if user.role == UserRole.TEACHER:
+        assignments = Tombstone.created_by == user.id
+    elif user.role == UserRole.STUDENT:
+        assignments = Tombstone.class_id.in_(_student_classes(user))
+    else:
+        assignments = false()
+    return [
+        or_(
+            Tombstone.table_name.notin_(("tasks", "assignments")),
+            and_(
+                Tombstone.table_name == "tasks",
+                or_(Tombstone.assigned_to == user.id, Tombstone.created_by == user.id),
+            ),
+            and_(Tombstone.table_name == "assignments", assignments),
+        )
+    ]
+
+def get_changes(db: Session, *, user: Principal, since: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Rows of every synced table created or updated after `since`, and the
+    ids deleted since then, as visible to `user`. Without `since` every
+    visible row is returned. The returned watermark is the `since` of the
+    next call.
+
+    The window reaches SYNC_OVERLAP_SECONDS back before `since` so rows
+    written by transactions still in flight at the last sync aren't
+    missed; clients apply rows as upserts, so repeats are harmless.
+    """
+    watermark = datetime.utcnow()
+    lower = since - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS) if since is not None else None
+    changes = {
+        name: [
+            row._asdict()
+            for row in db.execute(
+                select(*model.__table__.c).where(*_changed(model, user, lower)).order_by(model.id)
+            )
+        ]
+        for name, model in SYNCED_MODELS.items()
+    }
+    deleted: Dict[str, List[int]] = {name: [] for name in SYNCED_MODELS}
+    if lower is not None:
+        tombstones = db.execute(
+            select(Tombstone.table_name, Tombstone.row_id)
+            .where(Tombstone.deleted_at > lower, *_deleted(user))
+            .order_by(Tombstone.id)
+        )
+        # An assignment removed from several of the user's classes has a tombstone for each
+        for table_name, row_id in dict.fromkeys(tombstones):
+            deleted[table_name].append(row_id)
+    return {"watermark": watermark, "changes": changes, "deleted": deleted}
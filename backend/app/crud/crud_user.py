@@ -1,48 +1,126 @@
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Iterable, Optional, Set, Union
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.core.security import get_password_hash, verify_password
+from app.core.cache import principal_cache
+from app.core.security import password_hasher
 from app.crud.base import CRUDBase
-from app.models.user import User, UserRole
+from app.models.user import DeveloperProfile, PrincipalProfile, StudentProfile, TeacherProfile, User, UserRole
 from app.schemas.user import UserCreate, UserUpdate
 
+_PROFILE_MODELS = (StudentProfile, TeacherProfile, PrincipalProfile, DeveloperProfile)
+_STALE_PRINCIPALS = "stale_principals"
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale_principals(session: Session, flush_context) -> None:
+    # Every cached Principal is built from a user row and its profiles
+    user_ids = session.info.setdefault(_STALE_PRINCIPALS, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            user_ids.add(obj.id)
+        elif isinstance(obj, _PROFILE_MODELS):
+            user_ids.add(obj.user_id)
+
+# Ids collected before a rollback are kept; an extra invalidation only costs a lookup
+@event.listens_for(Session, "after_commit")
+def _invalidate_stale_principals(session: Session) -> None:
+    for user_id in session.info.pop(_STALE_PRINCIPALS, ()):
+        principal_cache.invalidate(user_id)
+
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     def get_by_email(self, db: Session, *, email: str) -> Optional[User]:
         return db.query(User).filter(User.email == email).first()
 
+    async def get_by_email_async(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        result = await db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
+
+    def get_student_ids(self, db: Session, *, ids: Iterable[int]) -> Set[int]:
+        """
+        Those of `ids` that belong to users with the student role.
+        """
+        return set(
+            db.execute(
+                select(User.id).where(User.id.in_(set(ids)), User.role == UserRole.STUDENT)
+            ).scalars()
+        )
+
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
-        db_obj = User(
+        db_obj = self._build(obj_in, password_hasher.hash(obj_in.password))
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    async def create_async(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        db_obj = self._build(obj_in, await password_hasher.hash_async(obj_in.password))
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    def _build(self, obj_in: UserCreate, hashed_password: str) -> User:
+        return User(
             email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=hashed_password,
             full_name=obj_in.full_name,
             role=obj_in.role,
             is_active=True,
         )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
 
-    def update(
+    def update_fields(
         self, db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
-    ) -> User:
+    ) -> Set[str]:
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = obj_in.model_dump(exclude_unset=True)
         if update_data.get("password"):
-            hashed_password = get_password_hash(update_data["password"])
+            hashed_password = password_hasher.hash(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        return super().update_fields(db, db_obj=db_obj, obj_in=update_data)
+
+    async def update_fields_async(
+        self, db: AsyncSession, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> Set[str]:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        if update_data.get("password"):
+            hashed_password = await password_hasher.hash_async(update_data["password"])
+            del update_data["password"]
+            update_data["hashed_password"] = hashed_password
+        return await super().update_fields_async(db, db_obj=db_obj, obj_in=update_data)
 
     def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
         user = self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        verified, new_hash = password_hasher.verify_and_update(password, user.hashed_password)
+        if not verified:
             return None
+        if new_hash:
+            # Stored hash uses an outdated cost; upgrade it transparently
+            user.hashed_password = new_hash
+            db.commit()
         return user
 
+    async def authenticate_async(self, db: AsyncSession, *, email: str, password: str) -> Optional[User]:
+        user = await self.get_by_email_async(db, email=email)
+        if not user:
+            return None
+        verified, new_hash = await password_hasher.verify_and_update_async(password, user.hashed_password)
+        if not verified:
+            return None
+        if new_hash:
+            user.hashed_password = new_hash
+            await db.commit()
+        return user
+
+    # Role helpers accept either a User row or a cached Principal
+
     def is_active(self, user: User) -> bool:
         return user.is_active
 
@@ -58,4 +136,4 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     def is_developer(self, user: User) -> bool:
         return user.role == UserRole.DEVELOPER
 
-user = CRUDUser(User) 
\ No newline at end of file
+user = CRUDUser(User)
@@ -0,0 +1,210 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+# Distance between neighbouring `order` values after a rebalance. A move
+# takes the midpoint of its neighbours, so about log2(ORDER_GAP) moves into
+# the same spot fit before the scope has to be renumbered.
+ORDER_GAP = 1024
+
+def gapped_orders(orders: Sequence[int], *, after: int = 0) -> List[int]:
+    """
+    Order values ORDER_GAP apart above `after` for items whose requested
+    `orders` only give their relative sequence (ties keep their position).
+    """
+    ranked = sorted(range(len(orders)), key=orders.__getitem__)
+    gapped = [0] * len(orders)
+    for rank, index in enumerate(ranked, start=1):
+        gapped[index] = after + rank * ORDER_GAP
+    return gapped
+
+def _orders_between_neighbours(sequence: Sequence[Any]) -> Optional[List[int]]:
+    """
+    Orders for a sequence of existing (id, order) rows and new items that
+    keep the existing values and spread each run of new items evenly
+    between its neighbours (ORDER_GAP apart after the last row). None when
+    some run doesn't fit between its neighbours.
+    """
+    orders: List[int] = []
+    lower = 0
+    run = 0
+    for entry in sequence:
+        if not isinstance(entry, tuple):
+            run += 1
+            continue
+        upper = entry[1]
+        step = (upper - lower) // (run + 1)
+        if run and step < 1:
+            return None
+        orders.extend(lower + step * k for k in range(1, run + 1))
+        orders.append(upper)
+        lower, run = upper, 0
+    orders.extend(lower + ORDER_GAP * k for k in range(1, run + 1))
+    return orders
+
+class CRUDOrderedMixin:
+    """
+    Gapped integer ordering for models with an `order` column scoped by a
+    parent key (`order_scope`). Moving an item writes only that item's row;
+    when its neighbours have no gap left, the scope is renumbered with a
+    single bulk UPDATE.
+    """
+
+    order_scope: str
+
+    def _reordered(self) -> None:
+        pass
+
+    def _insert_at_positions(self, sequence: List[Any], items: Sequence[Any], positions: Sequence[int]) -> None:
+        """
+        Insert `items` into `sequence` so each ends up at its requested 1-based
+        position, in order of position (ties keep their sequence). Positions
+        past the end append.
+        """
+        for index in sorted(range(len(items)), key=positions.__getitem__):
+            position = min(max(positions[index], 1), len(sequence) + 1)
+            sequence.insert(position - 1, items[index])
+
+    def _scope_rows(self, db: Session, scope_values: Sequence[Any]) -> Dict[Any, List[Tuple[int, int]]]:
+        scope = getattr(self.model, self.order_scope)
+        rows: Dict[Any, List[Tuple[int, int]]] = defaultdict(list)
+        for scope_value, id, order in db.execute(
+            select(scope, self.model.id, self.model.order)
+            .where(scope.in_(scope_values))
+            .order_by(scope, self.model.order, self.model.id)
+        ):
+            rows[scope_value].append((id, order))
+        return rows
+
+    def _write_orders(self, db: Session, orders: Dict[int, int]) -> None:
+        """
+        Set the given orders by id with one UPDATE ... CASE. The caller commits.
+        """
+        if not orders:
+            return
+        db.execute(
+            update(self.model)
+            .where(self.model.id.in_(orders))
+            .values(order=case(orders, value=self.model.id))
+            .execution_options(synchronize_session=False)
+        )
+        # Loaded objects still hold the old values
+        db.expire_all()
+
+    def place_orders(self, db: Session, objs_in: Sequence[Any]) -> List[Any]:
+        """
+        Copies of the new items with gapped orders that put each at its
+        requested `order`, read as a 1-based position in its scope once the
+        batch is inserted. New items take values between their neighbours;
+        when the neighbours are too close, the scope's existing rows are
+        renumbered ORDER_GAP apart first. The caller commits.
+        """
+        by_scope: Dict[Any, List[int]] = defaultdict(list)
+        for index, obj_in in enumerate(objs_in):
+            by_scope[getattr(obj_in, self.order_scope)].append(index)
+        if not by_scope:
+            return []
+        existing = self._scope_rows(db, list(by_scope))
+        placed = list(objs_in)
+        for scope_value, indexes in by_scope.items():
+            # Existing rows are (id, order) pairs, new items their index in objs_in
+            sequence: List[Any] = list(existing[scope_value])
+            self._insert_at_positions(sequence, indexes, [objs_in[index].order for index in indexes])
+            orders = _orders_between_neighbours(sequence)
+            if orders is None:
+                orders = [rank * ORDER_GAP for rank in range(1, len(sequence) + 1)]
+                self._write_orders(db, {
+                    entry[0]: order for entry, order in zip(sequence, orders)
+                    if isinstance(entry, tuple) and entry[1] != order
+                })
+            for entry, order in zip(sequence, orders):
+                if not isinstance(entry, tuple):
+                    placed[entry] = objs_in[entry].model_copy(update={"order": order})
+        return placed
+
+    def reorder(self, db: Session, *, scope_value: Any, positions: Dict[int, int]) -> None:
+        """
+        Move the items `positions` names to their requested 1-based positions
+        within the scope, keeping the others' sequence, and renumber the
+        scope ORDER_GAP apart. Ids from other scopes are ignored. The caller
+        commits.
+        """
+        rows = self._scope_rows(db, [scope_value])[scope_value]
+        moved = [id for id, _ in rows if id in positions]
+        sequence = [(id, order) for id, order in rows if id not in positions]
+        current = dict(rows)
+        self._insert_at_positions(sequence, [(id, current[id]) for id in moved], [positions[id] for id in moved])
+        self._write_orders(db, {
+            id: rank * ORDER_GAP for rank, (id, order) in enumerate(sequence, start=1)
+            if order != rank * ORDER_GAP
+        })
+
+    def _next_order(self, db: Session, db_obj: Any, lower: Optional[int]) -> Optional[int]:
+        """
+        A free order value right above `lower` (or first when None), or None
+        when there is no gap left.
+        """
+        order = self.model.order
+        stmt = select(func.min(order)).where(
+            getattr(self.model, self.order_scope) == getattr(db_obj, self.order_scope),
+            self.model.id != db_obj.id,
+        )
+        if lower is not None:
+            stmt = stmt.where(order > lower)
+        upper = db.scalar(stmt)
+        if upper is None:
+            return ORDER_GAP if lower is None else lower + ORDER_GAP
+        if lower is None:
+            lower = 0
+        if upper - lower < 2:
+            return None
+        return (lower + upper) // 2
+
+    def move_after(self, db: Session, *, db_obj: Any, after_id: Optional[int]) -> Any:
+        """
+        Place db_obj directly after the item `after_id` of the same scope, or
+        first when after_id is None. Raises ValueError for an unknown item or
+        one from another scope.
+        """
+        after = None
+        if after_id is not None:
+            after = self.get(db, id=after_id)
+            if (
+                after is None
+                or after.id == db_obj.id
+                or getattr(after, self.order_scope) != getattr(db_obj, self.order_scope)
+            ):
+                raise ValueError(f"after_id must be another item with the same {self.order_scope}")
+        new_order = self._next_order(db, db_obj, after.order if after else None)
+        if new_order is None:
+            self.rebalance(db, scope_value=getattr(db_obj, self.order_scope))
+            new_order = self._next_order(db, db_obj, after.order if after else None)
+        db_obj.order = new_order
+        db.commit()
+        db.refresh(db_obj)
+        self._reordered()
+        return db_obj
+
+    def rebalance(self, db: Session, *, scope_value: Any) -> None:
+        """
+        Renumber a scope to ORDER_GAP, 2 * ORDER_GAP, ... keeping the current
+        sequence (ties broken by id), as one UPDATE ... FROM statement. The
+        caller commits.
+        """
+        table = self.model.__table__
+        ranked = (
+            select(
+                table.c.id,
+                (func.row_number().over(order_by=(table.c.order, table.c.id)) * ORDER_GAP).label("new_order"),
+            )
+            .where(table.c[self.order_scope] == scope_value)
+            .subquery()
+        )
+        db.execute(
+            update(table)
+            .where(table.c.id == ranked.c.id)
+            .values(order=ranked.c.new_order)
+        )
+        # Loaded objects still hold the old values
+        db.expire_all()
@@ -3,8 +3,8 @@
 from app.db.base_class import Base
 from app.models.enums import UserRole, ResourceType, ProgressStatus, TaskStatus
 from app.models.user import User, StudentProfile, TeacherProfile, PrincipalProfile, DeveloperProfile
-from app.models.content import Subject, Chapter, Resource, Lesson, Quiz, QuizQuestion, QuizResult
-from app.models.academic import StudentProgress, Assignment, Task, ClassAssignment
+from app.models.content import Subject, Chapter, Resource, Lesson, Quiz, QuizQuestion, QuizResult, QuizAnswer, QuizAttempt
+from app.models.academic import StudentProgress, Assignment, Task, ClassAssignment, Tombstone, TableVersion
 
 # Define enums
 import enum
@@ -1,11 +1,11 @@
-from typing import Any
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
 from sqlalchemy import Column, Integer, DateTime
 from datetime import datetime
 
 @as_declarative()
 class Base:
-    id: Any
+    # Plain Column attributes, not Mapped[] annotations
+    __allow_unmapped__ = True
     __name__: str
     
     # Generate __tablename__ automatically
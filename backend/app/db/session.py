@@ -1,14 +1,86 @@
-from sqlalchemy import create_engine
+from typing import Any, Dict
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool import TimedAsyncQueuePool, TimedQueuePool
+# Registers the Session listeners that bump table write versions
+import app.db.table_versions  # noqa: F401
 
-engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
+# Async driver for each database backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def get_async_database_url(url: str) -> str:
+    """
+    Map a sync database URL (with or without an explicit driver, e.g.
+    postgresql+psycopg2) onto the async driver for its backend. URLs of
+    other backends are returned unchanged.
+    """
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if drivername is None:
+        return url
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+def _engine_options(url: str, poolclass: type) -> Dict[str, Any]:
+    """
+    Pool settings from Settings. In-memory SQLite keeps SQLAlchemy's default
+    single-connection pool, since every new connection would be a new database.
+    """
+    parsed = make_url(url)
+    options: Dict[str, Any] = {}
+    if parsed.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if parsed.database in (None, "", ":memory:"):
+            return options
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    # SQLite ignores foreign keys, including ON DELETE CASCADE, unless enabled per connection
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    cursor.close()
+
+def _tune_sqlite(engine: Engine) -> None:
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL, TimedQueuePool))
+_tune_sqlite(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for endpoints that run on the event loop instead of the threadpool
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **_engine_options(ASYNC_DATABASE_URL, TimedAsyncQueuePool)
+)
+_tune_sqlite(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 # Dependency
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
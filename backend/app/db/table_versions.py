@@ -0,0 +1,89 @@
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Set
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.db.base_class import Base
+from app.models.academic import TableVersion
+
+# Tables whose list endpoints answer conditional GETs from their version
+VERSIONED_TABLES = frozenset({
+    "subjects", "chapters", "lessons", "resources", "quizzes", "assignments", "tasks", "users",
+})
+
+_PENDING = "versioned_tables"
+
+@lru_cache(maxsize=None)
+def _cascades(table_name: str) -> FrozenSet[str]:
+    """
+    Tables whose rows the database changes when rows of `table_name` are
+    deleted (ON DELETE CASCADE / SET NULL), transitively.
+    """
+    found: Set[str] = set()
+    pending = [table_name]
+    while pending:
+        current = pending.pop()
+        for table in Base.metadata.tables.values():
+            for foreign_key in table.foreign_keys:
+                if (
+                    foreign_key.column.table.name == current
+                    and (foreign_key.ondelete or "").upper() in ("CASCADE", "SET NULL")
+                    and table.name not in found
+                ):
+                    found.add(table.name)
+                    pending.append(table.name)
+    return frozenset(found)
+
+def _mark(session: Session, table_names: Iterable[str]) -> None:
+    session.info.setdefault(_PENDING, set()).update(
+        name for name in table_names if name in VERSIONED_TABLES
+    )
+
+def _bump_pending(session: Session) -> None:
+    table_names = session.info.pop(_PENDING, None)
+    if not table_names:
+        return
+    connection = session.connection()
+    dialect_insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    table = TableVersion.__table__
+    stmt = dialect_insert(table)
+    connection.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[table.c.table_name],
+            set_={"version": table.c.version + 1},
+        ),
+        [{"table_name": name, "version": 1} for name in sorted(table_names)],
+    )
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement(state) -> None:
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    table_name = state.statement.table.name
+    _mark(state.session, [table_name])
+    if state.is_delete:
+        _mark(state.session, _cascades(table_name))
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, flush_context) -> None:
+    changed = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(type(obj), "__table__", None)
+        if table is not None and (obj not in session.dirty or session.is_modified(obj)):
+            changed.add(table.name)
+    for obj in session.deleted:
+        changed |= _cascades(type(obj).__table__.name)
+    _mark(session, changed)
+    # Written in the same transaction as the change itself
+    _bump_pending(session)
+
+@event.listens_for(Session, "before_commit")
+def _track_commit(session: Session) -> None:
+    # Core statements that no later flush picks up. Marks survive a rollback:
+    # one may undo only a savepoint, and an extra bump costs one 200
+    _bump_pending(session)
+
+def versions_statement(table_names: Iterable[str]):
+    return select(TableVersion.table_name, TableVersion.version).where(
+        TableVersion.table_name.in_(list(table_names))
+    )
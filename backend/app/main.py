@@ -1,11 +1,23 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request, status
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from app.api import deps
+from app.core.cache import analytics_cache, content_cache, principal_cache
 from app.core.config import settings
+from app.core.etag import ETagMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.security import PasswordHasherBusy, password_hasher
+from app.crud.crud_academic import progress_buffer
+from app.crud.crud_leaderboard import leaderboards
+from app.crud.crud_quiz import attempt_timer, quiz_attempt
+from app.db.pool import async_pool_metrics, sync_pool_metrics
+from app.db.session import SessionLocal, async_engine, engine
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="A comprehensive school management system API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -15,8 +27,61 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers hide non-safelisted response headers from scripts unless listed
+    expose_headers=["ETag", NEXT_CURSOR_HEADER],
 )
 
+# Strong ETags and 304 answers for conditional GETs
+app.add_middleware(ETagMiddleware)
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return ORJSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+@app.on_event("startup")
+def start_progress_buffer():
+    progress_buffer.start()
+
+@app.on_event("shutdown")
+def flush_progress_buffer():
+    progress_buffer.stop()
+
+@app.on_event("startup")
+def start_attempt_timer():
+    db = SessionLocal()
+    try:
+        quiz_attempt.schedule_open(db)
+    finally:
+        db.close()
+    attempt_timer.start()
+
+@app.on_event("shutdown")
+def stop_attempt_timer():
+    attempt_timer.stop()
+
+@app.on_event("shutdown")
+def shutdown_password_hasher():
+    password_hasher.shutdown()
+
 @app.get("/")
 async def root():
-    return {"message": "Welcome to School Management System API"} 
\ No newline at end of file
+    return {"message": "Welcome to School Management System API"}
+
+@app.get("/metrics", dependencies=[Depends(deps.get_current_developer_or_superuser)])
+async def metrics():
+    return {
+        "db_pool": {
+            "sync": {**sync_pool_metrics.snapshot(), "status": engine.pool.status()},
+            "async": {**async_pool_metrics.snapshot(), "status": async_engine.pool.status()},
+        },
+        "content_cache": content_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+        "analytics_cache": analytics_cache.stats(),
+        "progress_buffer": progress_buffer.stats(),
+        "leaderboards": leaderboards.stats(),
+        "attempt_timer": attempt_timer.stats(),
+    }
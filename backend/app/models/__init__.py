@@ -15,6 +15,6 @@ __all__ = [
 ]
 
 from app.models.user import User, StudentProfile, TeacherProfile, PrincipalProfile, DeveloperProfile
-from app.models.content import Subject, Chapter, Resource, Lesson, Quiz, QuizQuestion, QuizResult
-from app.models.academic import Class, StudentProgress, Assignment, ClassAssignment, Task
+from app.models.content import Subject, Chapter, Resource, Lesson, Quiz, QuizQuestion, QuizResult, QuizAnswer, QuizAttempt
+from app.models.academic import Class, StudentProgress, Assignment, ClassAssignment, Task, Tombstone, TableVersion
 from app.models.enums import UserRole, ResourceType, ProgressStatus, TaskStatus 
\ No newline at end of file
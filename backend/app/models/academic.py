@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Enum, Float, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.models.base_model import *
 from app.models.enums import ProgressStatus, TaskStatus
@@ -20,11 +20,15 @@ class Class(Base):
 
 class StudentProgress(Base):
     __tablename__ = "student_progress"
+    __table_args__ = (
+        UniqueConstraint("student_id", "chapter_id", name="uq_student_progress_student_id_chapter_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     chapter_id = Column(Integer, ForeignKey("chapters.id"), nullable=False)
     status = Column(Enum(ProgressStatus), nullable=False)
+    completion_percentage = Column(Float, nullable=False, default=0.0)
     completed_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -35,6 +39,9 @@ class StudentProgress(Base):
 
 class Assignment(Base):
     __tablename__ = "assignments"
+    __table_args__ = (
+        Index("ix_assignments_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -53,6 +60,11 @@ class Assignment(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_assigned_to", "assigned_to"),
+        Index("ix_tasks_created_by", "created_by"),
+        Index("ix_tasks_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -82,4 +94,39 @@ class ClassAssignment(Base):
     # Relationships
     assignment = relationship("Assignment")
     class_ = relationship("Class", back_populates="assignments")
-    assigned_by_user = relationship("User", foreign_keys=[assigned_by]) 
\ No newline at end of file
+    assigned_by_user = relationship("User", foreign_keys=[assigned_by]) 
+
+class Tombstone(Base):
+    """
+    Marks a deleted row of a table served by /sync, so clients syncing
+    incrementally learn about deletions.
+    """
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_deleted_at", "deleted_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    table_name = Column(String, nullable=False)
+    row_id = Column(Integer, nullable=False)
+    # Who could see the row, for tables /sync filters per user; plain
+    # values, since the referenced rows may be deleted too
+    created_by = Column(Integer)
+    assigned_to = Column(Integer)
+    class_id = Column(Integer)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class TableVersion(Base):
+    """
+    Write counter per table, bumped in the same transaction as every write
+    to it, so list ETags change even when row count and max(updated_at) don't.
+    """
+    __tablename__ = "table_versions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    table_name = Column(String, nullable=False, unique=True)
+    version = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
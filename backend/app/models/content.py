@@ -1,11 +1,14 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Enum, Boolean, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Enum, Boolean, Float, Index, JSON, text
+from sqlalchemy.orm import deferred, relationship
 from app.models.base_model import *
 from app.models.enums import ResourceType
 
 class Subject(Base):
     __tablename__ = "subjects"
+    __table_args__ = (
+        Index("ix_subjects_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -15,36 +18,45 @@ class Subject(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    chapters = relationship("Chapter", back_populates="subject", cascade="all, delete-orphan")
+    chapters = relationship("Chapter", back_populates="subject", cascade="all, delete-orphan", passive_deletes=True)
     assignments = relationship("Assignment", back_populates="subject")
 
 class Chapter(Base):
     __tablename__ = "chapters"
+    __table_args__ = (
+        Index("ix_chapters_subject_id_order", "subject_id", "order"),
+        Index("ix_chapters_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(Text)
-    subject_id = Column(Integer, ForeignKey("subjects.id"), nullable=False)
+    subject_id = Column(Integer, ForeignKey("subjects.id", ondelete="CASCADE"), nullable=False)
     order = Column(Integer, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     subject = relationship("Subject", back_populates="chapters")
-    resources = relationship("Resource", back_populates="chapter", cascade="all, delete-orphan")
-    lessons = relationship("Lesson", back_populates="chapter", cascade="all, delete-orphan")
+    resources = relationship("Resource", back_populates="chapter", cascade="all, delete-orphan", passive_deletes=True)
+    lessons = relationship("Lesson", back_populates="chapter", cascade="all, delete-orphan", passive_deletes=True)
     student_progress = relationship("StudentProgress", back_populates="chapter")
     assignments = relationship("Assignment", back_populates="chapter")
 
 class Resource(Base):
     __tablename__ = "resources"
+    __table_args__ = (
+        Index("ix_resources_chapter_id_resource_type", "chapter_id", "resource_type"),
+        Index("ix_resources_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
-    description = Column(Text)
-    chapter_id = Column(Integer, ForeignKey("chapters.id"), nullable=False)
+    # Large text columns are deferred; detail views load them with undefer_group("body")
+    description = deferred(Column(Text), group="body")
+    chapter_id = Column(Integer, ForeignKey("chapters.id", ondelete="CASCADE"), nullable=False)
     resource_type = Column(Enum(ResourceType), nullable=False)
-    content = Column(Text)  # For text-based content
+    content = deferred(Column(Text), group="body")  # For text-based content
     file_url = Column(String)  # For uploaded files or external links
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -68,17 +80,21 @@ class Quiz(Base):
     # Relationships
     chapter = relationship("Chapter")
     creator = relationship("User", foreign_keys=[created_by])
-    questions = relationship("QuizQuestion", back_populates="quiz", cascade="all, delete-orphan")
+    questions = relationship("QuizQuestion", back_populates="quiz", cascade="all, delete-orphan", passive_deletes=True)
     results = relationship("QuizResult", back_populates="quiz")
+    attempts = relationship("QuizAttempt", back_populates="quiz", passive_deletes=True)
 
 class QuizQuestion(Base):
     __tablename__ = "quiz_questions"
+    __table_args__ = (
+        Index("ix_quiz_questions_quiz_id_order", "quiz_id", "order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    quiz_id = Column(Integer, ForeignKey("quizzes.id"), nullable=False)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False)
     question_text = Column(Text, nullable=False)
     correct_answer = Column(String, nullable=False)
-    options = Column(Text, nullable=False)  # JSON string of options
+    options = deferred(Column(JSON, nullable=False, default=list), group="body")  # list of option labels
     points = Column(Integer, default=1)
     order = Column(Integer, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -89,6 +105,9 @@ class QuizQuestion(Base):
 
 class QuizResult(Base):
     __tablename__ = "quiz_results"
+    __table_args__ = (
+        Index("ix_quiz_results_quiz_id_score", "quiz_id", "score"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     quiz_id = Column(Integer, ForeignKey("quizzes.id"), nullable=False)
@@ -102,17 +121,80 @@ class QuizResult(Base):
     # Relationships
     quiz = relationship("Quiz", back_populates="results")
     student = relationship("User", foreign_keys=[student_id])
+    answers = relationship("QuizAnswer", back_populates="result", cascade="all, delete-orphan", passive_deletes=True)
+
+class QuizAnswer(Base):
+    """
+    One answer of a graded quiz sheet, kept for item analysis.
+    """
+    __tablename__ = "quiz_answers"
+    __table_args__ = (
+        Index("ix_quiz_answers_result_id", "result_id"),
+        Index("ix_quiz_answers_question_id", "question_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    result_id = Column(Integer, ForeignKey("quiz_results.id", ondelete="CASCADE"), nullable=False)
+    question_id = Column(Integer, ForeignKey("quiz_questions.id", ondelete="CASCADE"), nullable=False)
+    answer = Column(String, nullable=False)
+    is_correct = Column(Boolean, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    result = relationship("QuizResult", back_populates="answers")
+    question = relationship("QuizQuestion")
 
 class Lesson(Base):
     __tablename__ = "lessons"
+    __table_args__ = (
+        Index("ix_lessons_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
-    content = Column(Text, nullable=False)
+    content = deferred(Column(Text, nullable=False), group="body")
     order = Column(Integer, nullable=False)
-    chapter_id = Column(Integer, ForeignKey("chapters.id"), nullable=False)
+    chapter_id = Column(Integer, ForeignKey("chapters.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    chapter = relationship("Chapter", back_populates="lessons") 
\ No newline at end of file
+    chapter = relationship("Chapter", back_populates="lessons") 
+
+class QuizAttempt(Base):
+    """
+    A student's timed sitting of a quiz. Answers are saved as they go and
+    graded on submit, or automatically once the deadline has passed.
+    """
+    __tablename__ = "quiz_attempts"
+    __table_args__ = (
+        Index("ix_quiz_attempts_quiz_id_student_id", "quiz_id", "student_id"),
+        Index("ix_quiz_attempts_submitted_at_deadline", "submitted_at", "deadline"),
+        # At most one open attempt per student and quiz
+        Index(
+            "ux_quiz_attempts_open",
+            "quiz_id",
+            "student_id",
+            unique=True,
+            sqlite_where=text("submitted_at IS NULL"),
+            postgresql_where=text("submitted_at IS NULL"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False)
+    student_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    answers = Column(JSON, nullable=False, default=dict)  # question id (as text) -> answer
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    deadline = Column(DateTime)  # None when the quiz has no time limit
+    submitted_at = Column(DateTime)
+    auto_submitted = Column(Boolean, nullable=False, default=False)
+    result_id = Column(Integer, ForeignKey("quiz_results.id", ondelete="SET NULL"))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    quiz = relationship("Quiz", back_populates="attempts")
+    student = relationship("User", foreign_keys=[student_id])
+    result = relationship("QuizResult")
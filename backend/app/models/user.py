@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, Integer, String, Enum
+from sqlalchemy import Boolean, Column, Integer, String, Enum, ForeignKey
 from sqlalchemy.orm import relationship
 import enum
 from app.db.base_class import Base
@@ -0,0 +1,30 @@
+from typing import Any, Dict, List, Sequence, Tuple, Type, TypeVar
+from pydantic import BaseModel, ValidationError
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# Bulk create schemas
+class BulkRowError(BaseModel):
+    index: int
+    errors: List[Dict[str, Any]]
+
+def validate_rows(schema: Type[SchemaT], rows: Sequence[Dict[str, Any]]) -> Tuple[List[SchemaT], List[BulkRowError]]:
+    """
+    Validate each row of a bulk payload on its own so every bad row is
+    reported with its index.
+    """
+    valid: List[SchemaT] = []
+    errors: List[BulkRowError] = []
+    for index, row in enumerate(rows):
+        try:
+            valid.append(schema.model_validate(row))
+        except ValidationError as e:
+            errors.append(BulkRowError(
+                index=index,
+                errors=[{"loc": list(err["loc"]), "msg": err["msg"], "type": err["type"]} for err in e.errors()],
+            ))
+    return valid, errors
+
+# Bulk delete schemas
+class BulkDeleteResult(BaseModel):
+    deleted: int
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -29,6 +29,7 @@ class ChapterBase(BaseModel):
     subject_id: int
     order: int
 
+# On create, `order` is the 1-based position to insert at, not a stored value
 class ChapterCreate(ChapterBase):
     pass
 
@@ -75,6 +76,7 @@ class LessonBase(BaseModel):
     content: str
     order: int
 
+# On create, `order` is the 1-based position to insert at, not a stored value
 class LessonCreate(LessonBase):
     pass
 
@@ -112,6 +114,129 @@ class Quiz(QuizBase):
     class Config:
         from_attributes = True
 
+# Quiz question schemas
+class QuizQuestionBase(BaseModel):
+    quiz_id: int
+    question_text: str
+    correct_answer: str
+    options: List[str] = []
+    points: int = 1
+    order: int
+
+# On create, `order` is the 1-based position to insert at, not a stored value
+class QuizQuestionCreate(QuizQuestionBase):
+    pass
+
+class QuizQuestionUpdate(QuizQuestionBase):
+    pass
+
+class QuizQuestion(QuizQuestionBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# A question as shown to students taking the quiz, without its answer
+class QuizQuestionPublic(BaseModel):
+    id: int
+    question_text: str
+    options: List[str]
+    points: int
+    order: int
+
+# Quiz result schemas
+class QuizResultBase(BaseModel):
+    quiz_id: int
+    student_id: int
+    score: float
+    max_score: float
+
+class QuizResultCreate(QuizResultBase):
+    pass
+
+class QuizResultUpdate(QuizResultBase):
+    pass
+
+class QuizResult(QuizResultBase):
+    id: int
+    completed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# Quiz submission schemas; answers map question id to the given answer
+class QuizSubmission(BaseModel):
+    answers: Dict[int, str]
+
+class QuizAnswerSheet(QuizSubmission):
+    student_id: int
+
+# Timed quiz attempt schemas
+class QuizAttemptBase(BaseModel):
+    quiz_id: int
+    student_id: int
+
+class QuizAttemptCreate(QuizAttemptBase):
+    pass
+
+class QuizAttempt(QuizAttemptBase):
+    id: int
+    answers: Dict[int, str]
+    started_at: datetime
+    deadline: Optional[datetime] = None
+    submitted_at: Optional[datetime] = None
+    auto_submitted: bool
+    result_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+class QuizSheetScore(BaseModel):
+    student_id: int
+    score: float
+    max_score: float
+
+class QuizBatchGradeResult(BaseModel):
+    graded: int
+    results: List[QuizSheetScore]
+
+# Quiz item analysis schemas
+class QuestionAnalysis(BaseModel):
+    question_id: int
+    difficulty: float
+    discrimination: float
+    answered: int
+    omitted: int
+    answer_frequencies: Dict[str, int]
+
+class ScoreHistogram(BaseModel):
+    bin_edges: List[float]
+    counts: List[int]
+
+class QuizItemAnalysis(BaseModel):
+    quiz_id: int
+    results: int
+    max_score: float
+    mean_score: float
+    score_histogram: ScoreHistogram
+    questions: List[QuestionAnalysis]
+
+# Leaderboard schemas
+class LeaderboardEntry(BaseModel):
+    rank: int
+    student_id: int
+    score: float
+
+class LeaderboardPage(BaseModel):
+    size: int
+    entries: List[LeaderboardEntry]
+
+# Place an ordered item directly after another one, or first when after_id is None
+class OrderMove(BaseModel):
+    after_id: Optional[int] = None
+
 # User-friendly schemas for creating subjects with chapters
 class ChapterCreateWithoutSubject(BaseModel):
     title: str
@@ -0,0 +1,9 @@
+from datetime import datetime
+from typing import Any, Dict, List
+from pydantic import BaseModel
+
+# Delta sync schemas; rows are full table rows keyed by table name
+class SyncResponse(BaseModel):
+    watermark: datetime
+    changes: Dict[str, List[Dict[str, Any]]]
+    deleted: Dict[str, List[int]]
@@ -38,6 +38,32 @@ class UserResponse(UserInDBBase):
 class UserInDB(UserInDBBase):
     hashed_password: str
 
+# Cached authorization view of a user, resolved without touching the DB
+class Principal(BaseModel):
+    id: int
+    email: str
+    role: Optional[UserRole] = None
+    is_active: bool = True
+    is_superuser: bool = False
+    student_profile_id: Optional[int] = None
+    teacher_profile_id: Optional[int] = None
+    principal_profile_id: Optional[int] = None
+    developer_profile_id: Optional[int] = None
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+            student_profile_id=user.student_profile.id if user.student_profile else None,
+            teacher_profile_id=user.teacher_profile.id if user.teacher_profile else None,
+            principal_profile_id=user.principal_profile.id if user.principal_profile else None,
+            developer_profile_id=user.developer_profile.id if user.developer_profile else None,
+        )
+
 # Token
 class Token(BaseModel):
     access_token: str
@@ -0,0 +1,40 @@
+"""
+Inserting many subjects: one create() per row (add, commit, refresh each)
+against a single create_many() call (one multi-row INSERT ... RETURNING
+and one commit).
+
+    python -m benchmarks.bulk_create --rows 5000
+"""
+import argparse
+import time
+
+# First, so the app is configured for the benchmark database
+from benchmarks.common import SessionLocal, ms, reset_database
+
+from app import crud
+from app.schemas.content import SubjectCreate
+
+
+def main(rows: int) -> None:
+    subjects = [SubjectCreate(name=f"Subject {i}", grade_level="9") for i in range(rows)]
+    print(f"{rows} subjects")
+    for label, insert in (
+        ("create() per row", lambda db: [crud.subject.create(db, obj_in=subject) for subject in subjects]),
+        ("create_many()", lambda db: crud.subject.create_many(db, objs_in=subjects)),
+    ):
+        reset_database()
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            insert(db)
+            elapsed = time.perf_counter() - start
+        finally:
+            db.close()
+        print(f"{label:<20} {ms(elapsed)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+    main(args.rows)
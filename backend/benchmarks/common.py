@@ -0,0 +1,81 @@
+"""
+Shared setup for the benchmarks. Importing this module points the app at a
+fresh SQLite database in a temporary directory, so benchmarks import it
+before anything from app.
+
+Run a benchmark from backend/, e.g. python -m benchmarks.load_async_endpoints
+"""
+import atexit
+import math
+import os
+import shutil
+import tempfile
+import time
+from typing import Callable, Sequence
+
+# Subprocesses of a benchmark share its database through BENCH_DB_DIR
+if "BENCH_DB_DIR" not in os.environ:
+    os.environ["BENCH_DB_DIR"] = tempfile.mkdtemp(prefix="school-bench-")
+    atexit.register(shutil.rmtree, os.environ["BENCH_DB_DIR"], ignore_errors=True)
+DB_DIR = os.environ["BENCH_DB_DIR"]
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+
+from fastapi import FastAPI  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+import app.models  # noqa: E402,F401  (registers every table on Base.metadata)
+from app.core.security import create_access_token  # noqa: E402
+from app.db.base_class import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+
+
+def reset_database() -> None:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def api_app() -> FastAPI:
+    """
+    The application with its middleware and the v1 routes mounted.
+    """
+    from app.api.api_v1.api import api_router
+    from app.core.config import settings
+    from app.main import app
+
+    if not any(getattr(route, "path", "").startswith(settings.API_V1_STR) for route in app.routes):
+        app.include_router(api_router, prefix=settings.API_V1_STR)
+    return app
+
+
+def create_user(db: Session, *, email: str, role: UserRole = UserRole.TEACHER) -> User:
+    user = User(email=email, hashed_password="unused", role=role)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def auth_headers(user: User) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+
+def best_of(fn: Callable[[], object], *, repeat: int = 5) -> float:
+    """
+    Fastest of `repeat` runs of fn, in seconds.
+    """
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def ms(seconds: float) -> str:
+    return f"{seconds * 1000:10.3f} ms"
+
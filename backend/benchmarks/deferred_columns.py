@@ -0,0 +1,89 @@
+"""
+Memory and time to load one chapter's lessons and read their titles, with
+the large `body` columns deferred (the default) against undeferred. Each
+mode runs in a fresh subprocess, so its peak RSS growth is its own.
+
+    python -m benchmarks.deferred_columns --lessons 400 --content-kib 200
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+# First, so the app is configured for the benchmark database
+from benchmarks.common import SessionLocal, ms, reset_database
+
+from sqlalchemy import insert
+from sqlalchemy.orm import undefer_group
+
+from app.models.content import Chapter, Lesson, Subject
+
+
+def peak_rss_kib() -> int:
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def seed(lessons: int, content_kib: int) -> None:
+    reset_database()
+    db = SessionLocal()
+    try:
+        db.add(Subject(name="Subject", grade_level="9"))
+        db.add(Chapter(title="Chapter", subject_id=1, order=1))
+        db.flush()
+        content = "x" * content_kib * 1024
+        for start in range(0, lessons, 50):
+            db.execute(
+                insert(Lesson),
+                [
+                    {"title": f"Lesson {i}", "content": content, "order": i, "chapter_id": 1}
+                    for i in range(start, min(start + 50, lessons))
+                ],
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def measure(mode: str) -> None:
+    db = SessionLocal()
+    try:
+        # Connect first so the pool and SQLite caches aren't counted
+        db.query(Subject).first()
+        before = peak_rss_kib()
+        start = time.perf_counter()
+        query = db.query(Lesson).filter(Lesson.chapter_id == 1).order_by(Lesson.order)
+        if mode == "undeferred":
+            query = query.options(undefer_group("body"))
+        titles = [lesson.title for lesson in query.all()]
+        elapsed = time.perf_counter() - start
+        print(json.dumps({"lessons": len(titles), "seconds": elapsed, "rss_kib": peak_rss_kib() - before}))
+    finally:
+        db.close()
+
+
+def main(lessons: int, content_kib: int) -> None:
+    seed(lessons, content_kib)
+    print(f"{lessons} lessons of {content_kib} KiB")
+    for mode in ("undeferred", "deferred"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.deferred_columns", "--measure", mode],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output.splitlines()[-1])
+        print(f"{mode:<12} {ms(result['seconds'])}  peak RSS +{result['rss_kib'] / 1024:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--lessons", type=int, default=400)
+    parser.add_argument("--content-kib", type=int, default=200)
+    parser.add_argument("--measure", choices=["undeferred", "deferred"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        measure(args.measure)
+    else:
+        main(args.lessons, args.content_kib)
@@ -0,0 +1,124 @@
+"""
+Item analysis of one quiz with many stored results: a cold analysis
+(loading scores and answers as columns, then one NumPy pass) against one
+served from analytics_cache. The target is under a second cold for 100k
+results.
+
+    python -m benchmarks.item_analysis --results 100000 --questions 10
+"""
+import argparse
+
+# First, so the app is configured for the benchmark database
+from benchmarks.common import SessionLocal, best_of, ms, reset_database
+
+import numpy as np
+from sqlalchemy import func, insert, select
+
+from app import crud
+from app.core.cache import analytics_cache
+from app.models.content import Chapter, Quiz, QuizAnswer, QuizQuestion, QuizResult, Subject
+from app.models.user import User, UserRole
+
+OPTIONS = ["a", "b", "c", "d"]
+CHUNK = 50_000
+
+
+def seed(results: int, questions: int) -> None:
+    """
+    `results` graded sheets of one quiz whose correct answer is always "a".
+    Stronger students answer correctly more often, and about 5% of the
+    answers are omitted.
+    """
+    reset_database()
+    rng = np.random.default_rng(0)
+    ability = rng.random(results)
+    answered = rng.random((results, questions)) >= 0.05
+    correct = answered & (rng.random((results, questions)) < 0.3 + 0.6 * ability[:, None])
+    wrong = rng.integers(1, len(OPTIONS), size=(results, questions))
+    db = SessionLocal()
+    try:
+        db.add(User(email="student@example.com", hashed_password="unused", role=UserRole.STUDENT))
+        db.add(Subject(name="Subject", grade_level="9"))
+        db.add(Chapter(title="Chapter", subject_id=1, order=1))
+        db.add(Quiz(title="Quiz", chapter_id=1, created_by=1))
+        db.flush()
+        db.execute(
+            insert(QuizQuestion),
+            [
+                {
+                    "quiz_id": 1,
+                    "question_text": f"Question {i}",
+                    "correct_answer": "a",
+                    "options": OPTIONS,
+                    "points": 1,
+                    "order": i,
+                }
+                for i in range(questions)
+            ],
+        )
+        scores = correct.sum(axis=1)
+        for start in range(0, results, CHUNK):
+            db.execute(
+                insert(QuizResult),
+                [
+                    {"quiz_id": 1, "student_id": 1, "score": float(scores[row]), "max_score": float(questions)}
+                    for row in range(start, min(start + CHUNK, results))
+                ],
+            )
+            rows, columns = np.nonzero(answered[start:start + CHUNK])
+            db.execute(
+                insert(QuizAnswer),
+                [
+                    {
+                        "result_id": start + row + 1,
+                        "question_id": column + 1,
+                        "answer": "a" if correct[start + row, column] else OPTIONS[wrong[start + row, column]],
+                        "is_correct": bool(correct[start + row, column]),
+                    }
+                    for row, column in zip(rows.tolist(), columns.tolist())
+                ],
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def main(results: int, questions: int) -> None:
+    print(f"seeding {results} results with {questions} questions each")
+    seed(results, questions)
+    db = SessionLocal()
+    try:
+        def cold() -> dict:
+            analytics_cache.invalidate(1)
+            analysis = crud.quiz_result.get_item_analysis(db, quiz_id=1)
+            db.expunge_all()
+            return analysis
+
+        def cached() -> dict:
+            return crud.quiz_result.get_item_analysis(db, quiz_id=1)
+
+        analysis = cold()
+        # Difficulty matches a plain SQL count of correct answers per question
+        correct_counts = dict(
+            db.execute(
+                select(QuizAnswer.question_id, func.count(QuizAnswer.id).filter(QuizAnswer.is_correct))
+                .group_by(QuizAnswer.question_id)
+            ).all()
+        )
+        for question in analysis["questions"]:
+            expected = correct_counts[question["question_id"]] / results
+            assert abs(question["difficulty"] - expected) < 1e-9, question
+        answers = db.scalar(select(func.count(QuizAnswer.id)))
+        print(f"{analysis['results']} results, {answers} stored answers")
+        for label, analyse in (("cold", cold), ("cached", cached)):
+            print(f"{label:<8} {ms(best_of(analyse, repeat=5))}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--results", type=int, default=100_000)
+    parser.add_argument("--questions", type=int, default=10)
+    args = parser.parse_args()
+    main(args.results, args.questions)
@@ -0,0 +1,92 @@
+"""
+Latency of list endpoints under many concurrent clients: the async ones
+(subjects, chapters) on the event loop against the sync ones (lessons,
+resources) on the threadpool. Every client sends its requests one after
+another; p50/p99 are over all requests of an endpoint.
+
+    python -m benchmarks.load_async_endpoints --clients 500 --requests 4
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+# First, so the app is configured for the benchmark database
+from benchmarks.common import SessionLocal, api_app, ms, percentile, reset_database
+
+import httpx
+from sqlalchemy import insert
+
+from app.models.content import Chapter, Lesson, Resource, ResourceType, Subject
+
+ENDPOINTS = [
+    ("async", "/api/v1/subjects/?limit=50"),
+    ("async", "/api/v1/chapters/?limit=50"),
+    ("sync", "/api/v1/lessons/?limit=50"),
+    ("sync", "/api/v1/resources/?limit=50"),
+]
+
+
+def seed(rows: int) -> None:
+    reset_database()
+    db = SessionLocal()
+    try:
+        db.execute(insert(Subject), [{"name": f"Subject {i}", "grade_level": "9"} for i in range(rows)])
+        db.execute(
+            insert(Chapter), [{"title": f"Chapter {i}", "subject_id": 1, "order": i} for i in range(rows)]
+        )
+        db.execute(
+            insert(Lesson),
+            [{"title": f"Lesson {i}", "content": "text " * 200, "order": i, "chapter_id": 1} for i in range(rows)],
+        )
+        db.execute(
+            insert(Resource),
+            [
+                {"title": f"Resource {i}", "chapter_id": 1 + i % rows, "resource_type": ResourceType.TEXT}
+                for i in range(rows)
+            ],
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run_clients(client: httpx.AsyncClient, path: str, clients: int, requests: int) -> List[float]:
+    latencies: List[float] = []
+
+    async def one_client() -> None:
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    await asyncio.gather(*(one_client() for _ in range(clients)))
+    return latencies
+
+
+async def main(clients: int, requests: int) -> None:
+    transport = httpx.ASGITransport(app=api_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _, path in ENDPOINTS:
+            # Warm up caches and pool connections
+            await run_clients(client, path, 10, 1)
+        print(f"{clients} clients x {requests} requests")
+        for kind, path in ENDPOINTS:
+            start = time.perf_counter()
+            latencies = await run_clients(client, path, clients, requests)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{kind:<6} {path:<32} p50 {ms(percentile(latencies, 50))}  "
+                f"p99 {ms(percentile(latencies, 99))}  {len(latencies) / elapsed:8.0f} req/s"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=100)
+    args = parser.parse_args()
+    seed(args.rows)
+    asyncio.run(main(args.clients, args.requests))
@@ -0,0 +1,69 @@
+"""
+Cost of reading a deep page through CRUDBase.get_multi: OFFSET/LIMIT
+against keyset pagination on the primary key (after_id).
+
+    python -m benchmarks.pagination --rows 200000 --page 1000 --limit 100
+"""
+import argparse
+
+# First, so the app is configured for the benchmark database
+from benchmarks.common import SessionLocal, best_of, ms, reset_database
+
+from sqlalchemy import insert
+
+from app import crud
+from app.models.content import Chapter, Lesson, Subject
+
+
+def seed(rows: int) -> None:
+    reset_database()
+    db = SessionLocal()
+    try:
+        db.add(Subject(name="Subject", grade_level="9"))
+        db.add(Chapter(title="Chapter", subject_id=1, order=1))
+        db.flush()
+        for start in range(0, rows, 10_000):
+            db.execute(
+                insert(Lesson),
+                [
+                    {"title": f"Lesson {i}", "content": "text", "order": i, "chapter_id": 1}
+                    for i in range(start, min(start + 10_000, rows))
+                ],
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def main(rows: int, page: int, limit: int) -> None:
+    seed(rows)
+    db = SessionLocal()
+    try:
+        skip = (page - 1) * limit
+        # Ids are dense, so the cursor of the previous page is its last id
+        after_id = skip
+        offset_rows = crud.lesson.get_multi(db, skip=skip, limit=limit)
+        keyset_rows = crud.lesson.get_multi(db, after_id=after_id, limit=limit)
+        assert [row.id for row in offset_rows] == [row.id for row in keyset_rows]
+        print(f"{rows} rows, page {page} of {limit}")
+        for label, kwargs in (
+            ("offset, page 1", {"skip": 0}),
+            ("keyset, page 1", {"after_id": 0}),
+            (f"offset, page {page}", {"skip": skip}),
+            (f"keyset, page {page}", {"after_id": after_id}),
+        ):
+            def read() -> None:
+                crud.lesson.get_multi(db, limit=limit, **kwargs)
+                db.expunge_all()
+            print(f"{label:<20} {ms(best_of(read))}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+    main(args.rows, args.page, args.limit)
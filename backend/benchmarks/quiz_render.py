@@ -0,0 +1,95 @@
+"""
+Rendering a quiz's questions for students: validating and encoding the
+questions on every request, against building a QuizPaper once (cold) and
+serving its cached payload (warm).
+
+    python -m benchmarks.quiz_render --questions 200 --options 5
+"""
+import argparse
+import json
+
+# First, so the app is configured for the benchmark database
+from benchmarks.common import SessionLocal, best_of, ms, reset_database
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert
+from sqlalchemy.orm import undefer_group
+
+from app import crud
+from app.core.cache import content_cache
+from app.models.content import Chapter, Quiz, QuizQuestion, Subject
+from app.models.user import User, UserRole
+from app.schemas.content import QuizQuestionPublic
+
+
+def seed(questions: int, options: int) -> None:
+    reset_database()
+    db = SessionLocal()
+    try:
+        db.add(User(email="teacher@example.com", hashed_password="unused", role=UserRole.TEACHER))
+        db.add(Subject(name="Subject", grade_level="9"))
+        db.add(Chapter(title="Chapter", subject_id=1, order=1))
+        db.add(Quiz(title="Quiz", chapter_id=1, created_by=1))
+        db.flush()
+        db.execute(
+            insert(QuizQuestion),
+            [
+                {
+                    "quiz_id": 1,
+                    "question_text": f"Question {i}: which option is right?",
+                    "correct_answer": "Option 0",
+                    "options": [f"Option {j}" for j in range(options)],
+                    "points": 1,
+                    "order": i,
+                }
+                for i in range(questions)
+            ],
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def main(questions: int, options: int) -> None:
+    seed(questions, options)
+    db = SessionLocal()
+    try:
+        def per_request() -> bytes:
+            rows = (
+                db.query(QuizQuestion)
+                .options(undefer_group("body"))
+                .filter(QuizQuestion.quiz_id == 1)
+                .order_by(QuizQuestion.order)
+                .all()
+            )
+            rendered = [QuizQuestionPublic.model_validate(row, from_attributes=True) for row in rows]
+            db.expunge_all()
+            return json.dumps(jsonable_encoder(rendered)).encode()
+
+        def cold_paper() -> bytes:
+            content_cache.bump()
+            payload = crud.quiz_question.get_paper(db, quiz_id=1).payload
+            db.expunge_all()
+            return payload
+
+        def cached_paper() -> bytes:
+            return crud.quiz_question.get_paper(db, quiz_id=1).payload
+
+        assert json.loads(per_request()) == json.loads(cold_paper())
+        print(f"{questions} questions with {options} options, {len(cached_paper()) / 1024:.0f} KiB")
+        for label, render in (
+            ("per request", per_request),
+            ("paper, cold", cold_paper),
+            ("paper, cached", cached_paper),
+        ):
+            print(f"{label:<16} {ms(best_of(render, repeat=20))}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--options", type=int, default=5)
+    args = parser.parse_args()
+    main(args.questions, args.options)
@@ -0,0 +1,65 @@
+"""
+Loading and serializing a list of chapters: ORM objects validated into
+the response schema and encoded the way FastAPI does for a response_model
+(jsonable_encoder, then json.dumps), against selecting just the schema's
+columns and dumping the rows with orjson (schema_columns + dump_rows).
+
+The row path leaves out the nested `resources`, which are empty here.
+
+    python -m benchmarks.serialization --rows 10000
+"""
+import argparse
+import json
+
+# First, so the app is configured for the benchmark database
+from benchmarks.common import SessionLocal, best_of, ms, reset_database
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+
+from app.core.serialization import dump_rows, schema_columns
+from app.models.content import Chapter, Subject
+from app.schemas.content import Chapter as ChapterResponse
+
+FLAT_FIELDS = [name for name in ChapterResponse.model_fields if name != "resources"]
+
+
+def main(rows: int) -> None:
+    reset_database()
+    db = SessionLocal()
+    try:
+        db.add(Subject(name="Subject", grade_level="9"))
+        db.flush()
+        db.execute(
+            insert(Chapter),
+            [
+                {"title": f"Chapter {i}", "description": "About chapter", "subject_id": 1, "order": i}
+                for i in range(rows)
+            ],
+        )
+        db.commit()
+
+        def through_pydantic() -> bytes:
+            chapters = db.scalars(select(Chapter).options(selectinload(Chapter.resources))).all()
+            payload = [ChapterResponse.model_validate(chapter) for chapter in chapters]
+            body = json.dumps(jsonable_encoder(payload)).encode()
+            db.expunge_all()
+            return body
+
+        def through_rows() -> bytes:
+            return dump_rows(db.execute(select(*schema_columns(Chapter, ChapterResponse, FLAT_FIELDS))))
+
+        print(f"{rows} chapters")
+        for label, serialize in (("ORM + pydantic + json", through_pydantic), ("rows + orjson", through_rows)):
+            size = len(serialize())
+            print(f"{label:<24} {ms(best_of(serialize))}  {size / 1024:8.0f} KiB")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+    main(args.rows)
@@ -0,0 +1,66 @@
+"""
+Updating the title of a lesson with a large body: CRUDBase.update, which
+writes only changed columns and skips unchanged updates, against the
+previous whole-row update (jsonable_encoder over the row, then commit and
+refresh every time).
+
+    python -m benchmarks.update_diff --content-kib 1024
+"""
+import argparse
+from typing import Any, Dict
+
+# First, so the app is configured for the benchmark database
+from benchmarks.common import SessionLocal, best_of, engine, ms, reset_database
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.orm import Session, undefer_group
+
+from app import crud
+from app.models.content import Chapter, Lesson, Subject
+
+
+def whole_row_update(db: Session, *, db_obj: Any, obj_in: Dict[str, Any]) -> Any:
+    # CRUDBase.update before it compared columns
+    obj_data = jsonable_encoder(db_obj)
+    for field in obj_data:
+        if field in obj_in:
+            setattr(db_obj, field, obj_in[field])
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+
+def main(content_kib: int) -> None:
+    reset_database()
+    db = SessionLocal()
+    db.add(Subject(name="Subject", grade_level="9"))
+    db.add(Chapter(title="Chapter", subject_id=1, order=1))
+    db.add(Lesson(title="Lesson", content="x" * content_kib * 1024, order=1, chapter_id=1))
+    db.commit()
+    lesson = db.query(Lesson).options(undefer_group("body")).filter(Lesson.id == 1).one()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    print(f"lesson with {content_kib} KiB of content")
+    titles = iter(f"Lesson {i}" for i in range(1_000_000))
+    for label, update, changes in (
+        ("whole row, unchanged", whole_row_update, lambda: {"title": lesson.title}),
+        ("diff, unchanged", crud.lesson.update, lambda: {"title": lesson.title}),
+        ("whole row, new title", whole_row_update, lambda: {"title": next(titles)}),
+        ("diff, new title", crud.lesson.update, lambda: {"title": next(titles)}),
+    ):
+        statements.clear()
+        update(db, db_obj=lesson, obj_in=changes())
+        count = len(statements)
+        elapsed = best_of(lambda: update(db, db_obj=lesson, obj_in=changes()), repeat=20)
+        print(f"{label:<24} {ms(elapsed)}  {count} statements")
+    db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--content-kib", type=int, default=1024)
+    args = parser.parse_args()
+    main(args.content_kib)
@@ -0,0 +1,155 @@
+import asyncio
+import os
+
+# Settings are read at import time; point them at an in-memory database first
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from typing import Any, Iterator, List
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.cache import content_cache, principal_cache
+from app.db.base_class import Base
+
+
+def _enable_foreign_keys(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches() -> None:
+    # Cached content from an earlier test's database would hide queries
+    content_cache.bump()
+    principal_cache.clear()
+
+
+@pytest.fixture
+def database_path(tmp_path) -> str:
+    return str(tmp_path / "test.db")
+
+
+@pytest.fixture
+def engine(database_path: str) -> Iterator[Engine]:
+    engine = create_engine(f"sqlite:///{database_path}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", _enable_foreign_keys)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def async_engine(engine: Engine, database_path: str) -> Iterator[AsyncEngine]:
+    """
+    An aiosqlite engine on the same database as `engine`, for async endpoints.
+    """
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+    event.listen(async_engine.sync_engine, "connect", _enable_foreign_keys)
+    yield async_engine
+    asyncio.run(async_engine.dispose())
+
+
+@pytest.fixture
+def run_async(async_engine: AsyncEngine):
+    """
+    Run `fn(async_db)` to completion with a fresh AsyncSession.
+    """
+    sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def run(fn):
+        async def main():
+            async with sessions() as async_db:
+                return await fn(async_db)
+        return asyncio.run(main())
+    return run
+
+
+@pytest.fixture
+def db(engine: Engine) -> Iterator[Session]:
+    session = sessionmaker(bind=engine, autocommit=False, autoflush=False)()
+    yield session
+    session.close()
+
+
+class StatementCounter:
+    """
+    Records every statement, and its parameters, sent to the database while
+    active.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.statements: List[str] = []
+        self.parameters: List[Any] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+        self.parameters.append(parameters)
+
+    def __enter__(self) -> "StatementCounter":
+        self.statements.clear()
+        self.parameters.clear()
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture
+def count_statements(engine: Engine):
+    """
+    Counter factory for `engine`, or for another engine passed in.
+    """
+    return lambda other=None: StatementCounter(other or engine)
+
+
+@pytest.fixture
+def client(engine: Engine, database_path: str) -> Iterator[Any]:
+    """
+    A TestClient for the API on the test database. Startup events (the write
+    buffer and attempt timer threads) don't run.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.api import deps
+    from app.api.api_v1.api import api_router
+    from app.core.config import settings
+    from app.main import app
+
+    if not any(getattr(route, "path", "").startswith(settings.API_V1_STR) for route in app.routes):
+        app.include_router(api_router, prefix=settings.API_V1_STR)
+
+    sessions = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    # Every request runs on a new event loop, so async connections can't be pooled
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool)
+    event.listen(async_engine.sync_engine, "connect", _enable_foreign_keys)
+    async_sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def get_db():
+        db = sessions()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with async_sessions() as db:
+            yield db
+
+    app.dependency_overrides[deps.get_db] = get_db
+    app.dependency_overrides[deps.get_async_db] = get_async_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    asyncio.run(async_engine.dispose())
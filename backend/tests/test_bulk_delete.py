@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy import func, insert, select
+
+from app import crud
+from app.crud.base import DeleteBlocked
+from app.models.academic import StudentProgress, Tombstone
+from app.models.content import Chapter, Lesson, Quiz, Subject
+from app.models.enums import ProgressStatus
+from app.models.user import User, UserRole
+
+from tests.utils import create_student
+
+
+def _seed_subject(db, *, chapters: int, lessons: int) -> int:
+    subject = Subject(name="Physics", grade_level="10")
+    db.add(subject)
+    db.flush()
+    db.execute(
+        insert(Chapter),
+        [{"title": f"Chapter {i}", "subject_id": subject.id, "order": i} for i in range(chapters)],
+    )
+    chapter_ids = db.execute(
+        select(Chapter.id).where(Chapter.subject_id == subject.id)
+    ).scalars().all()
+    db.execute(
+        insert(Lesson),
+        [
+            {"title": f"Lesson {i}", "content": "text", "order": i, "chapter_id": chapter_ids[i % chapters]}
+            for i in range(lessons)
+        ],
+    )
+    db.commit()
+    return subject.id
+
+
+def _delete_statements(db, count_statements, lessons: int) -> int:
+    subject_id = _seed_subject(db, chapters=10, lessons=lessons)
+    with count_statements() as counter:
+        assert crud.subject.remove_many(db, ids=[subject_id]) == 1
+    assert db.scalar(select(func.count(Lesson.id))) == 0
+    assert db.scalar(select(func.count(Chapter.id))) == 0
+    return counter.count
+
+
+def test_subject_delete_statements_do_not_grow_with_lessons(db, count_statements):
+    statements = _delete_statements(db, count_statements, lessons=10_000)
+    # One check per restricting foreign key (student progress among them), one
+    # lookup per cascaded table, the tombstones, the DELETE and the version bump
+    assert statements <= 11
+    assert statements == _delete_statements(db, count_statements, lessons=10)
+
+
+def test_subject_delete_leaves_tombstones_for_cascaded_rows(db):
+    subject_id = _seed_subject(db, chapters=2, lessons=4)
+    crud.subject.remove_many(db, ids=[subject_id])
+    tables = db.execute(select(Tombstone.table_name, func.count()).group_by(Tombstone.table_name)).all()
+    assert dict(tables) == {"subjects": 1, "chapters": 2, "lessons": 4}
+
+
+def test_delete_blocked_by_quiz_names_blocking_rows(db):
+    subject_id = _seed_subject(db, chapters=1, lessons=1)
+    teacher = User(email="t@example.com", hashed_password="x", role=UserRole.TEACHER)
+    db.add(teacher)
+    db.flush()
+    chapter_id = db.scalar(select(Chapter.id).where(Chapter.subject_id == subject_id))
+    quiz = Quiz(title="Quiz", chapter_id=chapter_id, created_by=teacher.id)
+    db.add(quiz)
+    db.commit()
+
+    with pytest.raises(DeleteBlocked) as blocked:
+        crud.subject.remove_many(db, ids=[subject_id])
+    assert blocked.value.blockers == {"quizzes": [quiz.id]}
+    assert f"quizzes {quiz.id}" in str(blocked.value)
+
+    db.rollback()
+    assert db.get(Subject, subject_id) is not None
+    with pytest.raises(DeleteBlocked):
+        crud.subject.remove(db, id=subject_id)
+
+
+def test_delete_blocked_by_student_progress(db):
+    subject_id = _seed_subject(db, chapters=1, lessons=1)
+    student_id = create_student(db, "s@example.com")
+    chapter_id = db.scalar(select(Chapter.id).where(Chapter.subject_id == subject_id))
+    progress = StudentProgress(
+        student_id=student_id, chapter_id=chapter_id, status=ProgressStatus.IN_PROGRESS
+    )
+    db.add(progress)
+    db.commit()
+
+    with pytest.raises(DeleteBlocked) as blocked:
+        crud.chapter.remove_many(db, ids=[chapter_id])
+    assert blocked.value.blockers == {"student_progress": [progress.id]}
+    db.rollback()
+    assert db.get(StudentProgress, progress.id) is not None
@@ -0,0 +1,73 @@
+from sqlalchemy import insert
+
+from app.api.api_v1.endpoints.content_structure import (
+    get_subject_full_structure,
+    get_subjects_with_chapters,
+)
+from app.core.cache import content_cache
+from app.models.content import Chapter, Lesson, Resource, ResourceType, Subject
+
+
+def _add_subjects(db, count: int, chapters: int = 3) -> None:
+    for i in range(count):
+        subject = Subject(name=f"Subject {i}", grade_level="9")
+        db.add(subject)
+        db.flush()
+        db.execute(
+            insert(Chapter),
+            [{"title": f"Chapter {j}", "subject_id": subject.id, "order": j} for j in range(chapters)],
+        )
+    db.commit()
+
+
+def test_subjects_with_chapters_query_count_does_not_grow_with_subjects(
+    db, async_engine, run_async, count_statements
+):
+    counts, total = [], 0
+    for added in (2, 48):
+        _add_subjects(db, added)
+        total += added
+        content_cache.bump()
+        with count_statements(async_engine.sync_engine) as counter:
+            tree = run_async(lambda async_db: get_subjects_with_chapters(db=async_db))
+        counts.append(counter.count)
+        assert len(tree) == total
+        assert all(len(subject["chapters"]) == 3 for subject in tree)
+
+    assert counts[0] == counts[1] == 2
+
+
+def test_full_structure_of_a_seeded_subject(db, async_engine, run_async, count_statements):
+    subject = Subject(name="Biology", grade_level="7")
+    db.add(subject)
+    db.flush()
+    cells = Chapter(title="Cells", subject_id=subject.id, order=2)
+    plants = Chapter(title="Plants", subject_id=subject.id, order=1)
+    db.add_all([cells, plants])
+    db.flush()
+    db.add_all([
+        Lesson(title="Photosynthesis", content="...", order=1, chapter_id=plants.id),
+        Lesson(title="Membranes", content="...", order=2, chapter_id=cells.id),
+        Lesson(title="Nucleus", content="...", order=1, chapter_id=cells.id),
+        Resource(
+            title="Diagram", description="Labelled cell", chapter_id=cells.id,
+            resource_type=ResourceType.PDF,
+        ),
+    ])
+    db.commit()
+
+    with count_statements(async_engine.sync_engine) as counter:
+        structure = run_async(
+            lambda async_db: get_subject_full_structure(subject_id=subject.id, db=async_db)
+        )
+
+    assert counter.count == 4
+    assert structure["name"] == "Biology"
+    assert [chapter["title"] for chapter in structure["chapters"]] == ["Plants", "Cells"]
+    plants_info, cells_info = structure["chapters"]
+    assert [lesson["title"] for lesson in plants_info["lessons"]] == ["Photosynthesis"]
+    assert [lesson["title"] for lesson in cells_info["lessons"]] == ["Nucleus", "Membranes"]
+    assert cells_info["resources"] == [{
+        "id": 1, "title": "Diagram", "description": "Labelled cell", "resource_type": ResourceType.PDF,
+    }]
+    assert plants_info["resources"] == []
@@ -0,0 +1,69 @@
+from app.models.content import Chapter, Resource, Subject
+from app.models.enums import ResourceType
+
+
+def _seed(db):
+    subject = Subject(name="Physics", grade_level="10")
+    db.add(subject)
+    db.flush()
+    chapter = Chapter(title="Motion", subject_id=subject.id, order=1)
+    db.add(chapter)
+    db.commit()
+    return chapter
+
+
+def _add_resource(db, chapter, title):
+    resource = Resource(title=title, resource_type=ResourceType.TEXT, content="...", chapter_id=chapter.id)
+    db.add(resource)
+    db.commit()
+    return resource
+
+
+def test_unchanged_list_answers_304(client, db):
+    _seed(db)
+
+    first = client.get("/api/v1/chapters/")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    again = client.get("/api/v1/chapters/", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert again.content == b""
+
+
+def test_new_nested_resource_changes_chapter_list_etag(client, db):
+    chapter = _seed(db)
+    etag = client.get("/api/v1/chapters/").headers["etag"]
+
+    _add_resource(db, chapter, "Velocity")
+
+    response = client.get("/api/v1/chapters/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert [r["title"] for r in response.json()[0]["resources"]] == ["Velocity"]
+
+
+def test_delete_paired_with_insert_changes_etag(client, db):
+    chapter = _seed(db)
+    old = _add_resource(db, chapter, "Velocity")
+    etag = client.get("/api/v1/chapters/").headers["etag"]
+
+    # Same row count afterwards, and a row count + max(updated_at) pair could match
+    db.delete(old)
+    _add_resource(db, chapter, "Acceleration")
+
+    response = client.get("/api/v1/chapters/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert [r["title"] for r in response.json()[0]["resources"]] == ["Acceleration"]
+
+
+def test_rolled_back_write_keeps_etag(client, db):
+    chapter = _seed(db)
+    etag = client.get("/api/v1/chapters/").headers["etag"]
+
+    chapter.title = "Kinematics"
+    db.flush()
+    db.rollback()
+
+    assert client.get("/api/v1/chapters/", headers={"If-None-Match": etag}).status_code == 304
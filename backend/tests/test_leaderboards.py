@@ -0,0 +1,32 @@
+from app.crud.crud_leaderboard import LeaderboardRegistry
+from tests.utils import create_quiz, create_student
+
+
+def test_class_board_picks_up_students_who_joined_after_loading(db):
+    quiz_id = create_quiz(db)
+    first = create_student(db, "a@example.com")
+    registry = LeaderboardRegistry()
+    board = registry.class_(db, grade="9", section="A")
+    assert len(board) == 1
+
+    joined = create_student(db, "b@example.com")
+    elsewhere = create_student(db, "c@example.com", section="B")
+    registry.record(db, quiz_id=quiz_id, scores=[(joined, 8.0), (elsewhere, 9.0), (first, 5.0)])
+
+    assert [member for _, member, _ in board.top(10)] == [joined, first]
+
+
+def test_results_recorded_while_loading_are_replayed(db):
+    quiz_id = create_quiz(db)
+    student = create_student(db, "a@example.com")
+    registry = LeaderboardRegistry()
+    best_scores = registry._best_scores
+
+    def racing_best_scores(*args):
+        # A result stored after the aggregate query ran, before the board is installed
+        bests = best_scores(*args)
+        registry.record(db, quiz_id=quiz_id, scores=[(student, 7.0)])
+        return bests
+
+    registry._best_scores = racing_best_scores
+    assert registry.quiz(db, quiz_id=quiz_id).get(student) == 7.0
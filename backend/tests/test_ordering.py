@@ -0,0 +1,78 @@
+from sqlalchemy import select
+
+from app import crud
+from app.crud.ordering import ORDER_GAP, gapped_orders
+from app.models.content import Chapter, Subject
+from app.schemas.content import ChapterCreate
+
+
+def test_gapped_orders_keep_requested_sequence():
+    assert gapped_orders([3, 1, 2]) == [3 * ORDER_GAP, ORDER_GAP, 2 * ORDER_GAP]
+    assert gapped_orders([1, 1], after=5) == [5 + ORDER_GAP, 5 + 2 * ORDER_GAP]
+
+
+def _titles(db, subject_id):
+    return db.execute(
+        select(Chapter.title).where(Chapter.subject_id == subject_id).order_by(Chapter.order)
+    ).scalars().all()
+
+
+def test_created_chapters_are_placed_at_requested_positions(db):
+    subject = Subject(name="History", grade_level="8")
+    db.add(subject)
+    db.commit()
+
+    first = crud.chapter.create(db, obj_in=ChapterCreate(title="Last", subject_id=subject.id, order=7))
+    assert first.order == ORDER_GAP
+    crud.chapter.create_many(
+        db,
+        objs_in=[
+            ChapterCreate(title="Second", subject_id=subject.id, order=2),
+            ChapterCreate(title="First", subject_id=subject.id, order=1),
+        ],
+    )
+    crud.chapter.create(db, obj_in=ChapterCreate(title="Third", subject_id=subject.id, order=3))
+
+    assert _titles(db, subject.id) == ["First", "Second", "Third", "Last"]
+    # Placed between neighbours, so the existing row kept its order
+    db.refresh(first)
+    assert first.order == ORDER_GAP
+
+
+def test_create_renumbers_scope_when_no_gap_is_left(db):
+    subject = Subject(name="Art", grade_level="8")
+    db.add(subject)
+    db.flush()
+    db.add_all([
+        Chapter(title="A", subject_id=subject.id, order=1),
+        Chapter(title="C", subject_id=subject.id, order=2),
+    ])
+    db.commit()
+
+    crud.chapter.create(db, obj_in=ChapterCreate(title="B", subject_id=subject.id, order=2))
+
+    assert _titles(db, subject.id) == ["A", "B", "C"]
+    orders = db.execute(
+        select(Chapter.order).where(Chapter.subject_id == subject.id).order_by(Chapter.order)
+    ).scalars().all()
+    assert orders == [ORDER_GAP, 2 * ORDER_GAP, 3 * ORDER_GAP]
+
+
+def test_reorder_maps_positions_into_gapped_orders(db):
+    subject = Subject(name="Biology", grade_level="8")
+    db.add(subject)
+    db.commit()
+    ids = [
+        crud.chapter.create(db, obj_in=ChapterCreate(title=title, subject_id=subject.id, order=99)).id
+        for title in ["A", "B", "C", "D"]
+    ]
+
+    chapters = crud.chapter.reorder_chapters(db, subject_id=subject.id, chapter_orders={ids[3]: 1, ids[0]: 3})
+
+    assert [chapter.title for chapter in chapters] == ["D", "B", "A", "C"]
+    assert [chapter.order for chapter in chapters] == [ORDER_GAP * rank for rank in range(1, 5)]
+
+    # A move into the first gap doesn't need a rebalance
+    moved = crud.chapter.move_after(db, db_obj=chapters[2], after_id=None)
+    assert moved.order == ORDER_GAP // 2
+    assert _titles(db, subject.id) == ["A", "D", "B", "C"]
@@ -0,0 +1,60 @@
+from app import crud
+from app.core.cache import principal_cache
+from app.models.user import TeacherProfile, User, UserRole
+from app.schemas.user import UserUpdate
+
+from tests.utils import auth_headers
+
+
+def _teacher(db):
+    teacher = User(email="teacher@example.com", hashed_password="x", role=UserRole.TEACHER, is_active=True)
+    db.add(teacher)
+    db.commit()
+    return teacher
+
+
+def test_profile_writes_invalidate_the_cached_principal(client, db):
+    teacher = _teacher(db)
+    assert client.get("/api/v1/users/me", headers=auth_headers(teacher.id)).status_code == 200
+    assert principal_cache.get(teacher.id).teacher_profile_id is None
+
+    profile = TeacherProfile(user_id=teacher.id, department="Science")
+    db.add(profile)
+    db.commit()
+    assert principal_cache.get(teacher.id) is None
+
+    client.get("/api/v1/users/me", headers=auth_headers(teacher.id))
+    assert principal_cache.get(teacher.id).teacher_profile_id == profile.id
+
+    profile.department = "Maths"
+    db.commit()
+    assert principal_cache.get(teacher.id) is None
+
+    client.get("/api/v1/users/me", headers=auth_headers(teacher.id))
+    db.delete(profile)
+    db.commit()
+    assert principal_cache.get(teacher.id) is None
+
+
+def test_user_updates_invalidate_only_once_committed(client, db):
+    teacher = _teacher(db)
+    client.get("/api/v1/users/me", headers=auth_headers(teacher.id))
+
+    teacher.is_active = False
+    db.flush()
+    assert principal_cache.get(teacher.id) is not None
+    db.commit()
+
+    response = client.get("/api/v1/users/me", headers=auth_headers(teacher.id))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
+
+
+def test_update_fields_takes_only_set_fields(db):
+    teacher = _teacher(db)
+    teacher.full_name = "Ada"
+    db.commit()
+
+    changed = crud.user.update_fields(db, db_obj=teacher, obj_in=UserUpdate(is_active=False))
+    assert changed == {"is_active"}
+    assert teacher.full_name == "Ada"
@@ -0,0 +1,33 @@
+import pytest
+
+from app import crud
+from app.models.enums import ResourceType
+
+# Each CRUD lookup and the index it must search
+ACCESS_PATHS = [
+    (
+        lambda db: crud.student_progress.get_student_chapter_progress(db, student_id=1, chapter_id=1),
+        "sqlite_autoindex_student_progress_1",
+    ),
+    (lambda db: crud.chapter.get_by_subject(db, subject_id=1), "ix_chapters_subject_id_order"),
+    (
+        lambda db: crud.resource.get_by_chapter_and_type(db, chapter_id=1, resource_type=ResourceType.PDF),
+        "ix_resources_chapter_id_resource_type",
+    ),
+    (lambda db: crud.resource.get_by_chapter(db, chapter_id=1), "ix_resources_chapter_id_resource_type"),
+    (lambda db: crud.task.get_by_teacher(db, teacher_id=1), "ix_tasks_assigned_to"),
+    (lambda db: crud.task.get_by_principal(db, principal_id=1), "ix_tasks_created_by"),
+]
+
+
+@pytest.mark.parametrize("lookup, index", ACCESS_PATHS)
+def test_crud_lookup_searches_its_index(db, engine, count_statements, lookup, index):
+    with count_statements() as counter:
+        lookup(db)
+    assert len(counter.statements) == 1
+    with engine.connect() as conn:
+        plan = conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {counter.statements[0]}", counter.parameters[0]
+        ).all()
+    details = " | ".join(row[-1] for row in plan)
+    assert f"USING INDEX {index}" in details or f"USING COVERING INDEX {index}" in details, details
@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from app import crud
+from app.models.content import Quiz, QuizAttempt
+from tests.utils import create_quiz, create_student
+
+
+def test_concurrent_start_resumes_the_open_attempt(db, monkeypatch):
+    quiz = db.get(Quiz, create_quiz(db))
+    student_id = create_student(db, "a@example.com")
+    first = crud.quiz_attempt.start(db, quiz=quiz, student_id=student_id)
+
+    # A second request that checked for an open attempt before the first one committed
+    get_open = crud.quiz_attempt.get_open
+    calls = []
+
+    def racing_get_open(*args, **kwargs):
+        calls.append(1)
+        return None if len(calls) == 1 else get_open(*args, **kwargs)
+
+    monkeypatch.setattr(crud.quiz_attempt, "get_open", racing_get_open)
+    second = crud.quiz_attempt.start(db, quiz=quiz, student_id=student_id)
+
+    assert second.id == first.id
+    assert db.scalar(select(func.count(QuizAttempt.id))) == 1
+
+
+def test_only_one_open_attempt_per_student_andcreate_quiz(db):
+    quiz_id = create_quiz(db)
+    student_id = create_student(db, "a@example.com")
+    for _ in range(2):
+        db.add(QuizAttempt(quiz_id=quiz_id, student_id=student_id, answers={}))
+    with pytest.raises(IntegrityError):
+        db.commit()
@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta
+
+from app import crud
+from app.core.config import settings
+from app.crud.crud_academic import class_assignment
+from app.models.academic import Assignment, Class, ClassAssignment, Task
+from app.models.content import Chapter, Lesson, Subject
+from app.models.enums import TaskStatus
+from app.models.user import User, UserRole
+
+from tests.utils import auth_headers, create_student
+
+
+def _sync(client, user_id, since=None):
+    params = {"since": since} if since is not None else {}
+    response = client.get("/api/v1/sync/", params=params, headers=auth_headers(user_id))
+    assert response.status_code == 200
+    return response.json()
+
+
+def _ids(rows):
+    return [row["id"] for row in rows]
+
+
+def _teacher(db, email="teacher@example.com"):
+    teacher = User(email=email, hashed_password="x", role=UserRole.TEACHER)
+    db.add(teacher)
+    db.commit()
+    return teacher.id
+
+
+def test_create_update_delete_round_trip(client, db):
+    teacher_id = _teacher(db)
+    subject = Subject(name="Maths", grade_level="9")
+    db.add(subject)
+    db.flush()
+    chapter = Chapter(title="Algebra", subject_id=subject.id, order=1)
+    db.add(chapter)
+    db.flush()
+    lesson = Lesson(title="Equations", chapter_id=chapter.id, content="...", order=1)
+    db.add(lesson)
+    db.commit()
+
+    full = _sync(client, teacher_id)
+    assert _ids(full["changes"]["chapters"]) == [chapter.id]
+    assert _ids(full["changes"]["lessons"]) == [lesson.id]
+    assert full["deleted"]["chapters"] == []
+
+    # Rows written before the watermark fall outside the next window
+    db.query(Chapter).update({Chapter.updated_at: datetime.utcnow() - timedelta(hours=1)})
+    db.query(Lesson).update({Lesson.updated_at: datetime.utcnow() - timedelta(hours=1)})
+    db.query(Subject).update({Subject.updated_at: datetime.utcnow() - timedelta(hours=1)})
+    db.commit()
+    assert _sync(client, teacher_id, full["watermark"])["changes"]["chapters"] == []
+
+    chapter.title = "Linear algebra"
+    db.commit()
+    updated = _sync(client, teacher_id, full["watermark"])
+    assert [row["title"] for row in updated["changes"]["chapters"]] == ["Linear algebra"]
+
+    chapter_id, lesson_id = chapter.id, lesson.id
+    crud.chapter.remove(db, id=chapter_id)
+    deleted = _sync(client, teacher_id, updated["watermark"])
+    assert deleted["deleted"]["chapters"] == [chapter_id]
+    # The lesson was deleted by ON DELETE CASCADE
+    assert deleted["deleted"]["lessons"] == [lesson_id]
+
+
+def test_window_overlaps_the_previous_sync(client, db):
+    teacher_id = _teacher(db)
+    since = datetime.utcnow()
+    inside = Subject(name="Inside", grade_level="9")
+    outside = Subject(name="Outside", grade_level="9")
+    db.add_all([inside, outside])
+    db.flush()
+    # Committed by a transaction still in flight when `since` was taken
+    inside.updated_at = since - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS / 2)
+    outside.updated_at = since - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS * 2)
+    db.commit()
+
+    changes = _sync(client, teacher_id, since.isoformat())["changes"]
+    assert _ids(changes["subjects"]) == [inside.id]
+
+
+def test_rows_and_deletions_are_filtered_by_role(client, db):
+    teacher_id = _teacher(db)
+    other_teacher_id = _teacher(db, "other@example.com")
+    student_id = create_student(db, "student@example.com", grade="9", section="A")
+    outsider_id = create_student(db, "outsider@example.com", grade="9", section="B")
+    subject = Subject(name="Maths", grade_level="9")
+    db.add(subject)
+    db.flush()
+    chapter = Chapter(title="Algebra", subject_id=subject.id, order=1)
+    class_a = Class(name="9A", grade="9", section="A", academic_year="2026")
+    db.add_all([chapter, class_a])
+    db.flush()
+    due = datetime.utcnow() + timedelta(days=7)
+    assignment = Assignment(
+        title="Homework", subject_id=subject.id, chapter_id=chapter.id, due_date=due, created_by=teacher_id
+    )
+    task = Task(
+        title="Review", assigned_to=student_id, status=TaskStatus.TODO, due_date=due, created_by=teacher_id
+    )
+    db.add_all([assignment, task])
+    db.flush()
+    link = ClassAssignment(assignment_id=assignment.id, class_id=class_a.id, assigned_by=teacher_id)
+    db.add(link)
+    db.commit()
+
+    since = (datetime.utcnow() - timedelta(minutes=1)).isoformat()
+    visible = {
+        user_id: _sync(client, user_id, since)["changes"]
+        for user_id in (teacher_id, other_teacher_id, student_id, outsider_id)
+    }
+    assert _ids(visible[student_id]["assignments"]) == [assignment.id]
+    assert _ids(visible[student_id]["tasks"]) == [task.id]
+    assert _ids(visible[teacher_id]["assignments"]) == [assignment.id]
+    for user_id in (other_teacher_id, outsider_id):
+        assert visible[user_id]["assignments"] == []
+        assert visible[user_id]["tasks"] == []
+
+    assignment_id, task_id = assignment.id, task.id
+    class_assignment.remove(db, id=link.id)
+    crud.assignment.remove(db, id=assignment_id)
+    crud.task.remove(db, id=task_id)
+
+    deleted = {
+        user_id: _sync(client, user_id, since)["deleted"]
+        for user_id in (teacher_id, other_teacher_id, student_id, outsider_id)
+    }
+    assert deleted[student_id]["assignments"] == [assignment_id]
+    assert deleted[student_id]["tasks"] == [task_id]
+    assert deleted[teacher_id]["assignments"] == [assignment_id]
+    assert deleted[teacher_id]["tasks"] == [task_id]
+    for user_id in (other_teacher_id, outsider_id):
+        assert deleted[user_id]["assignments"] == []
+        assert deleted[user_id]["tasks"] == []
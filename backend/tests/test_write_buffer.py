@@ -0,0 +1,93 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event, select
+
+from app import crud
+from app.core.write_buffer import WriteBehindBuffer
+from app.models.academic import StudentProgress
+from app.models.content import Quiz
+from app.models.enums import ProgressStatus
+
+from tests.utils import create_quiz, create_student
+
+
+def _buffer(bad, written, **kwargs):
+    def flush(entries):
+        if bad & set(entries):
+            raise ValueError("bad entry")
+        written.update(entries)
+
+    return WriteBehindBuffer(flush, **kwargs)
+
+
+def test_bad_entry_does_not_hold_back_the_batch():
+    written = {}
+    buffer = _buffer({"bad"}, written, max_attempts=3)
+    for key in ("a", "bad", "b"):
+        buffer.put(key, 1)
+
+    assert buffer.flush() == 2
+    assert written == {"a": 1, "b": 1}
+    assert buffer.snapshot() == {"bad": 1}
+
+
+def test_entry_is_dead_lettered_after_max_attempts():
+    written = {}
+    buffer = _buffer({"bad"}, written, max_attempts=3)
+    buffer.put("bad", 1)
+
+    for _ in range(3):
+        buffer.flush()
+    assert buffer.snapshot() == {}
+    assert list(buffer.dead_letters) == [("bad", 1)]
+    assert buffer.stats()["dead_lettered"] == 1
+
+    buffer.put("good", 2)
+    assert buffer.flush() == 1
+    assert written == {"good": 2}
+
+
+@contextmanager
+def count_writes(db):
+    writes = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith("SELECT"):
+            writes.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield writes
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_ticks_return_the_stored_row_and_reads_do_not_write(db, monkeypatch):
+    from app.crud import crud_academic
+
+    buffer = WriteBehindBuffer(lambda entries: crud.student_progress.update_progress_many(db, entries=entries))
+    monkeypatch.setattr(crud_academic, "progress_buffer", buffer)
+    student_id = create_student(db, "s@example.com")
+    chapter_id = db.get(Quiz, create_quiz(db)).chapter_id
+
+    tick = lambda percentage: crud.student_progress.record_tick(
+        db, student_id=student_id, chapter_id=chapter_id, completion_percentage=percentage
+    )
+
+    first = tick(10)
+    assert first["id"] is not None
+    assert buffer.snapshot() == {}
+
+    second = tick(100)
+    assert (second.id, second.completion_percentage, second.status) == (first["id"], 100, ProgressStatus.COMPLETED)
+    assert buffer.snapshot() == {(student_id, chapter_id): 100}
+
+    with count_writes(db) as writes:
+        [read] = crud.student_progress.get_by_student(db, student_id=student_id)
+    assert writes == []
+    assert (read.completion_percentage, read.status) == (100, ProgressStatus.COMPLETED)
+    assert db.scalar(select(StudentProgress.completion_percentage)) == 10
+
+    buffer.flush()
+    assert db.scalar(select(StudentProgress.completion_percentage)) == 100
@@ -0,0 +1,30 @@
+from app.core.security import create_access_token
+from app.models.content import Chapter, Quiz, Subject
+from app.models.user import StudentProfile, User, UserRole
+
+
+def create_student(db, email, grade="9", section="A"):
+    user = User(email=email, hashed_password="x", role=UserRole.STUDENT)
+    db.add(user)
+    db.flush()
+    db.add(StudentProfile(user_id=user.id, grade=grade, section=section))
+    db.commit()
+    return user.id
+
+
+def create_quiz(db):
+    teacher = User(email="teacher@example.com", hashed_password="x", role=UserRole.TEACHER)
+    subject = Subject(name="Maths", grade_level="9")
+    db.add_all([teacher, subject])
+    db.flush()
+    chapter = Chapter(title="Algebra", subject_id=subject.id, order=1)
+    db.add(chapter)
+    db.flush()
+    quiz = Quiz(title="Quiz", chapter_id=chapter.id, created_by=teacher.id)
+    db.add(quiz)
+    db.commit()
+    return quiz.id
+
+
+def auth_headers(user_id):
+    return {"Authorization": f"Bearer {create_access_token(user_id)}"}